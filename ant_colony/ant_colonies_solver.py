@@ -5,6 +5,8 @@ from tqdm import tqdm
 
 from ant_colony.partitioning.partitioner import Partitioner
 from ant_colony.ant_colony_system import AntColonySystem
+from ant_colony.colony_workers import ColonyWorkers
+from ant_colony.route_solution import RouteSolution
 
 
 class AntColoniesSolver:
@@ -20,10 +22,23 @@ class AntColoniesSolver:
                  beta,
                  ro,
                  phi,
-                 q_0):
+                 q_0,
+                 heuristic_dtype="float64",
+                 prune=False,
+                 capacity_aware=False,
+                 partition_strategy=None,
+                 colony_workers=0,
+                 seed=None):
 
         self.cost_save_path = cost_save_path
         self.solution_save_path = solution_save_path
+
+        # With a partition strategy (see PARTITION_STRATEGIES) different from the one of the partitioner,
+        # the graph of the partitioner is partitioned again
+        if partition_strategy is not None and partition_strategy != partitioner.get_strategy():
+            partitioner = Partitioner(partitioner.get_graph(), partition_strategy)
+            partitioner.execute()
+
         self.partitioner = partitioner
         self.graph = partitioner.get_graph()
 
@@ -40,6 +55,14 @@ class AntColoniesSolver:
         self.ro = ro
         self.phi = phi
         self.q_0 = q_0
+        self.heuristic_dtype = heuristic_dtype
+        self.prune = prune
+        self.capacity_aware = capacity_aware
+
+        # With colony workers, the colonies run in persistent worker processes (they share no state)
+        # and only their best routes are sent back to be merged after every iteration
+        self.colony_workers = colony_workers
+        self.seed = seed
 
         self.colonies = []
         self.__init_colonies__()
@@ -50,24 +73,61 @@ class AntColoniesSolver:
             nodes = part.get_nodes()
             all_nodes = [depot_node] + nodes
 
+            # Some strategies can leave a depot without trips (it does not need a colony)
+            if len(nodes) == 0:
+                continue
+
             # Keep only the lines and columns that we need from the cost matrix
             cost_sub_matrix = self.cost_matrix[all_nodes][:, all_nodes]
 
             alg_params = (self.number_of_ants, self.tau_0, self.alpha, self.beta, self.ro, self.phi, self.q_0)
-            acs = AntColonySystem(cost_sub_matrix, self.depot_capacities[depot_node], alg_params)
+            options = dict(heuristic_dtype=self.heuristic_dtype, prune=self.prune, capacity_aware=self.capacity_aware)
+            colony_params = (cost_sub_matrix, self.depot_capacities[depot_node], alg_params, options)
 
             entry = dict()
             entry["depot"] = depot_node
             entry["all_nodes"] = all_nodes
-            entry["colony"] = acs
+            entry["params"] = colony_params
+            entry["constructions_count"] = 0
+            entry["retries_count"] = 0
+
+            # The colonies run by the workers are created in the worker processes
+            entry["colony"] = None
+            if self.colony_workers == 0:
+                entry["colony"] = AntColonySystem(cost_sub_matrix, self.depot_capacities[depot_node], alg_params,
+                                                  **options)
 
             self.colonies.append(entry)
 
-    def __add_partial_solution__(self, current_solution, initial_nodes, partial_solution):
-        for row_index in range(partial_solution.shape[0]):
-            for col_index in range(partial_solution.shape[1]):
-                current_solution[initial_nodes[row_index], initial_nodes[col_index]] = \
-                    partial_solution[row_index, col_index]
+    def get_constructions_count(self):
+        return sum(colony["constructions_count"] for colony in self.colonies)
+
+    def get_retries_count(self):
+        return sum(colony["retries_count"] for colony in self.colonies)
+
+    def __add_partial_routes__(self, current_solution, initial_nodes, partial_routes):
+        # The partial routes have a single depot (0), so they are mapped back to the initial nodes
+        depot_node = initial_nodes[0]
+        for route in partial_routes:
+            current_solution.add_route(depot_node, [initial_nodes[node] for node in route])
+
+    def __execute_colonies_iteration__(self, colony_workers):
+        # The (best routes, best cost, constructions count, retries count) of every colony
+        if colony_workers is not None:
+            return colony_workers.execute_iteration()
+
+        results = []
+        for colony in self.colonies:
+            acs = colony["colony"]
+
+            # Execute colony iteration
+            acs.execute_iteration()
+
+            # Get best solution so far (the colonies have a single depot, 0)
+            results.append((acs.get_best_solution().get_depot_routes(0), acs.get_best_cost(),
+                            acs.get_constructions_count(), acs.get_retries_count()))
+
+        return results
 
     def __log__(self, iteration, current_solution, current_cost):
 
@@ -75,40 +135,45 @@ class AntColoniesSolver:
             file.write(f"{iteration}: {current_cost}\n")
 
         with open(self.solution_save_path, "a") as file:
-            file.write(f"{iteration}: {current_solution.tolist()}\n")
+            file.write(f"{iteration}: {current_solution.to_matrix().tolist()}\n")
 
     def solve(self):
 
-        best_solution = []
+        best_solution = None
         best_cost = -1
 
-        for iteration in range(self.number_of_iterations):
+        colony_workers = None
+        if self.colony_workers > 0:
+            colony_workers = ColonyWorkers([colony["params"] for colony in self.colonies], self.colony_workers,
+                                           self.seed)
 
-            current_solution = np.zeros(self.cost_matrix.shape)
-            current_cost = 0
+        try:
+            for iteration in range(self.number_of_iterations):
 
-            for colony in self.colonies:
-                acs = colony["colony"]
+                current_solution = RouteSolution(self.m, self.cost_matrix.shape[0])
+                current_cost = 0
 
-                # Execute colony iteration
-                acs.execute_iteration()
+                results = self.__execute_colonies_iteration__(colony_workers)
+                for colony, (routes, cost, constructions_count, retries_count) in zip(self.colonies, results):
+                    colony["constructions_count"] = constructions_count
+                    colony["retries_count"] = retries_count
 
-                # Get best solution so far
-                best_colony_solution = acs.get_best_solution()
-                best_colony_cost = acs.get_best_cost()
+                    # Update current solution and cost
+                    current_cost += cost
+                    self.__add_partial_routes__(current_solution,
+                                                initial_nodes=colony["all_nodes"],
+                                                partial_routes=routes)
 
-                # Update current solution and cost
-                current_cost += best_colony_cost
-                self.__add_partial_solution__(current_solution,
-                                              initial_nodes=colony["all_nodes"],
-                                              partial_solution=best_colony_solution)
+                if current_cost < best_cost or best_cost == -1:
+                    best_cost = current_cost
+                    best_solution = current_solution
 
-            if current_cost < best_cost or best_cost == -1:
-                best_cost = current_cost
-                best_solution = current_solution
+                # print(best_cost)
 
-            # print(best_cost)
+                self.__log__(iteration, current_solution, current_cost)
 
-            self.__log__(iteration, current_solution, current_cost)
+        finally:
+            if colony_workers is not None:
+                colony_workers.close()
 
         return best_solution, best_cost
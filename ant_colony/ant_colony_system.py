@@ -1,33 +1,48 @@
 import numpy as np
 
+from ant_colony.construction_state import ConstructionState
+from ant_colony.heuristic_cache import HeuristicCache
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony.route_solution import RouteSolution, join_routes_near_depot
+from ant_colony.transition_rule import choose_next_node
+
 
 class Ant:
     def __init__(self,
-                 cost_matrix,
-                 depot_capacity,
+                 problem_graph: ProblemGraph,
                  pheromone_matrix,
-                 ant_params: tuple):
+                 heuristic_cache: HeuristicCache,
+                 ant_params: tuple,
+                 capacity_aware=False):
 
-        self.cost_matrix = cost_matrix
-        self.inverse_div_cost_matrix = 1 / (self.cost_matrix + 1e-10)  # avoid zero cost division
-        self.depot_capacity = depot_capacity
+        self.cost_matrix = problem_graph.get_cost_matrix()
+        self.arc_index = problem_graph.get_arc_index()
+        self.feasibility = problem_graph.get_feasibility_bitset()
+        self.heuristic_matrix = heuristic_cache.get_eta_beta()
+        self.depot_capacity = problem_graph.get_depot_capacities()[0]
 
         self.global_pheromone_matrix = pheromone_matrix
-        self.local_pheromone_matrix = np.zeros(pheromone_matrix.shape)
 
         self.tau_0, self.alpha, self.beta, self.phi, self.q_0 = ant_params
 
-        self.unvisited = list(range(cost_matrix.shape[0]))
+        self.visited = np.zeros(self.cost_matrix.shape[0], dtype=bool)
+        self.unvisited_count = self.cost_matrix.shape[0]
 
         # the ant always starts from the depot
         # but a new vehicle is used (counted) every time the ant is returning to the depot
-        self.depot_visits = 0
+        # Running cost, vehicles used and vehicles left (updated at every step of the construction)
+        self.construction_state = ConstructionState(problem_graph)
 
-        self.solution = []
-        self.solution_cost = -1
+        # Constructions that cannot get under this cost are abandoned (None: never)
+        self.cost_bound = None
 
-    def get_local_pheromone_matrix(self):
-        return self.local_pheromone_matrix
+        # With the capacity aware construction, the last vehicle only returns to the depot when it cannot continue
+        # (otherwise, the constructions that exceed the capacity after the repair are started again)
+        self.capacity_aware = capacity_aware
+        self.retries_count = 0
+
+        self.solution = None
+        self.solution_cost = -1
 
     def get_solution(self):
         return self.solution
@@ -41,138 +56,117 @@ class Ant:
     def set_global_pheromone_matrix(self, matrix):
         self.global_pheromone_matrix = matrix
 
-    def __get_node_neighbours__(self, node):
-        neighbours = []
-        for unvisited_node in self.unvisited:
-            if self.cost_matrix[node, unvisited_node] != -1:
-                neighbours.append(unvisited_node)
-
-        return neighbours
+    def set_cost_bound(self, cost_bound):
+        self.cost_bound = cost_bound
 
-    def __choose_argmax_heuristic__(self, current_node, current_neighbours):
-        products = []
-        for neigh in current_neighbours:
-            neigh_product = (self.global_pheromone_matrix[current_node, neigh] ** self.alpha) * \
-                            (self.inverse_div_cost_matrix[current_node, neigh] ** self.beta)
-            products.append(neigh_product)
+    def get_running_cost(self):
+        return self.construction_state.get_running_cost()
 
-        argmax_index = 0
-        for index, neigh_product in enumerate(products):
-            if neigh_product > products[argmax_index]:
-                argmax_index = index
+    def get_depot_visits(self):
+        return self.construction_state.get_depot_visits()[0]
 
-        return current_neighbours[argmax_index]
+    def get_remaining_capacity(self):
+        return self.construction_state.get_remaining_capacities()[0]
 
-    def __choose_aco_heuristic__(self, current_node, current_neighbours):
+    def get_cost_lower_bound(self):
+        return self.construction_state.get_lower_bound()
 
-        products = []
-        for neigh in current_neighbours:
-            neigh_product = (self.global_pheromone_matrix[current_node, neigh] ** self.alpha) * \
-                            (self.inverse_div_cost_matrix[current_node, neigh] ** self.beta)
-            products.append(neigh_product)
+    def get_retries_count(self):
+        # The constructions that were started again during the last call of construct_solution
+        return self.retries_count
 
-        products_sum = sum(products)
+    def is_pruned(self):
+        return self.solution is None
 
-        probabilities = []
-        for neigh_product in products:
-            probabilities.append(neigh_product / products_sum)
+    def __get_node_neighbours__(self, node):
+        out_neighbours = self.arc_index.get_out_neighbours(node)
+        neighbours = out_neighbours[~self.visited[out_neighbours]]
 
-        cumulative_probabilities = np.cumsum(probabilities)
-        cumulative_probabilities[-1] = 1.0
+        # The depot is the first out neighbour of a trip (when the trip can return to it)
+        if self.capacity_aware and neighbours.shape[0] > 1 and neighbours[0] == 0 and \
+                self.construction_state.get_vehicles_left() <= 1:
+            neighbours = neighbours[1:]
 
-        selected_neigh = 0
-        random_number = np.random.rand()
-        for index, cumulative_prob in enumerate(cumulative_probabilities):
-            if random_number <= cumulative_prob:
-                selected_neigh = index
-                break
+        return neighbours
 
-        return current_neighbours[selected_neigh]
+    def __visit__(self, node):
+        self.visited[node] = True
+        self.unvisited_count -= 1
 
     def __repair_unfeasible__(self, solution):
 
-        # Find all trips that enter the depot directly (in_trips)
-        in_nodes = []
-        for row_index in range(1, solution.shape[0]):
-            if solution[row_index, 0] == 1:
-                in_nodes.append(row_index)
-
-        # Find all the trips that leave the depot directly (out_trips)
-        out_nodes = []
-        for col_index in range(1, solution.shape[1]):
-            if solution[0, col_index] == 1:
-                out_nodes.append(col_index)
-
-        output_used = []
-        # For each in_trip and out_trip
-        for in_index, in_node in enumerate(in_nodes):
-            for out_index, out_node in enumerate(out_nodes):
-                # if there is a feasible arc between the in_trip and the out_trip
-                if self.cost_matrix[in_node, out_node] != -1 and out_node not in output_used:
-                    # Remove old arcs to/from depot
-                    solution[in_node, 0] = 0
-                    solution[0, out_node] = 0
-
-                    # Add new arc between the
-                    solution[in_node, out_node] = 1
-
-                    output_used += [out_node]
-
-                    # Remove one vehicle
-                    self.depot_visits -= 1
-                    # Go to the next in_trip
-                    break
+        # Join the routes (the trips that enter the depot directly with the ones that leave it directly)
+        routes, joins_count = join_routes_near_depot(solution.get_depot_routes(0), self.feasibility)
+        solution.set_depot_routes(0, routes)
 
-            # if self.depot_visits <= self.depot_capacity:
-            #     break
+        # Remove one vehicle for each join
+        self.construction_state.remove_vehicles(0, joins_count)
 
         return solution
 
     def construct_solution(self):
 
-        solution = []
-        self.depot_visits = self.depot_capacity + 1
+        solution = None
+        pruned = False
+        state = self.construction_state
+        self.retries_count = -1
 
         # A solution is feasible only when the depot capacity is not exceeded
-        while self.depot_visits > self.depot_capacity:
+        while not pruned and (solution is None or state.exceeds_capacities()):
 
-            self.depot_visits = 0
-            self.local_pheromone_matrix = np.zeros(self.global_pheromone_matrix.shape)
-            self.unvisited = list(range(self.cost_matrix.shape[0]))
+            self.retries_count += 1
+            state.reset(bounded=self.cost_bound is not None)
+            self.visited[:] = False
+            self.unvisited_count = self.cost_matrix.shape[0]
 
             # Start from the depot
             current_node = 0
-            solution = np.zeros(self.cost_matrix.shape)
+            solution = RouteSolution(1, self.cost_matrix.shape[0])
+            current_route = []
 
-            while len(self.unvisited) > 0:
+            while self.unvisited_count > 0:
                 current_neighbours = self.__get_node_neighbours__(current_node)
 
                 q = np.random.rand()
-                if q <= self.q_0:
-                    next_node = self.__choose_argmax_heuristic__(current_node, current_neighbours)
-                else:
-                    next_node = self.__choose_aco_heuristic__(current_node, current_neighbours)
+                next_node = choose_next_node(self.global_pheromone_matrix, self.heuristic_matrix,
+                                             current_node, current_neighbours, self.alpha, exploit=q <= self.q_0)
+
+                state.add_arc(current_node, next_node)
 
                 # If the ant returns to the depot, then it finished using one vehicle
                 # The next time it starts a new path, it will use another vehicle
                 if next_node == 0:
-                    self.depot_visits += 1
+                    solution.add_route(0, current_route)
+                    current_route = []
+                else:
+                    current_route.append(int(next_node))
 
                 # Consider the node visited if it is not the depot node
                 # or if the current node is the last visited node (which is always the depot node)
-                if next_node != 0 or len(self.unvisited) == 1:
-                    self.unvisited.remove(next_node)
+                if next_node != 0 or self.unvisited_count == 1:
+                    self.__visit__(next_node)
 
-                # solution.append(next_node)
-                solution[current_node][next_node] = 1
                 current_node = next_node
 
+                # Abandoned as soon as it cannot get under the cost bound (e.g. the best cost so far)
+                if self.cost_bound is not None and state.get_lower_bound() >= self.cost_bound:
+                    pruned = True
+                    break
+
+            if pruned:
+                break
+
             # if self.depot_visits > self.depot_capacity:
             solution = self.__repair_unfeasible__(solution)
 
-        self.solution = solution
-        self.solution_cost = np.sum(np.multiply(self.cost_matrix, self.solution))
-        self.local_pheromone_matrix = self.solution * (1 / self.solution_cost)
+        if pruned:
+            self.solution = None
+            self.solution_cost = -1
+        else:
+            self.solution = solution
+            self.solution_cost = self.solution.get_cost(self.cost_matrix)
+            state.set_running_cost(self.solution_cost)
+
         self.global_pheromone_matrix = (1 - self.phi) * self.global_pheromone_matrix + self.phi * self.tau_0
 
         return self.global_pheromone_matrix
@@ -183,7 +177,10 @@ class AntColonySystem:
     def __init__(self,
                  cost_matrix,
                  depot_capacity,
-                 alg_params: tuple):
+                 alg_params: tuple,
+                 heuristic_dtype="float64",
+                 prune=False,
+                 capacity_aware=False):
         self.cost_matrix = cost_matrix
         self.depot_capacity = depot_capacity
         self.number_of_ants, self.tau_0, self.alpha, self.beta, self.ro, self.phi, self.q_0 \
@@ -191,13 +188,27 @@ class AntColonySystem:
 
         self.pheromone_matrix = np.full(self.cost_matrix.shape, self.tau_0)
 
-        self.ants = [Ant(self.cost_matrix, depot_capacity, self.pheromone_matrix,
-                         (self.tau_0, self.alpha, self.beta, self.phi, self.q_0))
+        # With prune, the ants abandon the constructions that provably cannot beat the best solution so far
+        self.prune = prune
+
+        # eta and eta ** beta do not change during the run, so they are computed once for all the ants
+        self.heuristic_cache = HeuristicCache(self.cost_matrix, self.beta, heuristic_dtype)
+
+        # The colony works on a single depot (node 0), followed by its trips
+        self.graph = ProblemGraph(self.cost_matrix, 1, self.cost_matrix.shape[0] - 1, [depot_capacity])
+
+        self.ants = [Ant(self.graph, self.pheromone_matrix, self.heuristic_cache,
+                         (self.tau_0, self.alpha, self.beta, self.phi, self.q_0), capacity_aware)
                      for _ in range(self.number_of_ants)]
 
-        self.best_solution = []
+        self.best_solution = None
         self.best_solution_cost = -1
-        self.best_local_pheromones_matrix = []
+
+        # Throughput counters (the retries are the constructions started again because of the depot capacity,
+        # the pruned ones were abandoned because of the cost bound)
+        self.constructions_count = 0
+        self.retries_count = 0
+        self.pruned_count = 0
 
     def get_best_cost(self):
         return self.best_solution_cost
@@ -205,6 +216,15 @@ class AntColonySystem:
     def get_best_solution(self):
         return self.best_solution
 
+    def get_constructions_count(self):
+        return self.constructions_count
+
+    def get_retries_count(self):
+        return self.retries_count
+
+    def get_pruned_count(self):
+        return self.pruned_count
+
     def execute_iteration(self):
         for ant_index in range(self.number_of_ants):
 
@@ -212,15 +232,23 @@ class AntColonySystem:
             ant = self.ants[ant_index]
 
             ant.set_global_pheromone_matrix(self.pheromone_matrix)
+            if self.prune and self.best_solution is not None:
+                ant.set_cost_bound(self.best_solution_cost)
             self.pheromone_matrix = ant.construct_solution()
 
+            self.constructions_count += 1
+            self.retries_count += ant.get_retries_count()
+
             current_cost = ant.get_solution_cost()
 
             # Update best so far
-            if current_cost < self.best_solution_cost or self.best_solution_cost == -1:
+            if ant.is_pruned():
+                self.pruned_count += 1
+            elif current_cost < self.best_solution_cost or self.best_solution_cost == -1:
                 self.best_solution_cost = current_cost
                 self.best_solution = ant.get_solution()
-                self.best_local_pheromones_matrix = ant.get_local_pheromone_matrix()
 
-            # Update global pheromones
-            self.pheromone_matrix = (1 - self.ro) * self.pheromone_matrix + self.ro * self.best_local_pheromones_matrix
+            # Update global pheromones (only the arcs of the best solution so far get a deposit)
+            self.pheromone_matrix = (1 - self.ro) * self.pheromone_matrix
+            best_sources, best_destinations = self.best_solution.get_arcs()
+            self.pheromone_matrix[best_sources, best_destinations] += self.ro * (1 / self.best_solution_cost)
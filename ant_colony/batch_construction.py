@@ -0,0 +1,70 @@
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# State of a worker process (set once by the pool initializer)
+worker_state = dict()
+
+
+def init_worker(ant_class, problem_graph, heuristic_cache, ant_params, ant_options, shared_memory_name, shape):
+    # Attach to the pheromone snapshot written by the colony before every batch
+    snapshot_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    pheromone_snapshot = np.ndarray(shape, dtype=np.float64, buffer=snapshot_memory.buf)
+
+    worker_state["shared_memory"] = snapshot_memory
+    worker_state["pheromone_snapshot"] = pheromone_snapshot
+    worker_state["ant"] = ant_class(problem_graph, pheromone_snapshot, heuristic_cache, ant_params, **ant_options)
+
+
+def construct_solution(construction):
+    # Every construction has its own seed, so the results do not depend on the worker that runs it
+    seed, cost_bound = construction
+    np.random.seed(seed)
+    random.seed(seed)
+
+    ant = worker_state["ant"]
+    ant.set_global_pheromone_matrix(worker_state["pheromone_snapshot"])
+    ant.set_cost_bound(cost_bound)
+    ant.construct_solution()
+
+    return ant.get_solution(), ant.get_solution_cost(), ant.get_retries_count()
+
+
+class BatchConstructionPool:
+
+    def __init__(self, ant_class, problem_graph, heuristic_cache, ant_params, number_of_workers, seed=None,
+                 ant_options=None):
+        shape = problem_graph.get_cost_matrix().shape
+
+        self.snapshot_memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        self.pheromone_snapshot = np.ndarray(shape, dtype=np.float64, buffer=self.snapshot_memory.buf)
+
+        self.pool = multiprocessing.Pool(number_of_workers,
+                                         initializer=init_worker,
+                                         initargs=(ant_class, problem_graph, heuristic_cache, ant_params,
+                                                   ant_options or dict(), self.snapshot_memory.name, shape))
+
+        # Without an explicit seed, the seeds are drawn from numpy's global generator
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+    def construct_solutions(self, pheromone_matrix, number_of_ants, cost_bound=None):
+        self.pheromone_snapshot[:] = pheromone_matrix
+
+        seeds = [int(child.generate_state(1)[0]) for child in self.seed_sequence.spawn(number_of_ants)]
+
+        # The constructions (solution, cost, retries) are returned in the order of the ants
+        # (a pruned construction has no solution)
+        return self.pool.map(construct_solution, [(seed, cost_bound) for seed in seeds])
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+        # The shared memory can only be released once no array uses its buffer
+        self.pheromone_snapshot = None
+        self.snapshot_memory.close()
+        self.snapshot_memory.unlink()
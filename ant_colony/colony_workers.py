@@ -0,0 +1,100 @@
+import multiprocessing
+import random
+
+import numpy as np
+
+from ant_colony.ant_colony_system import AntColonySystem
+
+
+def run_colonies(connection, colonies_params, seeds):
+    # A worker process owns its colonies (sub-matrices, pheromones, ants) for the whole run,
+    # and only sends back the best routes of each colony after every iteration
+    # Every colony has its own random state (restored before each of its iterations), so the results do not
+    # depend on the worker that runs it
+    colonies = []
+    random_states = []
+    for (cost_sub_matrix, depot_capacity, alg_params, options), seed in zip(colonies_params, seeds):
+        np.random.seed(seed)
+        random.seed(seed)
+        colonies.append(AntColonySystem(cost_sub_matrix, depot_capacity, alg_params, **options))
+        random_states.append((np.random.get_state(), random.getstate()))
+
+    while connection.recv() == "iterate":
+        results = []
+        for colony_index, acs in enumerate(colonies):
+            np.random.set_state(random_states[colony_index][0])
+            random.setstate(random_states[colony_index][1])
+            acs.execute_iteration()
+            random_states[colony_index] = (np.random.get_state(), random.getstate())
+
+            # The colonies have a single depot (0)
+            results.append((acs.get_best_solution().get_depot_routes(0), acs.get_best_cost(),
+                            acs.get_constructions_count(), acs.get_retries_count()))
+
+        connection.send(results)
+
+    connection.close()
+
+
+class ColonyWorkers:
+
+    def __init__(self, colonies_params, number_of_workers, seed=None):
+        # colonies_params: (cost_sub_matrix, depot_capacity, alg_params, options) of every colony
+        # The colonies are dealt out to the workers (a worker runs its colonies one after the other)
+        number_of_workers = min(number_of_workers, len(colonies_params))
+        self.colonies_count = len(colonies_params)
+        self.worker_colonies = [list(range(worker, self.colonies_count, number_of_workers))
+                                for worker in range(number_of_workers)]
+
+        # A seed for every colony (without an explicit seed, the root seed is drawn from numpy's global generator)
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(self.colonies_count)]
+
+        self.connections = []
+        self.processes = []
+        try:
+            for colony_indices in self.worker_colonies:
+                parent_connection, worker_connection = multiprocessing.Pipe()
+                self.connections.append(parent_connection)
+
+                process = multiprocessing.Process(target=run_colonies,
+                                                  args=(worker_connection,
+                                                        [colonies_params[index] for index in colony_indices],
+                                                        [seeds[index] for index in colony_indices]),
+                                                  daemon=True)
+                try:
+                    process.start()
+                finally:
+                    worker_connection.close()
+
+                self.processes.append(process)
+
+        except BaseException:
+            # The workers already started are stopped (the caller gets no object to close)
+            self.close()
+            raise
+
+    def execute_iteration(self):
+        # All the workers run their iteration at the same time
+        # The results (best routes, best cost, constructions count, retries count) are in the order of the colonies
+        for connection in self.connections:
+            connection.send("iterate")
+
+        results = [None] * self.colonies_count
+        for connection, colony_indices in zip(self.connections, self.worker_colonies):
+            for index, result in zip(colony_indices, connection.recv()):
+                results[index] = result
+
+        return results
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+
+        for process in self.processes:
+            process.join()
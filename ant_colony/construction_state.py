@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class ConstructionState:
+
+    def __init__(self, problem_graph, fixed_trip_arcs=True):
+        self.problem_graph = problem_graph
+        self.m = problem_graph.get_m()
+        self.cost_matrix = problem_graph.get_cost_matrix()
+        self.depot_capacities = np.array(problem_graph.get_depot_capacities())
+
+        # With fixed trip arcs, the repair of the ant only replaces depot arcs,
+        # so the arcs between trips are kept in the final solution
+        self.fixed_trip_arcs = fixed_trip_arcs
+
+        # The lower bound of the cost is only tracked by the bounded constructions (the ones with a cost bound):
+        # its in costs and its vehicles bound (a matching of the trips) are computed by the graph on first use
+        self.bounded = False
+        self.min_in_costs = None
+
+        self.running_cost = 0
+        self.depot_visits = np.zeros(self.m, dtype=np.int64)
+        self.remaining_capacities = self.depot_capacities.copy()
+        self.vehicles_left = int(self.depot_capacities.sum())
+        self.fixed_cost = 0
+        self.open_bound = None
+
+    def reset(self, bounded=False):
+        self.running_cost = 0
+        self.depot_visits[:] = 0
+        self.remaining_capacities[:] = self.depot_capacities
+        self.vehicles_left = int(self.depot_capacities.sum())
+        self.fixed_cost = 0
+
+        self.bounded = bounded
+        if bounded:
+            self.min_in_costs = self.problem_graph.get_min_in_costs()
+            self.open_bound = self.problem_graph.get_trips_bound()
+        else:
+            self.open_bound = None
+
+    def add_arc(self, source, destination):
+        cost = int(self.cost_matrix[source, destination])
+        self.running_cost += cost
+
+        if destination < self.m:
+            # The ant returns to a depot, so it finished using one of its vehicles
+            self.depot_visits[destination] += 1
+            self.remaining_capacities[destination] -= 1
+            if self.remaining_capacities[destination] >= 0:
+                self.vehicles_left -= 1
+        elif self.bounded and source >= self.m and self.fixed_trip_arcs:
+            self.fixed_cost += cost
+            self.open_bound -= self.min_in_costs[destination]
+
+    def remove_vehicles(self, depot, count):
+        self.depot_visits[depot] -= count
+        self.remaining_capacities[depot] += count
+        self.vehicles_left = int(np.maximum(self.remaining_capacities, 0).sum())
+
+    def set_running_cost(self, cost):
+        # After a repair (which replaces arcs), the cost of the repaired solution
+        self.running_cost = cost
+
+    def get_running_cost(self):
+        return self.running_cost
+
+    def get_depot_visits(self):
+        return self.depot_visits
+
+    def get_remaining_capacities(self):
+        return self.remaining_capacities
+
+    def get_vehicles_left(self):
+        # The vehicles that can still be used (all the depots)
+        return self.vehicles_left
+
+    def exceeds_capacities(self):
+        return bool(np.any(self.remaining_capacities < 0))
+
+    def get_lower_bound(self):
+        # Lower bound of the cost of any (repaired) solution that continues the current construction
+        # (None when the construction is not bounded)
+        if not self.bounded:
+            return None
+
+        return self.fixed_cost + self.open_bound
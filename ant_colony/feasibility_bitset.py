@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def get_nodes(bits):
+    # The nodes of a bitset (in increasing order)
+    if bits == 0:
+        return []
+
+    packed_bits = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed_bits, bitorder="little")).tolist()
+
+
+def get_first_node(bits):
+    # The smallest node of a non-empty bitset
+    return (bits & -bits).bit_length() - 1
+
+
+class FeasibilityBitset:
+    # Bit j of the row of node i is set when the arc (i, j) is feasible (cost different from -1)
+    # The rows are packed (8 nodes per byte, for the batch queries on arrays of arcs)
+    # and also kept as Python ints (for the queries on sets of nodes done from Python loops)
+
+    def __init__(self, cost_matrix):
+        feasible = cost_matrix != -1
+        self.size = cost_matrix.shape[0]
+
+        self.packed_rows = np.packbits(feasible, axis=1, bitorder="little")
+
+        self.out_bits = [int.from_bytes(row.tobytes(), "little") for row in self.packed_rows]
+        self.in_bits = [int.from_bytes(column.tobytes(), "little")
+                        for column in np.packbits(feasible.T, axis=1, bitorder="little")]
+
+    def get_size(self):
+        return self.size
+
+    def get_out_bits(self, node):
+        # The feasible successors of the node
+        return self.out_bits[node]
+
+    def get_in_bits(self, node):
+        # The feasible predecessors of the node
+        return self.in_bits[node]
+
+    def to_bits(self, nodes):
+        # (numpy integers are converted, their shifts would overflow past 63 nodes)
+        bits = 0
+        for node in nodes:
+            bits |= 1 << int(node)
+
+        return bits
+
+    def is_feasible(self, source, destination):
+        return (self.out_bits[source] >> int(destination)) & 1 == 1
+
+    def are_feasible(self, sources, destinations):
+        # Feasibility of the arcs (sources[k], destinations[k])
+        destinations = np.asarray(destinations)
+        packed = self.packed_rows[sources, destinations >> 3]
+        return ((packed >> (destinations & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def get_feasible_successors(self, node, nodes_bits):
+        # The nodes of the bitset that can follow the node
+        return self.out_bits[node] & nodes_bits
+
+    def get_feasible_predecessors(self, node, nodes_bits):
+        # The nodes of the bitset that can precede the node
+        return self.in_bits[node] & nodes_bits
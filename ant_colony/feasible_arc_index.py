@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class FeasibleArcIndex:
+
+    def __init__(self, cost_matrix):
+        # Only the arcs with a cost different from -1 can be used in a solution
+        feasible = cost_matrix != -1
+        self.size = cost_matrix.shape[0]
+
+        # Out arcs grouped by their source node (CSR layout):
+        # the out neighbours of node i are out_nodes[out_offsets[i]:out_offsets[i + 1]]
+        out_sources, out_nodes = np.nonzero(feasible)
+        self.out_offsets = self.__get_offsets__(out_sources)
+        self.out_nodes = out_nodes.astype(np.int32)
+        self.out_costs = cost_matrix[out_sources, out_nodes]
+
+        # In arcs grouped by their destination node (CSC layout):
+        # the in neighbours of node j are in_nodes[in_offsets[j]:in_offsets[j + 1]]
+        in_destinations, in_nodes = np.nonzero(feasible.T)
+        self.in_offsets = self.__get_offsets__(in_destinations)
+        self.in_nodes = in_nodes.astype(np.int32)
+        self.in_costs = cost_matrix[in_nodes, in_destinations]
+
+    def __get_offsets__(self, grouped_nodes):
+        offsets = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(grouped_nodes, minlength=self.size), out=offsets[1:])
+        return offsets
+
+    def get_size(self):
+        return self.size
+
+    def get_arcs_count(self):
+        return self.out_nodes.shape[0]
+
+    def get_out_neighbours(self, node):
+        return self.out_nodes[self.out_offsets[node]:self.out_offsets[node + 1]]
+
+    def get_out_costs(self, node):
+        return self.out_costs[self.out_offsets[node]:self.out_offsets[node + 1]]
+
+    def get_in_neighbours(self, node):
+        return self.in_nodes[self.in_offsets[node]:self.in_offsets[node + 1]]
+
+    def get_in_costs(self, node):
+        return self.in_costs[self.in_offsets[node]:self.in_offsets[node + 1]]
+
+    def get_out_degrees(self):
+        return np.diff(self.out_offsets)
+
+    def get_in_degrees(self):
+        return np.diff(self.in_offsets)
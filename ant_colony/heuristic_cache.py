@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+
+from data_readers.cost_matrix_reader import get_memory_map_path, open_memory_map
+
+
+class HeuristicCache:
+
+    def __init__(self, cost_matrix, beta, dtype="float64"):
+        self.beta = beta
+        self.dtype = np.dtype(dtype)
+
+        # The matrices of a memory-mapped instance are memory-mapped as well (from files next to the instance cache),
+        # so that all the processes working on the same instance share them
+        matrices = None
+        cost_matrix_path = get_memory_map_path(cost_matrix)
+        if cost_matrix_path is not None:
+            matrices = self.__load_shared__(cost_matrix, cost_matrix_path)
+
+        if matrices is None:
+            matrices = self.__compute__(cost_matrix)
+
+        self.eta, self.eta_beta = matrices
+
+        # The matrices are shared by all the ants of a colony, so nobody should write into them
+        self.eta.setflags(write=False)
+        self.eta_beta.setflags(write=False)
+
+    def __compute__(self, cost_matrix):
+        # eta = 1 / cost on the feasible arcs (avoid zero cost division), 0 on the unfeasible ones
+        feasible = cost_matrix != -1
+        eta = np.zeros(cost_matrix.shape)
+        np.divide(1.0, cost_matrix + 1e-10, out=eta, where=feasible)
+
+        # Near zero costs can overflow the smaller float types when raised to beta
+        max_value = np.finfo(self.dtype).max
+        return np.minimum(eta, max_value).astype(self.dtype), np.minimum(eta ** self.beta, max_value).astype(self.dtype)
+
+    def __load_shared__(self, cost_matrix, cost_matrix_path):
+        base_path = f"{cost_matrix_path}.{self.dtype.name}"
+        paths = [f"{base_path}.eta.npy", f"{base_path}.eta_beta_{self.beta}.npy"]
+
+        try:
+            # The files are (re)computed when they are missing or older than the cost matrix file
+            source_time = os.path.getmtime(cost_matrix_path)
+            if not all(os.path.exists(path) and os.path.getmtime(path) >= source_time for path in paths):
+                for path, matrix in zip(paths, self.__compute__(cost_matrix)):
+                    # Written under a temporary name first, so that concurrent readers never see a partial file
+                    tmp_path = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "wb") as file:
+                        np.save(file, matrix)
+                    os.replace(tmp_path, path)
+
+            return tuple(open_memory_map(path) for path in paths)
+
+        except (OSError, ValueError):
+            return None
+
+    def __getstate__(self):
+        # Memory-mapped matrices are sent to other processes as their paths (the processes map the same files)
+        state = self.__dict__.copy()
+        for name in ["eta", "eta_beta"]:
+            path = get_memory_map_path(state[name])
+            if path is not None:
+                state[name] = path
+
+        return state
+
+    def __setstate__(self, state):
+        for name in ["eta", "eta_beta"]:
+            if isinstance(state[name], str):
+                state[name] = open_memory_map(state[name])
+
+        self.__dict__.update(state)
+
+    def get_eta(self):
+        return self.eta
+
+    def get_eta_beta(self):
+        return self.eta_beta
+
+    def get_beta(self):
+        return self.beta
+
+    def get_nbytes(self):
+        return self.eta.nbytes + self.eta_beta.nbytes
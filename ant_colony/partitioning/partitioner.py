@@ -1,82 +1,123 @@
 import json
 
+import numpy as np
+
 from ant_colony.problem_graph import ProblemGraph
 from ant_colony.partitioning.graph_partition import GraphPartition
 
 
+def get_depot_costs(costs):
+    # The unfeasible arcs cost more than any feasible one
+    costs = np.asarray(costs, dtype=np.float64)
+    return np.where(costs == -1, np.inf, costs)
+
+
+def partition_by_balanced_degree(graph: ProblemGraph):
+    # Partition based on balanced node weights (the nodes with the most feasible arcs are dealt out first)
+    m = graph.get_m()
+    arc_index = graph.get_arc_index()
+
+    # The weight of a node is the number of feasible arcs that enter and leave it
+    node_weights = (arc_index.get_in_degrees() + arc_index.get_out_degrees())[m:]
+    sorted_nodes = np.argsort(-node_weights, kind="stable") + m
+
+    return [sorted_nodes[depot::m].tolist() for depot in range(m)]
+
+
+def partition_by_closest_depot(graph: ProblemGraph):
+    # Partition based on trip closest depot
+    # Obs.: the search is done using both arc orientations
+    m = graph.get_m()
+    cost_matrix = graph.get_cost_matrix()
+
+    # The costs of the arcs leaving the depots, then of the arcs entering them: the ties go to the first of them
+    # (an arc leaving a depot before an arc entering a depot, then the lowest depot)
+    depot_costs = np.concatenate((get_depot_costs(cost_matrix[:m, m:]), get_depot_costs(cost_matrix[m:, :m].T)))
+    closest_depots = np.argmin(depot_costs, axis=0) % m
+
+    trips = np.arange(m, graph.get_matrix_size())
+    return [trips[closest_depots == depot].tolist() for depot in range(m)]
+
+
+def partition_by_index_blocks(graph: ProblemGraph):
+    # Partition based on node index (consecutive blocks of trips of the same size)
+    m = graph.get_m()
+    trips = np.arange(m, graph.get_matrix_size())
+
+    return [block.tolist() for block in np.array_split(trips, m)]
+
+
+def partition_by_time_cost_clustering(graph: ProblemGraph):
+    # Partition based on the time of the trips and on their depot costs
+    # The instances have no explicit times, but a trip can only follow the trips that end before it starts,
+    # so the trips are ordered by their number of feasible predecessor trips (an estimate of their start time)
+    # In every window of m consecutive trips, each depot receives one trip (the cheapest pairs first),
+    # so every sub-colony has trips spread over the whole day, that can be chained into vehicles
+    m = graph.get_m()
+    cost_matrix = graph.get_cost_matrix()
+
+    trips_feasible = cost_matrix[m:, m:] != -1
+    start_order = np.argsort(trips_feasible.sum(axis=0) - trips_feasible.sum(axis=1), kind="stable")
+
+    # The cost of a trip for a depot is the cost of the vehicle that serves only that trip from that depot
+    depot_costs = get_depot_costs(cost_matrix[:m, m:]) + get_depot_costs(cost_matrix[m:, :m].T)
+
+    partitions = [[] for _ in range(m)]
+    for window_start in range(0, start_order.shape[0], m):
+        window = start_order[window_start:window_start + m]
+        window_costs = depot_costs[:, window].copy()
+
+        for _ in range(window.shape[0]):
+            depot, trip_index = np.unravel_index(np.argmin(window_costs), window_costs.shape)
+            partitions[depot].append(int(window[trip_index]) + m)
+
+            window_costs[depot, :] = np.inf
+            window_costs[:, trip_index] = np.inf
+
+    return partitions
+
+
+PARTITION_STRATEGIES = {
+    "balanced_degree": partition_by_balanced_degree,
+    "closest_depot": partition_by_closest_depot,
+    "index_blocks": partition_by_index_blocks,
+    "time_cost_clustering": partition_by_time_cost_clustering,
+}
+
+
 class Partitioner:
 
-    def __init__(self, graph: ProblemGraph):
+    def __init__(self, graph: ProblemGraph, strategy="balanced_degree"):
+        if strategy not in PARTITION_STRATEGIES:
+            raise ValueError(f"Unknown partition strategy: {strategy} (supported: {list(PARTITION_STRATEGIES)})")
+
         self.graph = graph
+        self.strategy = strategy
         self.partitions = []
 
     def toJSON(self):
-        return json.dumps(self, default=lambda t: t.__dict__, sort_keys=True, indent=4)
+        # The strategy and the trips of every depot (the graph, with its cost matrix, is left out)
+        partitions = [{"depot": part.get_depot(), "nodes": part.get_nodes()} for part in self.partitions]
+        return json.dumps({"strategy": self.strategy, "partitions": partitions}, sort_keys=True, indent=4)
 
     def get_graph(self):
         return self.graph
 
+    def get_strategy(self):
+        return self.strategy
+
     def get_partitions(self):
         return self.partitions
 
+    def get_partition_sizes(self):
+        return [len(part.get_nodes()) for part in self.partitions]
+
     def __setup_partitions__(self, partitions):
         for depot_index, part in enumerate(partitions):
             part_obj = GraphPartition(depot_index)
             part_obj.add_nodes(part)
             self.partitions.append(part_obj)
 
-    # def execute(self):
-    #     # Partition based on trip closest depot
-    #     partitions = [[] for _ in range(self.graph.get_m())]
-    #     for trip_node in range(self.graph.get_m(), self.graph.get_matrix_size()):
-    #         partitions[self.__find_closest_depot_by_cost__(trip_node)] += [trip_node]
-    #
-    #     self.__setup_partitions__(partitions)
-
-    # def execute(self):
-    #     # Partition based on node index
-    #     m = self.graph.get_m()
-    #     n = self.graph.get_n()
-    #     partition_size = int(n / m)
-    #
-    #     partitions = []
-    #     for index in range(m, n, partition_size):
-    #         partitions.append(list(range(index, index + partition_size)))
-    #
-    #     self.__setup_partitions__(partitions)
-
     def execute(self):
-        # Partition based on balanced node weights
-        def get_node_weight(node):
-            cost_matrix = self.graph.get_cost_matrix()
-
-            in_weight = 0
-            for row_index in range(cost_matrix.shape[0]):
-                if cost_matrix[row_index, node] != -1:
-                    in_weight += 1
-
-            out_weight = 0
-            for col_index in range(cost_matrix.shape[1]):
-                if cost_matrix[node, col_index] != -1:
-                    out_weight += 1
-
-            return in_weight + out_weight
-
-        m = self.graph.get_m()
-        n = self.graph.get_n()
-
-        nodes = list(range(m, n + m))
-        sorted_nodes = sorted(nodes, key=get_node_weight, reverse=True)
-
-        partitions = [[] for _ in range(m)]
-        for index in range(m, n + m):
-            partitions[index % m].append(sorted_nodes[index - m])
-
-        self.__setup_partitions__(partitions)
-
-    def __find_closest_depot_by_cost__(self, node):
-        # Searches the closest depot by cost
-        # Obs.: the search is done using both arc orientations
-        depot_neighbours = list(filter(lambda t: t[0] < self.graph.get_m(), self.graph.get_neighbours_cost(node)))
-        min_depot = min(depot_neighbours, key=lambda t: t[1])
-        return min_depot[0]
+        self.partitions = []
+        self.__setup_partitions__(PARTITION_STRATEGIES[self.strategy](self.graph))
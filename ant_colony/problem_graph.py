@@ -1,3 +1,11 @@
+import numpy as np
+
+from data_readers.cost_matrix_reader import CostMatrixReader, get_memory_map_path, open_memory_map
+
+from ant_colony.feasibility_bitset import FeasibilityBitset
+from ant_colony.feasible_arc_index import FeasibleArcIndex
+
+
 class ProblemGraph:
 
     def __init__(self, cost_matrix, m=None, n=None, depot_capacities=None):
@@ -6,11 +14,146 @@ class ProblemGraph:
         self.n = n
         self.depot_capacities = depot_capacities
 
+        # Built on first use, then shared by everything working on this instance
+        self.arc_index = None
+        self.feasibility_bitset = None
+        self.min_vehicles_count = None
+        self.min_in_costs = None
+        self.trips_bound = None
+
+    @staticmethod
+    def from_file(file_path, memory_map=False):
+        # With memory_map, the cost matrix is a read-only view of the instance cache file
+        m, n, depot_capacities, cost_matrix = CostMatrixReader(file_path, memory_map=memory_map).read()
+        return ProblemGraph(cost_matrix, m, n, depot_capacities)
+
+    def __getstate__(self):
+        # A memory-mapped cost matrix is sent to other processes as its path (the processes map the same file)
+        state = self.__dict__.copy()
+        path = get_memory_map_path(self.cost_matrix)
+        if path is not None:
+            state["cost_matrix"] = path
+
+        return state
+
+    def __setstate__(self, state):
+        if isinstance(state["cost_matrix"], str):
+            state["cost_matrix"] = open_memory_map(state["cost_matrix"])
+
+        self.__dict__.update(state)
+
+    def get_arc_index(self):
+        if self.arc_index is None:
+            self.arc_index = FeasibleArcIndex(self.cost_matrix)
+
+        return self.arc_index
+
+    def get_feasibility_bitset(self):
+        if self.feasibility_bitset is None:
+            self.feasibility_bitset = FeasibilityBitset(self.cost_matrix)
+
+        return self.feasibility_bitset
+
+    def get_min_vehicles_count(self):
+        # Every vehicle serves a path of trips, so at least (trips - maximum matching of the arcs between trips)
+        # vehicles are needed (the minimum path cover of the trips)
+        if self.min_vehicles_count is None:
+            trips_count = self.get_matrix_size() - self.m
+            self.min_vehicles_count = trips_count - self.__get_trips_matching_size__()
+
+        return self.min_vehicles_count
+
+    def get_min_in_costs(self):
+        # The cheapest in arc of every trip (0 for the depots)
+        if self.min_in_costs is None:
+            arc_index = self.get_arc_index()
+            min_in_costs = np.zeros(self.get_matrix_size())
+            for node in range(self.m, self.get_matrix_size()):
+                in_costs = arc_index.get_in_costs(node)
+                if in_costs.shape[0] > 0:
+                    min_in_costs[node] = in_costs.min()
+            self.min_in_costs = min_in_costs.tolist()
+
+        return self.min_in_costs
+
+    def get_trips_bound(self):
+        # Every trip is entered by exactly one arc, so a solution costs at least the cheapest in arcs of its trips
+        # (all the costs are non-negative), plus the extra cost of its vehicles (see __get_vehicles_bound__)
+        if self.trips_bound is None:
+            self.trips_bound = float(sum(self.get_min_in_costs())) + self.__get_vehicles_bound__()
+
+        return self.trips_bound
+
+    def __get_vehicles_bound__(self):
+        # Every vehicle returns to a depot and starts from a trip that is entered from a depot (instead of its
+        # cheapest in arc), and a solution uses at least the vehicles of the minimum path cover of the trips
+        min_vehicles_count = self.get_min_vehicles_count()
+        if min_vehicles_count == 0:
+            return 0.0
+
+        return_costs = np.asarray(self.cost_matrix[self.m:, :self.m], dtype=np.float64)
+        start_costs = np.asarray(self.cost_matrix[:self.m, self.m:], dtype=np.float64)
+        min_return_cost = np.where(return_costs == -1, np.inf, return_costs).min()
+        start_extra_costs = np.where(start_costs == -1, np.inf, start_costs).min(axis=0) - \
+            self.get_min_in_costs()[self.m:]
+        start_extra_costs = np.sort(start_extra_costs)
+
+        return float(min_vehicles_count * min_return_cost + start_extra_costs[:min_vehicles_count].sum())
+
+    def __get_trips_matching_size__(self):
+        arc_index = self.get_arc_index()
+        size = self.get_matrix_size()
+
+        successors = [[] for _ in range(size)]
+        for node in range(self.m, size):
+            out_neighbours = arc_index.get_out_neighbours(node)
+            successors[node] = out_neighbours[out_neighbours >= self.m].tolist()
+
+        matched_successor = [-1] * size
+        matched_predecessor = [-1] * size
+
+        # Greedy matching first, then augmenting paths (depth first, without recursion)
+        for node in range(self.m, size):
+            for successor in successors[node]:
+                if matched_predecessor[successor] == -1:
+                    matched_successor[node] = successor
+                    matched_predecessor[successor] = node
+                    break
+
+        search_stamps = [0] * size
+        for root in range(self.m, size):
+            if matched_successor[root] != -1:
+                continue
+
+            stack = [(root, iter(successors[root]))]
+            while stack:
+                node, remaining_successors = stack[-1]
+
+                for successor in remaining_successors:
+                    if search_stamps[successor] == root:
+                        continue
+                    search_stamps[successor] = root
+
+                    if matched_predecessor[successor] == -1:
+                        # Augment: every node of the stack takes the successor that led to the next one
+                        while stack:
+                            node, _ = stack.pop()
+                            matched_successor[node], successor = successor, matched_successor[node]
+                            matched_predecessor[matched_successor[node]] = node
+                        break
+
+                    stack.append((matched_predecessor[successor], iter(successors[matched_predecessor[successor]])))
+                    break
+                else:
+                    stack.pop()
+
+        return sum(1 for node in range(self.m, size) if matched_successor[node] != -1)
+
     def get_in_neighbours(self, node):
-        return [row_index for row_index in range(self.cost_matrix.shape[0]) if self.cost_matrix[row_index, node] != -1]
+        return self.get_arc_index().get_in_neighbours(node).tolist()
 
     def get_out_neighbours(self, node):
-        return [col_index for col_index in range(self.cost_matrix.shape[1]) if self.cost_matrix[node, col_index] != -1]
+        return self.get_arc_index().get_out_neighbours(node).tolist()
 
     def get_neighbours(self, node, orientation="all"):
         if orientation == "in":
@@ -21,12 +164,12 @@ class ProblemGraph:
         return self.get_in_neighbours(node) + self.get_out_neighbours(node)
 
     def get_in_neighbours_cost(self, node):
-        return [(row_index, self.cost_matrix[row_index, node]) for row_index in range(self.cost_matrix.shape[0]) if
-                self.cost_matrix[row_index, node] != -1]
+        arc_index = self.get_arc_index()
+        return list(zip(arc_index.get_in_neighbours(node).tolist(), arc_index.get_in_costs(node).tolist()))
 
     def get_out_neighbours_cost(self, node):
-        return [(col_index, self.cost_matrix[node, col_index]) for col_index in range(self.cost_matrix.shape[1]) if
-                self.cost_matrix[node, col_index] != -1]
+        arc_index = self.get_arc_index()
+        return list(zip(arc_index.get_out_neighbours(node).tolist(), arc_index.get_out_costs(node).tolist()))
 
     def get_neighbours_cost(self, node, orientation="all"):
         if orientation == "in":
@@ -52,4 +195,4 @@ class ProblemGraph:
         return self.cost_matrix.shape[0]
 
     def get_depot_capacities(self):
-        return self.depot_capacities
\ No newline at end of file
+        return self.depot_capacities
@@ -0,0 +1,234 @@
+import numpy as np
+
+from ant_colony.feasibility_bitset import get_first_node, get_nodes
+
+
+class RouteSolution:
+
+    def __init__(self, m, size):
+        self.m = m
+        self.size = size
+
+        # For each depot, the routes (lists of trips) of the vehicles that leave and return to that depot
+        self.routes = [[] for _ in range(m)]
+
+    @staticmethod
+    def from_matrix(solution_matrix, m):
+        solution = RouteSolution(m, solution_matrix.shape[0])
+
+        # The successor of a trip is the first node on its row
+        successors = np.argmax(solution_matrix == 1, axis=1)
+
+        for depot in range(m):
+            for start in np.nonzero(solution_matrix[depot] == 1)[0]:
+                route = []
+                current = start
+
+                while current >= m:
+                    route.append(int(current))
+                    current = successors[current]
+
+                    if len(route) > solution.size:
+                        raise ValueError(f"The path starting at {start} does not return to a depot")
+
+                solution.add_route(depot, route)
+
+        return solution
+
+    def copy(self):
+        solution = RouteSolution(self.m, self.size)
+        solution.routes = [[list(route) for route in depot_routes] for depot_routes in self.routes]
+        return solution
+
+    def add_route(self, depot, route):
+        self.routes[depot].append(route)
+
+    def get_routes(self):
+        return self.routes
+
+    def get_depot_routes(self, depot):
+        return self.routes[depot]
+
+    def set_depot_routes(self, depot, routes):
+        self.routes[depot] = routes
+
+    def get_vehicles_count(self):
+        return np.array([len(depot_routes) for depot_routes in self.routes])
+
+    def get_successors(self):
+        # The successor of every trip (a trip or the depot it returns to), -1 for the depots
+        successors = np.full(self.size, -1, dtype=np.int64)
+        for depot, depot_routes in enumerate(self.routes):
+            for route in depot_routes:
+                successors[route] = route[1:] + [depot]
+
+        return successors
+
+    def get_arcs(self):
+        sources = []
+        destinations = []
+        for depot, depot_routes in enumerate(self.routes):
+            for route in depot_routes:
+                path = [depot] + route + [depot]
+                sources += path[:-1]
+                destinations += path[1:]
+
+        return np.array(sources, dtype=np.int64), np.array(destinations, dtype=np.int64)
+
+    def get_cost(self, cost_matrix):
+        sources, destinations = self.get_arcs()
+        return float(np.sum(cost_matrix[sources, destinations]))
+
+    def to_matrix(self):
+        solution_matrix = np.zeros((self.size, self.size))
+        sources, destinations = self.get_arcs()
+        solution_matrix[sources, destinations] = 1
+
+        return solution_matrix
+
+
+def join_routes_near_depot(routes, feasibility):
+    # Joins routes of the same depot by linking the last trip of a route (in_trip)
+    # with the first trip of another route (out_trip), which saves one vehicle for each link
+
+    in_routes = sorted(range(len(routes)), key=lambda t: routes[t][-1])
+
+    # The route of every out_trip, and the out_trips that are not linked to a previous route yet
+    out_trip_routes = {routes[route_index][0]: route_index for route_index in range(len(routes))}
+    free_out_trips = feasibility.to_bits(out_trip_routes)
+
+    next_route = [-1 for _ in range(len(routes))]
+    previous_route = [-1 for _ in range(len(routes))]
+    chain_head = list(range(len(routes)))
+
+    joins_count = 0
+    # For each in_trip
+    for in_route in in_routes:
+        in_node = routes[in_route][-1]
+
+        # The free out_trips with a feasible arc from the in_trip
+        # (except the start of the same chain of routes), matched in increasing order of their indices
+        out_trips = feasibility.get_feasible_successors(in_node, free_out_trips)
+        out_trips &= ~(1 << routes[chain_head[in_route]][0])
+        if out_trips == 0:
+            continue
+
+        out_route = out_trip_routes[get_first_node(out_trips)]
+        next_route[in_route] = out_route
+        previous_route[out_route] = in_route
+        free_out_trips ^= 1 << routes[out_route][0]
+
+        # The chain that starts with out_route now starts with the head of in_route's chain
+        current = out_route
+        while current != -1:
+            chain_head[current] = chain_head[in_route]
+            current = next_route[current]
+
+        joins_count += 1
+
+    joined_routes = []
+    for route_index in range(len(routes)):
+        if previous_route[route_index] == -1:
+            joined_route = []
+            current = route_index
+            while current != -1:
+                joined_route += routes[current]
+                current = next_route[current]
+
+            joined_routes.append(joined_route)
+
+    return joined_routes, joins_count
+
+
+def join_circuits(depots_circuits, depots_order, feasibility):
+    # One pass of circuit joins: every circuit (shortest first) is inserted into a circuit of the first depot
+    # (in depots_order) where it fits between two consecutive nodes, which saves one vehicle of its depot
+    # A circuit that was joined (or that received another circuit) is not used again during the pass
+    m = len(depots_circuits)
+
+    depots_circuits = [sorted(circuits, key=lambda t: len(t)) for circuits in depots_circuits]
+    used_circuits = [[False] * len(circuits) for circuits in depots_circuits]
+
+    # The depot, circuit and position of every trip (the positions in the used circuits are not needed anymore)
+    locations = dict()
+    for depot, circuits in enumerate(depots_circuits):
+        for circuit_index, circuit in enumerate(circuits):
+            for position, node in enumerate(circuit):
+                locations[node] = (depot, circuit_index, position)
+
+    # The trips of the circuits that are not used, and the first trips of these circuits (for every depot)
+    available_trips = feasibility.to_bits(locations)
+    available_first_trips = [feasibility.to_bits(circuit[0] for circuit in circuits) for circuits in depots_circuits]
+
+    def set_used(depot, circuit_index, used):
+        nonlocal available_trips
+
+        circuit = depots_circuits[depot][circuit_index]
+        used_circuits[depot][circuit_index] = used
+        if used:
+            available_trips &= ~feasibility.to_bits(circuit)
+            available_first_trips[depot] &= ~(1 << circuit[0])
+        else:
+            available_trips |= feasibility.to_bits(circuit)
+            available_first_trips[depot] |= 1 << circuit[0]
+
+    joins_counts = [0] * m
+    for depot, circuits in enumerate(depots_circuits):
+        for circuit_index in range(len(circuits)):
+
+            if used_circuits[depot][circuit_index]:
+                continue
+
+            # (a circuit cannot be inserted into itself)
+            set_used(depot, circuit_index, True)
+
+            current = circuits[circuit_index]
+            current_start = current[0]
+            current_end = current[-1]
+            end_successors = feasibility.get_out_bits(current_end)
+
+            # The first insertion point (circuit index, position) in the circuits of every depot
+            insertion_points = dict()
+
+            # Between a trip and its next node: the available trips that can precede the start of the current
+            # circuit, and whose next node can follow its end
+            for node in get_nodes(feasibility.get_feasible_predecessors(current_start, available_trips)):
+                other_depot, other_index, position = locations[node]
+
+                other = depots_circuits[other_depot][other_index]
+                next_node = other[position + 1] if position + 1 < len(other) else other_depot
+                if (end_successors >> next_node) & 1:
+                    insertion_point = (other_index, position + 1)
+                    if other_depot not in insertion_points or insertion_point < insertion_points[other_depot]:
+                        insertion_points[other_depot] = insertion_point
+
+            # Between the depot and the first trip of a circuit: the available first trips that can follow the end
+            # of the current circuit, when their depot can precede its start
+            for other_depot in range(m):
+                first_trips = end_successors & available_first_trips[other_depot]
+                if first_trips != 0 and feasibility.is_feasible(other_depot, current_start):
+                    insertion_point = (min(locations[node][1] for node in get_nodes(first_trips)), 0)
+                    if other_depot not in insertion_points or insertion_point < insertion_points[other_depot]:
+                        insertion_points[other_depot] = insertion_point
+
+            joined = False
+            for other_depot in depots_order:
+                if other_depot in insertion_points:
+                    # The depot arcs of the current circuit are removed
+                    other_index, position = insertion_points[other_depot]
+                    set_used(other_depot, other_index, True)
+
+                    other = depots_circuits[other_depot][other_index]
+                    depots_circuits[other_depot][other_index] = other[:position] + current + other[position:]
+                    circuits[circuit_index] = None
+
+                    joins_counts[depot] += 1
+                    joined = True
+                    break
+
+            if not joined:
+                set_used(depot, circuit_index, False)
+
+    depots_circuits = [[circuit for circuit in circuits if circuit is not None] for circuits in depots_circuits]
+
+    return depots_circuits, joins_counts
@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def choose_next_node(pheromone_matrix, heuristic_matrix, current_node, candidates, alpha, exploit):
+    # The heuristic matrix already holds eta ** beta, so only tau ** alpha is computed here
+    products = pheromone_matrix[current_node, candidates]
+    if alpha != 1.0:
+        products = products ** alpha
+    products = products * heuristic_matrix[current_node, candidates]
+
+    if exploit:
+        # Argmax heuristic (first candidate with the greatest product)
+        return candidates[np.argmax(products)]
+
+    # ACO heuristic (roulette wheel on the cumulative products)
+    cumulative_products = np.cumsum(products)
+    selected = np.searchsorted(cumulative_products, np.random.rand() * cumulative_products[-1])
+
+    return candidates[min(selected, candidates.shape[0] - 1)]
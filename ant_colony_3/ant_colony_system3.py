@@ -3,39 +3,54 @@ import random
 import numpy as np
 from tqdm import tqdm
 
+from ant_colony.batch_construction import BatchConstructionPool
+from ant_colony.construction_state import ConstructionState
+from ant_colony.heuristic_cache import HeuristicCache
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony.route_solution import RouteSolution, join_circuits, join_routes_near_depot
+from ant_colony.transition_rule import choose_next_node
+
 
 class Ant3:
     def __init__(self,
-                 m,
-                 n,
-                 cost_matrix,
-                 depot_capacities,
+                 problem_graph: ProblemGraph,
                  pheromone_matrix,
-                 ant_params: tuple):
-
-        self.m = m
-        self.n = n
-        self.cost_matrix = cost_matrix
-        self.inverse_div_cost_matrix = 1 / (self.cost_matrix + 1e-10)  # avoid zero cost division
-        self.depot_capacities = np.array(depot_capacities)
+                 heuristic_cache: HeuristicCache,
+                 ant_params: tuple,
+                 capacity_aware=False):
+
+        self.m = problem_graph.get_m()
+        self.n = problem_graph.get_n()
+        self.cost_matrix = problem_graph.get_cost_matrix()
+        self.arc_index = problem_graph.get_arc_index()
+        self.feasibility = problem_graph.get_feasibility_bitset()
+        self.heuristic_matrix = heuristic_cache.get_eta_beta()
+        self.depot_capacities = np.array(problem_graph.get_depot_capacities())
 
         self.global_pheromone_matrix = pheromone_matrix
-        self.local_pheromone_matrix = np.zeros(pheromone_matrix.shape)
 
         self.tau_0, self.alpha, self.beta, self.phi, self.q_0, self.teleport_factor = ant_params
 
-        self.unvisited = list(range(cost_matrix.shape[0]))
+        self.visited = np.zeros(self.cost_matrix.shape[0], dtype=bool)
+        self.unvisited_count = self.cost_matrix.shape[0]
 
         # the ant always starts from the depot
         # but a new vehicle is used (counted) every time the ant is returning to the depot
-        # self.depot_visits = 0
-        self.depot_visits = np.array([0 for _ in range(self.m)])
+        # Running cost, vehicles used and vehicles left of every depot (updated at every step of the construction)
+        # The circuit joins can replace arcs between trips, so only the trips in arcs bound the final cost
+        self.construction_state = ConstructionState(problem_graph, fixed_trip_arcs=False)
 
-        self.solution = []
-        self.solution_cost = -1
+        # Constructions that cannot get under this cost are abandoned (None: never)
+        self.cost_bound = None
+
+        # With the capacity aware construction, the routes only start from the depots with vehicles left,
+        # and the last vehicle only returns to a depot when it cannot continue
+        # (otherwise, the constructions that exceed the capacities after the repair are started again)
+        self.capacity_aware = capacity_aware
+        self.retries_count = 0
 
-    def get_local_pheromone_matrix(self):
-        return self.local_pheromone_matrix
+        self.solution = None
+        self.solution_cost = -1
 
     def get_solution(self):
         return self.solution
@@ -49,123 +64,74 @@ class Ant3:
     def set_global_pheromone_matrix(self, matrix):
         self.global_pheromone_matrix = matrix
 
-    def __get_node_neighbours__(self, node, current_depot):
-        neighbours = []
-        for unvisited_node in self.unvisited:
-            if self.cost_matrix[node, unvisited_node] != -1:
-                neighbours.append(unvisited_node)
-
-        if node != current_depot:
-            neighbours = [current_depot] + neighbours[self.m:]
+    def set_cost_bound(self, cost_bound):
+        self.cost_bound = cost_bound
 
-        return neighbours
+    def get_running_cost(self):
+        return self.construction_state.get_running_cost()
 
-    def __choose_argmax_heuristic__(self, current_node, current_neighbours):
-        products = []
-        for neigh in current_neighbours:
-            neigh_product = (self.global_pheromone_matrix[current_node, neigh] ** self.alpha) * \
-                            (self.inverse_div_cost_matrix[current_node, neigh] ** self.beta)
-            products.append(neigh_product)
+    def get_depot_visits(self):
+        return self.construction_state.get_depot_visits()
 
-        argmax_index = 0
-        for index, neigh_product in enumerate(products):
-            if neigh_product > products[argmax_index]:
-                argmax_index = index
+    def get_remaining_capacities(self):
+        return self.construction_state.get_remaining_capacities()
 
-        return current_neighbours[argmax_index]
+    def get_cost_lower_bound(self):
+        return self.construction_state.get_lower_bound()
 
-    def __choose_aco_heuristic__(self, current_node, current_neighbours):
+    def get_retries_count(self):
+        # The constructions that were started again during the last call of construct_solution
+        return self.retries_count
 
-        products = []
-        for neigh in current_neighbours:
-            neigh_product = (self.global_pheromone_matrix[current_node, neigh] ** self.alpha) * \
-                            (self.inverse_div_cost_matrix[current_node, neigh] ** self.beta)
-            products.append(neigh_product)
+    def is_pruned(self):
+        return self.solution is None
 
-        products_sum = sum(products)
+    def __get_node_neighbours__(self, node, current_depot):
+        out_neighbours = self.arc_index.get_out_neighbours(node)
+        neighbours = out_neighbours[~self.visited[out_neighbours]]
 
-        probabilities = []
-        for neigh_product in products:
-            probabilities.append(neigh_product / products_sum)
+        if node != current_depot:
+            neighbours = neighbours[self.m:]
 
-        cumulative_probabilities = np.cumsum(probabilities)
-        cumulative_probabilities[-1] = 1.0
+            # The vehicle returns to its depot, unless it is the last vehicle and it can continue
+            if not self.capacity_aware or neighbours.shape[0] == 0 or \
+                    self.construction_state.get_vehicles_left() > 1:
+                neighbours = np.concatenate(([current_depot], neighbours))
 
-        selected_neigh = 0
-        random_number = np.random.rand()
-        for index, cumulative_prob in enumerate(cumulative_probabilities):
-            if random_number <= cumulative_prob:
-                selected_neigh = index
-                break
+        return neighbours
 
-        return current_neighbours[selected_neigh]
+    def __visit__(self, node):
+        self.visited[node] = True
+        self.unvisited_count -= 1
 
     def __reduce_vehicles_near_depot__(self, solution):
 
         for depot_index in range(self.m):
+            # Join the routes (the trips that enter the depot directly with the ones that leave it directly)
+            routes, joins_count = join_routes_near_depot(solution.get_depot_routes(depot_index),
+                                                         self.feasibility)
+            solution.set_depot_routes(depot_index, routes)
 
-            # Find all trips that enter the depot directly (in_trips)
-            in_nodes = []
-            for row_index in range(self.m, solution.shape[0]):
-                if solution[row_index, depot_index] == 1:
-                    in_nodes.append(row_index)
-
-            # Find all the trips that leave the depot directly (out_trips)
-            out_nodes = []
-            for col_index in range(self.m, solution.shape[1]):
-                if solution[depot_index, col_index] == 1:
-                    out_nodes.append(col_index)
-
-            output_used = []
-            # For each in_trip and out_trip
-            for in_index, in_node in enumerate(in_nodes):
-                for out_index, out_node in enumerate(out_nodes):
-                    # if there is a feasible arc between the in_trip and the out_trip
-                    if self.cost_matrix[in_node, out_node] != -1 and out_node not in output_used:
-                        # Remove old arcs to/from depot
-                        solution[in_node, depot_index] = 0
-                        solution[depot_index, out_node] = 0
-
-                        # Add new arc between the
-                        solution[in_node, out_node] = 1
-
-                        output_used += [out_node]
-
-                        # Remove one vehicle
-                        self.depot_visits[depot_index] -= 1
-                        # Go to the next in_trip
-                        break
+            # Remove one vehicle for each join
+            self.construction_state.remove_vehicles(depot_index, joins_count)
 
         return solution
 
     def __get_circuits_paths__(self, solution):
 
+        # The circuits (routes) of every depot, ordered by their first trip
         depots_circuits = []
         for depot_index in range(self.m):
-
-            current_depot_circuits = []
-            for start_index in range(solution.shape[1]):
-
-                # If it is a starting index
-                if solution[depot_index, start_index] == 1:
-
-                    circuit = []
-                    current = start_index
-
-                    while current != depot_index:
-                        circuit += [current]
-                        current = np.where(solution[current] == 1)[0][0]
-                        # for index in range(solution.shape[1]):
-                        #     if solution[current, index] == 1:
-                        #         current = index
-                        #         break
-
-                    current_depot_circuits += [circuit]
-
-            depots_circuits += [current_depot_circuits]
+            depots_circuits += [sorted(solution.get_depot_routes(depot_index), key=lambda t: t[0])]
 
         return depots_circuits
 
+    def __update_depots_routes__(self, solution, depots_circuits):
+        # The circuits that were joined into other circuits are marked with None
+        for depot_index in range(self.m):
+            solution.set_depot_routes(depot_index,
+                                      [circuit for circuit in depots_circuits[depot_index] if circuit is not None])
+
     def __reduce_vehicles_by_same_depot_circuits_joins__(self, solution, depot_circuits):
 
         changes_are_made = False
@@ -197,120 +163,43 @@ class Ant3:
                                 other_node = other[node_index]
                                 other_next_node = other[node_index + 1]
 
-                                if self.cost_matrix[other_node, current_start] != -1 and \
-                                        self.cost_matrix[current_end, other_next_node] != -1:
-                                    # Remove the other circuit edge
-                                    solution[other_node, other_next_node] = 0
-
-                                    # print("ceva")
-
-                                    # Remove depot edges to current circuit
-                                    solution[depot_index, current_start] = 0
-                                    solution[current_end, depot_index] = 0
-
-                                    # Add the 2 new edges (join the two circuits)
-                                    solution[other_node, current_start] = 1
-                                    solution[current_end, other_next_node] = 1
+                                if self.feasibility.is_feasible(other_node, current_start) and \
+                                        self.feasibility.is_feasible(current_end, other_next_node):
+                                    # Insert the current circuit between the two nodes of the other circuit
+                                    # (the depot edges of the current circuit are removed)
+                                    other_circuit = current_circuits[other_index]
+                                    current_circuits[other_index] = \
+                                        other_circuit[:node_index] + current + other_circuit[node_index:]
+                                    current_circuits[circuit_index] = None
 
                                     used_circuits += [circuit_index, other_index]
                                     found = True
                                     changes_are_made = True
-                                    self.depot_visits[depot_index] -= 1
+                                    self.construction_state.remove_vehicles(depot_index, 1)
 
                                     break
 
                         if found:
                             break
 
-        return solution, changes_are_made
-
-    def __search_and_join_circuit__(self, depot_index,
-                                    other_depot,
-                                    depots_circuits,
-                                    used_circuits,
-                                    circuit_index,
-                                    current_start,
-                                    current_end,
-                                    solution):
-
-        other_circuits = depots_circuits[other_depot]
-
-        for other_index in range(len(other_circuits)):
-
-            if (other_index != circuit_index or other_depot != depot_index) and \
-                    other_index not in used_circuits:
-
-                other = [other_depot]
-                other += other_circuits[other_index]
-                other += [other_depot]
-
-                for node_index in range(len(other) - 1):
-                    other_node = other[node_index]
-                    other_next_node = other[node_index + 1]
+        self.__update_depots_routes__(solution, depot_circuits)
 
-                    if self.cost_matrix[other_node, current_start] != -1 and \
-                            self.cost_matrix[current_end, other_next_node] != -1:
-                        # Remove the other circuit edge
-                        solution[other_node, other_next_node] = 0
-
-                        # Remove depot edges to current circuit
-                        solution[depot_index, current_start] = 0
-                        solution[current_end, depot_index] = 0
-
-                        # Add the 2 new edges (join the two circuits)
-                        solution[other_node, current_start] = 1
-                        solution[current_end, other_next_node] = 1
-
-                        used_circuits += [circuit_index, other_index]
-
-                        used_circuits[depot_index] += [circuit_index]
-                        used_circuits[other_depot] += [other_index]
-
-                        self.depot_visits[depot_index] -= 1
-
-                        return True
-
-        return False
+        return solution, changes_are_made
 
     def __reduce_vehicles_by_circuits_joins__(self, solution, depot_circuits):
 
-        changes_are_made = False
-
-        used_circuits = []
-        for depot_index in range(self.m):
-            used_circuits.append([])
-
-            depot_circuits[depot_index] = sorted(depot_circuits[depot_index], key=lambda t: len(t))
-            # random.shuffle(depot_circuits[depot_index])
-
         depot_list = list(range(self.m))
         random.shuffle(depot_list)
 
-        for depot_index in range(self.m):
-
-            current_circuits = depot_circuits[depot_index]
+        depot_circuits, joins_counts = join_circuits(depot_circuits, depot_list, self.feasibility)
 
-            for circuit_index in range(len(current_circuits)):
+        # Remove one vehicle for each join
+        for depot_index in range(self.m):
+            self.construction_state.remove_vehicles(depot_index, joins_counts[depot_index])
 
-                if circuit_index not in used_circuits[depot_index]:
-                    current = current_circuits[circuit_index]
-                    current_start = current[0]
-                    current_end = current[-1]
+        self.__update_depots_routes__(solution, depot_circuits)
 
-                    for other_depot in depot_list:
-
-                        if self.__search_and_join_circuit__(depot_index,
-                                                            other_depot,
-                                                            depot_circuits,
-                                                            used_circuits,
-                                                            circuit_index,
-                                                            current_start,
-                                                            current_end,
-                                                            solution):
-                            changes_are_made = True
-                            break
-
-        return solution, changes_are_made
+        return solution, sum(joins_counts) > 0
 
     def __reduce_vehicles__(self, solution):
 
@@ -325,47 +214,49 @@ class Ant3:
     def __choose_depot__(self):
         # Roulette wheel - choosing the depot based on the available vehicles
 
-        depot_values = [self.depot_capacities[index] - self.depot_visits[index] for index in range(self.m)]
-        depots_sum = sum([max([0, depot_val]) for depot_val in depot_values])
+        depot_values = self.construction_state.get_remaining_capacities()
+        depots_sum = np.maximum(depot_values, 0).sum()
 
         if depots_sum > 0:
-            probabilities = [depot_val / depots_sum for depot_val in depot_values]
-            cumulative_probs = np.cumsum(probabilities)
+            cumulative_probs = np.cumsum(depot_values / depots_sum)
             cumulative_probs[-1] = 1.0
 
             random_number = np.random.rand()
-            for index, prob in enumerate(cumulative_probs):
-                if random_number <= prob:
-                    return index
+            return int(np.argmax(random_number <= cumulative_probs))
 
         else:
             # returns the index of the max depot visits
-            return np.argmax(self.depot_visits)
+            return np.argmax(self.construction_state.get_depot_visits())
 
     def construct_solution(self):
-        solution = []
-        self.depot_visits = self.depot_capacities + 1
+        solution = None
+        pruned = False
+        state = self.construction_state
+        self.retries_count = -1
 
         # A solution is feasible only when the depot capacity is not exceeded
-        while np.any(self.depot_visits > self.depot_capacities):
+        while not pruned and (solution is None or state.exceeds_capacities()):
 
-            self.depot_visits = np.array([0 for _ in range(self.m)])
+            self.retries_count += 1
+            state.reset(bounded=self.cost_bound is not None)
 
-            self.local_pheromone_matrix = np.zeros(self.global_pheromone_matrix.shape)
-            self.unvisited = list(range(self.cost_matrix.shape[0]))
+            self.visited[:] = False
+            self.unvisited_count = self.cost_matrix.shape[0]
 
             # Start from a depot
             current_node = self.__choose_depot__()
             current_depot = current_node
-            solution = np.zeros(self.cost_matrix.shape)
+            solution = RouteSolution(self.m, self.cost_matrix.shape[0])
+            current_route = []
             depot_reached = False
 
-            while len(self.unvisited) > 0:
+            while self.unvisited_count > 0:
 
                 if depot_reached:
                     depot_reached = False
                     random_number = np.random.rand()
-                    if random_number <= self.teleport_factor:
+                    if random_number <= self.teleport_factor or \
+                            (self.capacity_aware and state.get_remaining_capacities()[current_node] <= 0):
                         # teleport to a depot (it could be the same depot)
                         current_node = self.__choose_depot__()
                         current_depot = current_node
@@ -373,34 +264,49 @@ class Ant3:
                 current_neighbours = self.__get_node_neighbours__(current_node, current_depot)
 
                 q = np.random.rand()
-                if q <= self.q_0:
-                    next_node = self.__choose_argmax_heuristic__(current_node, current_neighbours)
-                else:
-                    next_node = self.__choose_aco_heuristic__(current_node, current_neighbours)
+                next_node = choose_next_node(self.global_pheromone_matrix, self.heuristic_matrix,
+                                             current_node, current_neighbours, self.alpha, exploit=q <= self.q_0)
+
+                state.add_arc(current_node, next_node)
 
                 # If the ant returns to a depot, then it finished using one vehicle
                 # The next time it starts a new path, it will use another vehicle
                 if next_node < self.m:
-                    self.depot_visits[next_node] += 1
                     depot_reached = True
+                    solution.add_route(next_node, current_route)
+                    current_route = []
+                else:
+                    current_route.append(int(next_node))
 
                 # Consider the node visited if it is not a depot node
                 # or if the current node is the last visited node (which is always a depot node)
                 if next_node >= self.m:
-                    self.unvisited.remove(next_node)
-                elif len(self.unvisited) == self.m:
+                    self.__visit__(next_node)
+                elif self.unvisited_count == self.m:
                     for depot in range(self.m):
-                        self.unvisited.remove(depot)
+                        self.__visit__(depot)
 
-                solution[current_node][next_node] = 1
                 current_node = next_node
 
+                # Abandoned as soon as it cannot get under the cost bound (e.g. the best cost so far)
+                if self.cost_bound is not None and state.get_lower_bound() >= self.cost_bound:
+                    pruned = True
+                    break
+
+            if pruned:
+                break
+
             # if np.any(self.depot_visits > self.depot_capacities):
             solution = self.__reduce_vehicles__(solution)
 
-        self.solution = solution
-        self.solution_cost = np.sum(np.multiply(self.cost_matrix, self.solution))
-        self.local_pheromone_matrix = self.solution * (1 / self.solution_cost)
+        if pruned:
+            self.solution = None
+            self.solution_cost = -1
+        else:
+            self.solution = solution
+            self.solution_cost = self.solution.get_cost(self.cost_matrix)
+            state.set_running_cost(self.solution_cost)
+
         self.global_pheromone_matrix = (1 - self.phi) * self.global_pheromone_matrix + self.phi * self.tau_0
 
         return self.global_pheromone_matrix
@@ -423,7 +329,12 @@ class AntColonySystem3:
                  ro,
                  phi,
                  q_0,
-                 teleport_factor
+                 teleport_factor,
+                 heuristic_dtype="float64",
+                 batch_workers=0,
+                 seed=None,
+                 prune=False,
+                 capacity_aware=False
                  ):
         self.cost_save_path = cost_save_path
         self.solution_save_path = solution_save_path
@@ -439,15 +350,39 @@ class AntColonySystem3:
         self.q_0 = q_0
         self.teleport_factor = teleport_factor
 
+        # With batch workers, all the ants of an iteration construct their solutions in parallel
+        # (from the same pheromone matrix), then the pheromone updates are applied in the order of the ants
+        self.batch_workers = batch_workers
+        self.seed = seed
+
+        # The circuit joins of the repair can replace any arc between trips, so the constructions have no
+        # lower bound better than the one of the whole instance (which never reaches the best cost)
+        if prune:
+            raise ValueError("ACS_3 cannot prune its constructions (its repair can replace the arcs between trips)")
+        self.prune = prune
+
+        # With capacity_aware, the ants respect the depots capacities during the construction
+        # (instead of constructing again the solutions that still exceed them after the repair)
+        self.capacity_aware = capacity_aware
+
         self.pheromone_matrix = np.full(self.cost_matrix.shape, self.tau_0)
 
-        self.ants = [Ant3(m, n, self.cost_matrix, self.depot_capacities, self.pheromone_matrix,
-                          (self.tau_0, self.alpha, self.beta, self.phi, self.q_0, self.teleport_factor))
+        # eta and eta ** beta do not change during the run, so they are computed once for all the ants
+        self.heuristic_cache = HeuristicCache(self.cost_matrix, self.beta, heuristic_dtype)
+
+        self.graph = ProblemGraph(self.cost_matrix, m, n, self.depot_capacities)
+
+        self.ant_params = (self.tau_0, self.alpha, self.beta, self.phi, self.q_0, self.teleport_factor)
+        self.ants = [Ant3(self.graph, self.pheromone_matrix, self.heuristic_cache, self.ant_params,
+                          capacity_aware)
                      for _ in range(self.number_of_ants)]
 
-        self.best_solution = []
+        self.best_solution = None
         self.best_solution_cost = -1
-        self.best_local_pheromones_matrix = []
+
+        # Throughput counters (the retries are the constructions started again because of the depots capacities)
+        self.constructions_count = 0
+        self.retries_count = 0
 
     def get_best_cost(self):
         return self.best_solution_cost
@@ -455,47 +390,108 @@ class AntColonySystem3:
     def get_best_solution(self):
         return self.best_solution
 
+    def get_constructions_count(self):
+        return self.constructions_count
+
+    def get_retries_count(self):
+        return self.retries_count
+
     def __log__(self, iteration, current_solution, current_cost):
 
         with open(self.cost_save_path, "a") as file:
             file.write(f"{iteration}: {current_cost}\n")
 
         with open(self.solution_save_path, "a") as file:
-            file.write(f"{iteration}: {current_solution.tolist()}\n")
+            file.write(f"{iteration}: {current_solution.to_matrix().tolist()}\n")
 
-    def execute(self):
+    def __get_cost_bound__(self):
+        if self.prune and self.best_solution is not None:
+            return self.best_solution_cost
+
+        return None
+
+    def __update_best__(self, solution, cost):
+        # Update best so far (a pruned construction has no solution)
+        if solution is None:
+            pass
+        elif cost < self.best_solution_cost or self.best_solution_cost == -1:
+            self.best_solution_cost = cost
+            self.best_solution = solution
 
-        for iteration in tqdm(range(self.number_of_iterations)):
+        # Update global pheromones (only the arcs of the best solution so far get a deposit)
+        self.pheromone_matrix = (1 - self.ro) * self.pheromone_matrix
+        best_sources, best_destinations = self.best_solution.get_arcs()
+        self.pheromone_matrix[best_sources, best_destinations] += self.ro * (1 / self.best_solution_cost)
 
-            current_best_cost = -1
-            current_best_solution = np.array([])
+    def __construct_solutions__(self, batch_pool):
 
+        constructions = []
+
+        if batch_pool is None:
             for ant_index in range(self.number_of_ants):
 
                 # Ant construction steps
                 ant = self.ants[ant_index]
 
                 ant.set_global_pheromone_matrix(self.pheromone_matrix)
+                ant.set_cost_bound(self.__get_cost_bound__())
                 self.pheromone_matrix = ant.construct_solution()
 
-                current_cost = ant.get_solution_cost()
+                self.constructions_count += 1
+                self.retries_count += ant.get_retries_count()
+
+                self.__update_best__(ant.get_solution(), ant.get_solution_cost())
+                constructions.append((ant.get_solution(), ant.get_solution_cost()))
+
+        else:
+            # All the ants construct their solutions from a snapshot of the pheromone matrix
+            for solution, cost, retries in batch_pool.construct_solutions(self.pheromone_matrix,
+                                                                            self.number_of_ants,
+                                                                            self.__get_cost_bound__()):
+
+                # Local pheromones update (the one done by the ant in the sequential mode)
+                self.pheromone_matrix = (1 - self.phi) * self.pheromone_matrix + self.phi * self.tau_0
+
+                self.constructions_count += 1
+                self.retries_count += retries
+
+                self.__update_best__(solution, cost)
+                constructions.append((solution, cost))
+
+        return constructions
+
+    def execute(self):
+
+        batch_pool = None
+        if self.batch_workers > 0:
+            batch_pool = BatchConstructionPool(Ant3, self.graph, self.heuristic_cache, self.ant_params,
+                                               self.batch_workers, self.seed,
+                                               ant_options=dict(capacity_aware=self.capacity_aware))
+
+        try:
+            for iteration in tqdm(range(self.number_of_iterations)):
+
+                current_best_cost = -1
+                current_best_solution = None
+
+                for current_solution, current_cost in self.__construct_solutions__(batch_pool):
+                    if current_solution is None:
+                        continue
 
-                # Update best so far
-                if current_cost < self.best_solution_cost or self.best_solution_cost == -1:
-                    self.best_solution_cost = current_cost
-                    self.best_solution = ant.get_solution()
-                    self.best_local_pheromones_matrix = ant.get_local_pheromone_matrix()
+                    if current_cost < current_best_cost or current_best_cost == -1:
+                        current_best_solution = current_solution
+                        current_best_cost = current_cost
 
-                # Update global pheromones
-                self.pheromone_matrix = (1 - self.ro) * self.pheromone_matrix + \
-                                        self.ro * self.best_local_pheromones_matrix
+                print(self.best_solution_cost)
 
-                if current_cost < current_best_cost or current_best_cost == -1:
-                    current_best_solution = ant.get_solution()
-                    current_best_cost = current_cost
+                # When all the constructions of the iteration were pruned, the best so far is logged
+                if current_best_solution is None:
+                    current_best_solution, current_best_cost = self.best_solution, self.best_solution_cost
 
-            print(self.best_solution_cost)
+                self.__log__(iteration, current_best_solution, current_best_cost)
 
-            self.__log__(iteration, current_best_solution, current_best_cost)
+        finally:
+            if batch_pool is not None:
+                batch_pool.close()
 
         return self.best_solution, self.best_solution_cost
@@ -0,0 +1,78 @@
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from ant_colony.ant_colonies_solver import AntColoniesSolver
+from ant_colony.partitioning.partitioner import Partitioner
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony_2.ant_colony_system2 import AntColonySystem2
+from ant_colony_3.ant_colony_system3 import AntColonySystem3
+from data_readers.cost_matrix_reader import CostMatrixReader
+
+if __name__ == '__main__':
+    file_path = "data/m4n500/m4n500s0.inp"
+    m, n, depot_capacities, cost_matrix = CostMatrixReader(file_path).read()
+
+    params = dict(number_of_iterations=3,
+                  number_of_ants=10,
+                  tau_0=1.0,
+                  alpha=1.0,
+                  beta=2.0,
+                  ro=0.1,
+                  phi=0.1,
+                  q_0=0.5)
+
+    # Only the printed counts are compared, the logs of the colonies go to a scratch directory
+    logs_dir = tempfile.mkdtemp(prefix="capacity_comparison_")
+
+    def get_log_paths(name, capacity_aware):
+        name += "_capacity_aware" if capacity_aware else "_rejection"
+        return dict(cost_save_path=os.path.join(logs_dir, f"{name}_cost.txt"),
+                    solution_save_path=os.path.join(logs_dir, f"{name}_solution.txt"))
+
+    problem_graph = ProblemGraph(cost_matrix, m, n, depot_capacities)
+    partitioner = Partitioner(problem_graph)
+    partitioner.execute()
+
+    algorithms = {
+        "ACS_1": lambda capacity_aware: AntColoniesSolver(**get_log_paths("acs1", capacity_aware),
+                                                          partitioner=partitioner,
+                                                          capacity_aware=capacity_aware,
+                                                          **params),
+        "ACS_2": lambda capacity_aware: AntColonySystem2(**get_log_paths("acs2", capacity_aware),
+                                                         m=m, n=n, cost_matrix=cost_matrix,
+                                                         depot_capacities=depot_capacities,
+                                                         teleport_factor=0.5,
+                                                         capacity_aware=capacity_aware,
+                                                         **params),
+        "ACS_3": lambda capacity_aware: AntColonySystem3(**get_log_paths("acs3", capacity_aware),
+                                                         m=m, n=n, cost_matrix=cost_matrix,
+                                                         depot_capacities=depot_capacities,
+                                                         teleport_factor=0.5,
+                                                         capacity_aware=capacity_aware,
+                                                         **params),
+    }
+
+    for name, create_algorithm in algorithms.items():
+        for capacity_aware in [False, True]:
+            np.random.seed(0)
+            random.seed(0)
+
+            algorithm = create_algorithm(capacity_aware)
+
+            start = time.time()
+            if isinstance(algorithm, AntColoniesSolver):
+                _, cost = algorithm.solve()
+            else:
+                _, cost = algorithm.execute()
+            elapsed_time = time.time() - start
+
+            constructions_count = algorithm.get_constructions_count()
+            retries_count = algorithm.get_retries_count()
+            mode = "capacity aware" if capacity_aware else "rejection"
+            print(f"{name} ({mode}) : {cost}, {elapsed_time:.2f} seconds, "
+                  f"{constructions_count} constructions, {retries_count} retries, "
+                  f"{constructions_count / elapsed_time:.2f} constructions per second")
@@ -0,0 +1,67 @@
+import random
+import time
+
+from ant_colony.feasibility_bitset import get_nodes
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony.route_solution import join_circuits
+
+
+def get_random_circuits(problem_graph, max_length, rng):
+    # Random feasible paths of trips (at most max_length trips each), each assigned to a random depot
+    m = problem_graph.get_m()
+    feasibility = problem_graph.get_feasibility_bitset()
+
+    trips = list(range(m, problem_graph.get_matrix_size()))
+    unvisited_trips = feasibility.to_bits(trips)
+    rng.shuffle(trips)
+
+    depots_circuits = [[] for _ in range(m)]
+    for trip in trips:
+        if not (unvisited_trips >> trip) & 1:
+            continue
+
+        circuit = [trip]
+        unvisited_trips ^= 1 << trip
+        while len(circuit) < max_length:
+            next_trips = get_nodes(feasibility.get_feasible_successors(circuit[-1], unvisited_trips))
+            if len(next_trips) == 0:
+                break
+
+            circuit.append(rng.choice(next_trips))
+            unvisited_trips ^= 1 << circuit[-1]
+
+        depots_circuits[rng.randrange(m)].append(circuit)
+
+    return depots_circuits
+
+
+if __name__ == '__main__':
+    file_path = "data/m4n500/m4n500s0.inp"
+    problem_graph = ProblemGraph.from_file(file_path)
+    m = problem_graph.get_m()
+
+    # The feasibility bitset is built once per instance (not measured)
+    problem_graph.get_feasibility_bitset()
+
+    for max_length in [1, 2, 3, 4, 8]:
+        rng = random.Random(0)
+        depots_circuits = get_random_circuits(problem_graph, max_length, rng)
+        circuits_count = sum(len(circuits) for circuits in depots_circuits)
+
+        # The repair of the third approach: passes of circuit joins until no circuit can be joined
+        start = time.time()
+        passes_count = 0
+        joins_count = 1
+        while joins_count > 0:
+            depots_order = list(range(m))
+            rng.shuffle(depots_order)
+
+            depots_circuits, joins_counts = join_circuits(depots_circuits, depots_order,
+                                                          problem_graph.get_feasibility_bitset())
+            joins_count = sum(joins_counts)
+            passes_count += 1
+        elapsed_time = time.time() - start
+
+        vehicles_count = sum(len(circuits) for circuits in depots_circuits)
+        print(f"{circuits_count} circuits -> {vehicles_count} vehicles : "
+              f"{elapsed_time * 1000:.2f} ms ({passes_count} passes)")
@@ -1,11 +1,4 @@
-import json
-import os
-
-import numpy as np
-from tqdm import tqdm
-
-from ant_colony_3.ant_colony_system3 import AntColonySystem3
-from data_readers.cost_matrix_reader import CostMatrixReader
+from experiments.experiment_runner import ExperimentRunner
 
 if __name__ == '__main__':
 
@@ -21,41 +14,38 @@ if __name__ == '__main__':
     ]
     instance_names = [f"s{i}.inp" for i in range(0, 5)]
 
-    file_paths = [(f"data/{inst_size}/{inst_size}{inst_name}", inst_size + inst_name) for inst_size in instances_sizes
-                  for inst_name in
-                  instance_names]
+    file_paths = [f"data/{inst_size}/{inst_size}{inst_name}" for inst_size in instances_sizes
+                  for inst_name in instance_names]
 
     print(file_paths)
 
-    for file_path, experiment_name in file_paths:
-
-        m, n, depot_capacities, cost_matrix = CostMatrixReader(file_path).read()
-
-        dir_name = f"./ant_colony_3_results/{experiment_name}_sorted"
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name)
-
-        for run_index in tqdm(range(runs)):
-            params = {
-                "cost_save_path": f"{dir_name}/cost_run_{run_index}.txt",
-                "solution_save_path": f"{dir_name}/solution_run_{run_index}.txt",
-                "number_of_iterations": 50,
-                "number_of_ants": 10,
-                "tau_0": 1.0,
-                "alpha": 1.0,
-                "beta": 2.0,
-                "ro": 0.1,
-                "phi": 0.1,
-                "q_0": 0.5,
-                "teleport_factor": 0.5
+    spec = {
+        "runs": runs,
+        "instances": file_paths,
+        "algorithms": [
+            {
+                "name": "ACS_3",
+                "results_dir": "./ant_colony_3_results",
+                "suffix": "_sorted",
+                "parameter_sets": {
+                    "default": {
+                        "number_of_iterations": 50,
+                        "number_of_ants": 10,
+                        "tau_0": 1.0,
+                        "alpha": 1.0,
+                        "beta": 2.0,
+                        "ro": 0.1,
+                        "phi": 0.1,
+                        "q_0": 0.5,
+                        "teleport_factor": 0.5
+                    }
+                }
             }
+        ],
+        "manifest_path": "./ant_colony_3_results/_manifest.json"
+    }
 
-            with open(f"{dir_name}/_parameters.json", "a") as file:
-                file.write(json.dumps(params, default=lambda t: str(t), sort_keys=False, indent=4))
-
-            acs3 = AntColonySystem3(m=m, n=n, cost_matrix=cost_matrix, depot_capacities=depot_capacities, **params)
-
-            solution, cost = acs3.execute()
+    ExperimentRunner(spec).execute()
 
 # file_path = "data/m4n500/m4n500s0.inp"
 # file_path = "data/m4n500/m4n500s1.inp"
@@ -1,41 +1,151 @@
+import hashlib
+import json
+import mmap
+import os
+
 import numpy as np
 
 
+def get_memory_map_path(array):
+    # Only the arrays loaded as a whole from a .npy file (not their views or copies) can be reopened from it
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap):
+        return array.filename
+
+    return None
+
+
+def open_memory_map(path):
+    return np.load(path, mmap_mode="r")
+
+
 class CostMatrixReader:
 
-    def __init__(self, file_path, _format="standard"):
+    def __init__(self, file_path, _format="standard", use_cache=True, memory_map=False):
         self.file_path = file_path
         self._format = _format
+        self.use_cache = use_cache
+
+        # A memory-mapped matrix is opened read-only from the cache file,
+        # so all the processes working on the same instance share the same physical pages
+        self.memory_map = memory_map and use_cache
+
+        # The parsed matrix is saved next to the instance file, together with what is needed to validate it
+        self.cache_matrix_path = f"{file_path}.npy"
+        self.cache_meta_path = f"{file_path}.meta.json"
 
     def read(self):
 
         if self._format == "standard":
 
-            def process_first_line(line_str):
-                tokens = line_str.split()
+            if self.use_cache:
+                cached = self.__read_cache__()
+                if cached is not None:
+                    return cached
+
+            m, n, depot_capacities, cost_matrix = self.__parse__()
+
+            if self.use_cache:
+                self.__write_cache__(m, n, depot_capacities, cost_matrix)
+
+                # Reopened from the file that was just written (if it could be written)
+                if self.memory_map:
+                    cached = self.__read_cache__()
+                    if cached is not None:
+                        return cached
+
+            return m, n, depot_capacities, cost_matrix
+
+    def __parse__(self):
+
+        def process_first_line(line_str):
+            tokens = line_str.split()
+
+            m = int(tokens[0])
+            n = int(tokens[1])
+
+            depot_capaities = []
+            for index in range(2, len(tokens)):
+                depot_capaities += [int(tokens[index])]
+
+            return m, n, depot_capaities
+
+        with open(self.file_path, "r") as file:
+            m, n, depot_capacities = process_first_line(file.readline())
+
+            # The rest of the file holds the (m + n) x (m + n) cost matrix (whitespace separated)
+            cost_matrix = np.fromstring(file.read(), dtype=np.int32, sep=" ")
+
+        if cost_matrix.shape[0] != (m + n) ** 2:
+            raise ValueError(f"{self.file_path}: expected {(m + n) ** 2} costs, found {cost_matrix.shape[0]}")
+
+        return m, n, depot_capacities, cost_matrix.reshape(m + n, m + n)
+
+    def __get_file_hash__(self):
+        file_hash = hashlib.sha256()
+        with open(self.file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def __read_cache__(self):
+        if not os.path.exists(self.cache_matrix_path) or not os.path.exists(self.cache_meta_path):
+            return None
+
+        try:
+            with open(self.cache_meta_path, "r") as file:
+                meta = json.load(file)
+
+            # An unchanged modification time is enough; otherwise the content of the file decides
+            file_stat = os.stat(self.file_path)
+            if meta["mtime_ns"] != file_stat.st_mtime_ns or meta["size"] != file_stat.st_size:
+                if meta["sha256"] != self.__get_file_hash__():
+                    return None
+
+                meta["mtime_ns"] = file_stat.st_mtime_ns
+                meta["size"] = file_stat.st_size
+                self.__write_file__(self.cache_meta_path, lambda path: self.__dump_meta__(path, meta))
+
+            cost_matrix = open_memory_map(self.cache_matrix_path) if self.memory_map else np.load(self.cache_matrix_path)
 
-                m = int(tokens[0])
-                n = int(tokens[1])
+        except (OSError, ValueError, KeyError):
+            return None
 
-                depot_capaities = []
-                for index in range(2, len(tokens)):
-                    depot_capaities += [int(tokens[index])]
+        return meta["m"], meta["n"], meta["depot_capacities"], cost_matrix
 
-                return m, n, depot_capaities
+    def __dump_meta__(self, path, meta):
+        with open(path, "w") as file:
+            json.dump(meta, file)
 
-            def process_matrix_line(matrix, line_str):
-                matrix_line = list(map(lambda t: int(t), line_str.split()))
-                return matrix + [matrix_line]
+    def __write_file__(self, path, write_procedure):
+        # Written under a temporary name first, so that concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            write_procedure(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
-            with open(self.file_path, "r") as file:
-                cost_matrix_list = []
+    def __write_cache__(self, m, n, depot_capacities, cost_matrix):
+        file_stat = os.stat(self.file_path)
 
-                line = file.readline()
-                m, n, depot_capacities = process_first_line(line)
+        meta = dict()
+        meta["m"] = m
+        meta["n"] = n
+        meta["depot_capacities"] = depot_capacities
+        meta["mtime_ns"] = file_stat.st_mtime_ns
+        meta["size"] = file_stat.st_size
+        meta["sha256"] = self.__get_file_hash__()
 
-                line = file.readline()
-                while line:
-                    cost_matrix_list = process_matrix_line(cost_matrix_list, line)
-                    line = file.readline()
+        try:
+            # The matrix is written before the metadata that validates it
+            self.__write_file__(self.cache_matrix_path, lambda path: self.__save_matrix__(path, cost_matrix))
+            self.__write_file__(self.cache_meta_path, lambda path: self.__dump_meta__(path, meta))
+        except OSError:
+            # The cache is only an optimization (e.g. the data directory could be read-only)
+            pass
 
-            return m, n, depot_capacities, np.array(cost_matrix_list)
+    def __save_matrix__(self, path, cost_matrix):
+        with open(path, "wb") as file:
+            np.save(file, cost_matrix)
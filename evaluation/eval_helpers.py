@@ -1,92 +1,90 @@
 import numpy as np
 
+from data_readers.cost_matrix_reader import CostMatrixReader
 
-def process_first_line(line_str):
-    tokens = line_str.split()
+from evaluation.solution_path import SolutionPath
 
-    m = int(tokens[0])
-    n = int(tokens[1])
 
-    depot_capaities = []
-    for index in range(2, len(tokens)):
-        depot_capaities += [int(tokens[index])]
+def read_cost_matrix(file_path, memory_map=False):
+    return CostMatrixReader(file_path, memory_map=memory_map).read()
 
-    return m, n, depot_capaities
 
-
-def process_matrix_line(matrix, line_str):
-    matrix_line = list(map(lambda t: int(t), line_str.split()))
-    return matrix + [matrix_line]
+def get_unfeasible_matrix(cost_matrix):
+    # 1.0 for the unfeasible arcs, 0.0 otherwise (flattened in row-major order, like the chromosomes)
+    return (cost_matrix.reshape(-1) == -1).astype(np.float64)
 
 
-def read_cost_matrix(file_path):
-    with open(file_path, "r") as file:
-        cost_matrix_list = []
+def get_successors(m, n, solution_array):
+    solution_matrix = np.asarray(solution_array).reshape(m + n, m + n) == 1.0
 
-        line = file.readline()
-        m, n, depot_capacities = process_first_line(line)
+    # The successor of a node is the first node on its row (-1 for the nodes without successor)
+    successors = np.where(solution_matrix.any(axis=1), np.argmax(solution_matrix, axis=1), -1)
 
-        line = file.readline()
-        while line:
-            cost_matrix_list = process_matrix_line(cost_matrix_list, line)
-            line = file.readline()
+    # The depots can have more successors (one for every vehicle), so all their arcs are kept
+    depot_arcs = np.argwhere(solution_matrix[:m])
 
-    return m, n, depot_capacities, np.array(cost_matrix_list)
+    return successors, depot_arcs
 
 
-def get_unfeasible_matrix(cost_matrix):
-    cost_matrix_flat = cost_matrix.flatten()
+def get_solution_paths(m, n, solution_array):
+    # Follows the successors from every arc leaving a depot, then looks for the circuits of trips left unvisited
+    # Every node is visited once (except for the trips shared by more paths, when a trip has more predecessors)
+    successors, depot_arcs = get_successors(m, n, solution_array)
+    successors = successors.tolist()
 
-    unfeasible_matrix_list = []
-    for index in range(cost_matrix_flat.shape[0]):
-        if cost_matrix_flat[index] == -1:
-            unfeasible_matrix_list += [1.0]
-        else:
-            unfeasible_matrix_list += [0.0]
+    paths = []
+    visited = [False] * (m + n)
+    walk_stamps = [-1] * (m + n)
 
-    unfeasible_matrix = np.array(unfeasible_matrix_list)
-    return unfeasible_matrix
+    for walk, (depot, first_node) in enumerate(depot_arcs.tolist()):
+        nodes = [depot, first_node]
 
+        kind = None
+        while kind is None:
+            current_node = nodes[-1]
 
-def follow_path_from_start(m, solution_matrix, starting_depot, first_trip):
-    current_path = [starting_depot, first_trip]
+            if current_node < m:
+                kind = SolutionPath.FEASIBLE if current_node == depot else SolutionPath.DEPOT_MISMATCH
+            elif walk_stamps[current_node] == walk:
+                kind = SolutionPath.CYCLE
+            else:
+                walk_stamps[current_node] = walk
+                visited[current_node] = True
 
-    while current_path[-1] != starting_depot:
+                if successors[current_node] == -1:
+                    kind = SolutionPath.OPEN
+                else:
+                    nodes.append(successors[current_node])
 
-        for next_index in range(solution_matrix.shape[0]):
-            if solution_matrix[current_path[-1], next_index] == 1.0:
-                current_path += [next_index]
-                break
+        paths.append(SolutionPath(nodes, kind))
 
-        # if it gets to another depot => stop
-        if current_path[-1] < m:
-            break
+    walk = len(depot_arcs)
+    for start_node in range(m, m + n):
+        if visited[start_node]:
+            continue
 
-    if current_path[-1] != starting_depot:
-        return current_path
-    else:
-        return []
+        walk += 1
+        nodes = []
+        current_node = start_node
+        while current_node >= m and not visited[current_node]:
+            visited[current_node] = True
+            walk_stamps[current_node] = walk
+            nodes.append(current_node)
 
+            current_node = successors[current_node]
 
-def get_unfeasible_paths_for_depot(m, n, solution_array, starting_depot):
-    solution_matrix = solution_array.reshape(m + n, m + n)
+        # Only a walk that gets back to one of its own trips found a circuit (the trips before it lead into it)
+        if current_node >= m and walk_stamps[current_node] == walk:
+            circuit_start = nodes.index(current_node)
+            paths.append(SolutionPath(nodes[circuit_start:] + [current_node], SolutionPath.SUBTOUR))
 
-    paths = []
-    for start_trip in range(m + n):
-        if solution_matrix[starting_depot, start_trip] == 1.0:
-            paths += [follow_path_from_start(m, solution_matrix, starting_depot, first_trip=start_trip)]
+    return paths
 
-    unfeasible_paths = []
-    for path in paths:
-        if len(path) > 0:
-            unfeasible_paths += [path]
 
-    return unfeasible_paths
+def get_unfeasible_solution_paths(m, n, solution_array):
+    return [path for path in get_solution_paths(m, n, solution_array) if not path.is_feasible()]
 
 
 def get_unfeasible_paths(m, n, solution_array):
-    unfeasible_paths = []
-    for depot in range(m):
-        unfeasible_paths += get_unfeasible_paths_for_depot(m, n, solution_array, starting_depot=depot)
-
-    return unfeasible_paths
+    # The nodes of the paths that do not return to their depot and of the detached circuits of trips
+    return [path.get_nodes() for path in get_unfeasible_solution_paths(m, n, solution_array)]
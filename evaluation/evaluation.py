@@ -1,12 +1,15 @@
+import numpy as np
+
 from evaluation.eval_helpers import read_cost_matrix, get_unfeasible_matrix, get_unfeasible_paths
 
 
 class Evaluation:
 
-    def __init__(self, cost_matrix_file_path):
+    def __init__(self, cost_matrix_file_path, memory_map=False):
 
-        self.m, self.n, self.depots_capacities, self.cost_matrix = read_cost_matrix(cost_matrix_file_path)
-        self.cost_matrix_flat = self.cost_matrix.flatten()
+        self.m, self.n, self.depots_capacities, self.cost_matrix = read_cost_matrix(cost_matrix_file_path, memory_map)
+        # A view (not a copy), so a memory-mapped matrix stays shared
+        self.cost_matrix_flat = self.cost_matrix.reshape(-1)
 
         self.violations_range = self.m + self.n
         self.violations_functions = [self.get_unfeasible_arcs_violations,
@@ -16,52 +19,96 @@ class Evaluation:
                                      self.get_depot_capacity_violations,
                                      self.get_depot_paths_violations]
         self.unfeasible_matrix = get_unfeasible_matrix(self.cost_matrix)
+        self.depots_capacities_array = np.array(self.depots_capacities)
+
+    def __get_in_out_sums__(self, population):
+        # Every chromosome is a flattened (m + n) x (m + n) solution matrix,
+        # so the entering / leaving arcs of a node are the column / row sums of its matrix
+        solution_matrices = np.asarray(population).reshape(-1, self.violations_range, self.violations_range)
+        return solution_matrices.sum(axis=1), solution_matrices.sum(axis=2)
+
+    def __count_unfeasible_arcs__(self, population):
+        population = np.asarray(population).reshape(-1, self.cost_matrix_flat.shape[0])
+
+        # Same type as the population (an integer population would otherwise be copied as floats)
+        unfeasible_matrix = self.unfeasible_matrix.astype(population.dtype, copy=False)
+        return population.dot(unfeasible_matrix).astype(np.float64)
+
+    def __count_single_entering__(self, in_sums):
+        return np.count_nonzero(in_sums[:, self.m:] != 1.0, axis=1)
+
+    def __count_single_leaving__(self, out_sums):
+        return np.count_nonzero(out_sums[:, self.m:] != 1.0, axis=1)
+
+    def __count_depot__(self, in_sums, out_sums):
+        return np.count_nonzero(out_sums[:, :self.m] != in_sums[:, :self.m], axis=1)
+
+    def __count_depot_capacity__(self, out_sums):
+        return np.count_nonzero(out_sums[:, :self.m] > self.depots_capacities_array, axis=1)
+
+    # Every single constraint getter computes the sums of its chromosome again: the chromosomes are changed in place
+    # (e.g. by the GA operators), so the sums are not cached. To count more constraints of the same chromosomes,
+    # evaluate_population computes the sums once
 
     def get_unfeasible_arcs_violations(self, chromosome):
         # Unfeasible arcs should not be chosen
         # Counts and returns the number of unfeasible arcs chosen
-        return self.unfeasible_matrix.dot(chromosome)
+        return self.__count_unfeasible_arcs__(chromosome)[0]
 
     def get_single_entering_violations(self, chromosome):
         # 'sum' == 1.0 (constraint)
         # Counts and returns the number of violations
-        violations = 0
-        for j in range(self.m, self.m + self.n):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j] for i in range(0, self.m + self.n)) != 1.0)
-
-        return violations
+        in_sums, _ = self.__get_in_out_sums__(chromosome)
+        return int(self.__count_single_entering__(in_sums)[0])
 
     def get_single_leaving_violations(self, chromosome):
         # 'sum' == 1.0 (constraint)
         # Counts and returns the number of violations
-
-        violations = 0
-        for i in range(self.m, self.m + self.n):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j] for j in range(0, self.m + self.n)) != 1.0)
-
-        return violations
+        _, out_sums = self.__get_in_out_sums__(chromosome)
+        return int(self.__count_single_leaving__(out_sums)[0])
 
     def get_depot_violations(self, chromosome):
         # depot entering == depot leaving
         # Counts and returns the number of violations
-        violations = 0
-        for depot_index in range(0, self.m):
-            violations += int(sum(chromosome[(self.m + self.n) * depot_index + j] for j in range(0, self.m + self.n)) !=
-                              sum(chromosome[(self.m + self.n) * i + depot_index] for i in range(0, self.m + self.n)))
-
-        return violations
+        in_sums, out_sums = self.__get_in_out_sums__(chromosome)
+        return int(self.__count_depot__(in_sums, out_sums)[0])
 
     def get_depot_capacity_violations(self, chromosome):
         # Depots capacities should be met ( sum <= depot_capacity)
         # Counts and returns the number of violations
-        violations = 0
-        for i in range(0, self.m):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j]
-                                  for j in range(0, self.m + self.n)) > self.depots_capacities[i])
-
-        return violations
+        _, out_sums = self.__get_in_out_sums__(chromosome)
+        return int(self.__count_depot_capacity__(out_sums)[0])
 
     def get_depot_paths_violations(self, chromosome):
         # Any path starting from a depot should end at the same depot
         # Counts and returns the number of violations (the number of unfeasible paths)
-        return len(get_unfeasible_paths(self.m, self.n, chromosome))
\ No newline at end of file
+        # The circuits of trips not reachable from a depot (subtours) are counted as well, so the evaluations
+        # of the chromosomes with subtours are higher than the ones logged before they were counted
+        return len(get_unfeasible_paths(self.m, self.n, chromosome))
+
+    def get_first_constraints_violations(self, chromosome):
+        # The sums of the chromosome are computed once for all the first constraints
+        return self.evaluate_population(chromosome)["first_constraints"][0]
+
+    def evaluate_population(self, population, with_depot_paths=False):
+        # Evaluates a whole (population size x chromosome size) population at once
+        # Returns the number of violations of every constraint, as arrays with a value for every chromosome
+        population = np.asarray(population).reshape(-1, self.cost_matrix_flat.shape[0])
+        in_sums, out_sums = self.__get_in_out_sums__(population)
+
+        violations = dict()
+        violations["unfeasible_arcs"] = self.__count_unfeasible_arcs__(population)
+        violations["single_entering"] = self.__count_single_entering__(in_sums)
+        violations["single_leaving"] = self.__count_single_leaving__(out_sums)
+        violations["depot"] = self.__count_depot__(in_sums, out_sums)
+        violations["depot_capacity"] = self.__count_depot_capacity__(out_sums)
+
+        violations["first_constraints"] = violations["unfeasible_arcs"] + violations["single_entering"] + \
+            violations["single_leaving"] + violations["depot"] + violations["depot_capacity"]
+
+        # The paths have to be followed chromosome by chromosome
+        if with_depot_paths:
+            violations["depot_paths"] = np.array([self.get_depot_paths_violations(chromosome)
+                                                  for chromosome in population])
+
+        return violations
@@ -0,0 +1,34 @@
+class SolutionPath:
+    # A path that returns to its starting depot
+    FEASIBLE = "feasible"
+    # A path that leaves a depot and returns to another depot
+    DEPOT_MISMATCH = "depot_mismatch"
+    # A path that leaves a depot and gets into a circuit of trips (the last node is the first repeated one)
+    CYCLE = "cycle"
+    # A path that leaves a depot and stops at a trip without successor
+    OPEN = "open"
+    # A circuit of trips not reachable from any depot (the last node is the first one)
+    SUBTOUR = "subtour"
+
+    def __init__(self, nodes, kind):
+        self.nodes = nodes
+        self.kind = kind
+
+    def get_nodes(self):
+        return self.nodes
+
+    def get_kind(self):
+        return self.kind
+
+    def is_feasible(self):
+        return self.kind == SolutionPath.FEASIBLE
+
+    def get_arcs(self):
+        # The arcs of the solution that form the path (in order)
+        return list(zip(self.nodes[:-1], self.nodes[1:]))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"SolutionPath({self.kind}, {self.nodes})"
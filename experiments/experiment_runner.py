@@ -0,0 +1,224 @@
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from tqdm import tqdm
+
+from data_readers.cost_matrix_reader import CostMatrixReader
+
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony.partitioning.partitioner import Partitioner
+from ant_colony.ant_colonies_solver import AntColoniesSolver
+from ant_colony_2.ant_colony_system2 import AntColonySystem2
+from ant_colony_3.ant_colony_system3 import AntColonySystem3
+
+# Instances already read by the current (worker) process
+loaded_instances = dict()
+
+
+def load_instance(file_path, memory_map=False):
+    if file_path not in loaded_instances:
+        # Memory-mapped instances are shared by all the worker processes (instead of being copied in each of them)
+        m, n, depot_capacities, cost_matrix = CostMatrixReader(file_path, memory_map=memory_map).read()
+
+        instance = dict()
+        instance["m"] = m
+        instance["n"] = n
+        instance["depot_capacities"] = depot_capacities
+        instance["cost_matrix"] = cost_matrix
+
+        loaded_instances[file_path] = instance
+
+    return loaded_instances[file_path]
+
+
+def run_ant_colonies_solver(instance, params):
+    # The partitioning only depends on the instance and on the strategy, so it is shared by all the runs of the process
+    strategy = params.get("partition_strategy") or "balanced_degree"
+    partitioners = instance.setdefault("partitioners", dict())
+    if strategy not in partitioners:
+        if "problem_graph" not in instance:
+            instance["problem_graph"] = ProblemGraph(instance["cost_matrix"], instance["m"], instance["n"],
+                                                     instance["depot_capacities"])
+        partitioner = Partitioner(instance["problem_graph"], strategy)
+        partitioner.execute()
+        partitioners[strategy] = partitioner
+
+    return AntColoniesSolver(partitioner=partitioners[strategy], **params).solve()
+
+
+def run_ant_colony_system_2(instance, params):
+    return AntColonySystem2(m=instance["m"], n=instance["n"], cost_matrix=instance["cost_matrix"],
+                            depot_capacities=instance["depot_capacities"], **params).execute()
+
+
+def run_ant_colony_system_3(instance, params):
+    return AntColonySystem3(m=instance["m"], n=instance["n"], cost_matrix=instance["cost_matrix"],
+                            depot_capacities=instance["depot_capacities"], **params).execute()
+
+
+ALGORITHMS = {
+    "ACS_1": run_ant_colonies_solver,
+    "ACS_2": run_ant_colony_system_2,
+    "ACS_3": run_ant_colony_system_3,
+}
+
+
+def is_run_complete(cost_save_path, number_of_iterations):
+    # A run is complete when its cost file has a line for every iteration
+    if not os.path.exists(cost_save_path):
+        return False
+
+    with open(cost_save_path, "r") as file:
+        return sum(1 for line in file if line.strip()) >= number_of_iterations
+
+
+def run_job(job):
+    # Every job has its own seed (the workers would otherwise share the state of the parent generator)
+    np.random.seed(job["seed"])
+    random.seed(job["seed"])
+
+    # The loggers append to the result files, so the leftovers of an interrupted run are removed
+    for path in [job["params"]["cost_save_path"], job["params"]["solution_save_path"]]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    start = time.time()
+    try:
+        instance = load_instance(job["file_path"], job["memory_map"])
+        solution, cost = ALGORITHMS[job["algorithm"]](instance, job["params"])
+
+        job["status"] = "done"
+        job["cost"] = float(cost)
+
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = f"{type(e).__name__}: {e}"
+
+    job["elapsed_time"] = time.time() - start
+
+    return job
+
+
+class ExperimentRunner:
+
+    def __init__(self, spec, number_of_workers=None):
+        # spec = {
+        #     "runs": number of runs for every (algorithm, parameter set, instance),
+        #     "instances": list of instance file paths,
+        #     "algorithms": list of {"name": one of ALGORITHMS,
+        #                            "results_dir": directory of the results,
+        #                            "suffix": suffix of the experiment directories (optional),
+        #                            "parameter_sets": {parameter set name: algorithm parameters}},
+        #     "seed": base seed of the runs (optional),
+        #     "memory_map": memory-map the instances, instead of reading them in every worker (optional),
+        #     "manifest_path": path of the manifest file (optional)
+        # }
+        self.spec = spec
+        self.number_of_workers = number_of_workers if number_of_workers is not None else os.cpu_count()
+
+        self.runs = spec["runs"]
+        self.manifest_path = spec.get("manifest_path", "./experiments_manifest.json")
+        self.seed_sequence = np.random.SeedSequence(spec.get("seed"))
+        self.memory_map = spec.get("memory_map", False)
+
+        self.jobs = []
+        self.__init_jobs__()
+
+    def __init_jobs__(self):
+        for algorithm in self.spec["algorithms"]:
+            parameter_sets = algorithm["parameter_sets"]
+
+            for params_name, params in parameter_sets.items():
+                for file_path in self.spec["instances"]:
+
+                    # The experiment directories are named after the instance files (e.g. m4n500s0.inp)
+                    experiment_name = os.path.basename(file_path) + algorithm.get("suffix", "")
+                    dir_name = f"{algorithm['results_dir']}/{experiment_name}"
+                    if len(parameter_sets) > 1:
+                        dir_name += f"_{params_name}"
+
+                    for run_index in range(self.runs):
+                        job = dict()
+                        job["algorithm"] = algorithm["name"]
+                        job["parameter_set"] = params_name
+                        job["file_path"] = file_path
+                        job["dir_name"] = dir_name
+                        job["run"] = run_index
+                        job["memory_map"] = self.memory_map
+                        job["params"] = {"cost_save_path": f"{dir_name}/cost_run_{run_index}.txt",
+                                         "solution_save_path": f"{dir_name}/solution_run_{run_index}.txt",
+                                         **params}
+
+                        self.jobs.append(job)
+
+        # The seeds only depend on the base seed and on the position of the job
+        for job, child in zip(self.jobs, self.seed_sequence.spawn(len(self.jobs))):
+            job["seed"] = int(child.generate_state(1)[0])
+
+    def get_jobs(self):
+        return self.jobs
+
+    def __write_parameters__(self, jobs):
+        written = set()
+        for job in jobs:
+            if job["dir_name"] not in written:
+                written.add(job["dir_name"])
+
+                if not os.path.exists(job["dir_name"]):
+                    os.makedirs(job["dir_name"])
+
+                params = {"algorithm": job["algorithm"], "instance": job["file_path"], **job["params"]}
+                del params["cost_save_path"]
+                del params["solution_save_path"]
+
+                with open(f"{job['dir_name']}/_parameters.json", "w") as file:
+                    file.write(json.dumps(params, default=lambda t: str(t), sort_keys=False, indent=4))
+
+    def __write_manifest__(self):
+        manifest = dict()
+        manifest["spec"] = self.spec
+        manifest["seed"] = self.seed_sequence.entropy
+        manifest["jobs"] = self.jobs
+
+        manifest_dir = os.path.dirname(self.manifest_path)
+        if manifest_dir and not os.path.exists(manifest_dir):
+            os.makedirs(manifest_dir)
+
+        with open(self.manifest_path, "w") as file:
+            file.write(json.dumps(manifest, default=lambda t: str(t), sort_keys=False, indent=4))
+
+    def execute(self):
+
+        # Resume: the runs that already have complete result files are skipped
+        pending_positions = []
+        for position, job in enumerate(self.jobs):
+            if is_run_complete(job["params"]["cost_save_path"], job["params"]["number_of_iterations"]):
+                job["status"] = "skipped"
+            else:
+                job["status"] = "pending"
+                pending_positions.append(position)
+
+        pending_jobs = [self.jobs[position] for position in pending_positions]
+
+        self.__write_parameters__(pending_jobs)
+        self.__write_manifest__()
+
+        if self.number_of_workers > 1:
+            # The workers of a ProcessPoolExecutor are not daemonic, so a job can start its own worker processes
+            # (colony_workers of ACS_1, batch_workers of ACS_2 / ACS_3)
+            with ProcessPoolExecutor(self.number_of_workers) as executor:
+                # Every worker keeps the instances it has read, so it reads each instance at most once
+                finished_jobs = tqdm(executor.map(run_job, pending_jobs), total=len(pending_jobs))
+                for position, finished_job in zip(pending_positions, finished_jobs):
+                    self.jobs[position] = finished_job
+                    self.__write_manifest__()
+        else:
+            for job in tqdm(pending_jobs):
+                run_job(job)
+                self.__write_manifest__()
+
+        return self.jobs
@@ -1,15 +1,43 @@
 import numpy as np
 
 
+class ChangedGenes:
+    # The genes changed by a crossover of bit chromosomes (for the evaluation cache)
+
+    def __init__(self):
+        self.rows = []
+        self.genes = []
+
+    def add_pair(self, population, first, second, cut1, cut2):
+        # Before the interchange: the genes that differ between the cuts change in both chromosomes
+        genes = np.flatnonzero(population[first, cut1:cut2] != population[second, cut1:cut2]) + cut1
+
+        self.rows += [np.full(genes.shape[0], first), np.full(genes.shape[0], second)]
+        self.genes += [genes, genes]
+
+    def get_changes(self):
+        if len(self.genes) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        return np.concatenate(self.rows), np.concatenate(self.genes)
+
+
 class Crossover:
 
-    def __init__(self, crossover_rate, crossover_type):
+    def __init__(self, crossover_rate, crossover_type, packed=False):
         self.crossover_rate = crossover_rate
         self.crossover_type = crossover_type
 
+        # With packed chromosomes (np.packbits), the cutting points are at byte boundaries
+        self.packed = packed
+
         self.crossover_procedure = self.single_cut_crossover
-        if crossover_type == "double_cut":
+        if packed:
+            self.crossover_procedure = self.packed_crossover
+        elif crossover_type == "double_cut":
             self.crossover_procedure = self.double_cut_crossover
+        elif crossover_type == "order":
+            self.crossover_procedure = self.order_crossover
 
     def single_cut_crossover(self, population):
         pop_size = population.shape[0]
@@ -20,16 +48,20 @@ class Crossover:
         # If there are an odd number of selected chromosomes, just ignore the last
         cross_count = len(indecies) - (len(indecies) % 2)
 
+        changes = ChangedGenes()
         for index in range(0, cross_count, 2):
             # get indecies of the two chromosomes in the population
             first, second = indecies[index], indecies[index + 1]
             # choose a cutting point at random (avoiding doing the same as mutation)
             cut = np.random.randint(2, chromosome_size - 2)
+            changes.add_pair(population, first, second, 0, cut)
 
             # apply crossover at the given cutting point (interchange first halves)
             tmp = population[first, :cut].copy()
             population[first, :cut], population[second, :cut] = population[second, :cut], tmp
 
+        return changes.get_changes()
+
     def double_cut_crossover(self, population):
         pop_size = population.shape[0]
         chromosome_size = population.shape[1]
@@ -39,6 +71,7 @@ class Crossover:
         # If there are an odd number of selected chromosomes, just ignore the last
         cross_count = len(indecies) - (len(indecies) % 2)
 
+        changes = ChangedGenes()
         for index in range(0, cross_count, 2):
             # get indecies of the two chromosomes in the population
             first, second = indecies[index], indecies[index + 1]
@@ -50,10 +83,84 @@ class Crossover:
                 cuts = [np.random.randint(2, chromosome_size - 2), np.random.randint(2, chromosome_size - 2)]
                 cut1, cut2 = min(cuts), max(cuts)
 
+            changes.add_pair(population, first, second, cut1, cut2)
+
             # apply crossover at the given cutting points (interchange middle part)
             tmp = population[first, cut1:cut2].copy()
             population[first, cut1:cut2], population[second, cut1:cut2] = population[second, cut1:cut2], tmp
 
-    def execute(self, population):
+        return changes.get_changes()
+
+    def packed_crossover(self, population):
+        # Byte-aligned single or double cut crossover, applied to all the selected pairs at once
+        pop_size = population.shape[0]
+        chromosome_bytes = population.shape[1]
+
+        # Select chromosomes for crossover (save their indecies)
+        indecies = np.nonzero(np.random.rand(pop_size) < self.crossover_rate)[0]
+        # If there are an odd number of selected chromosomes, just ignore the last
+        cross_count = len(indecies) - (len(indecies) % 2)
+        if cross_count == 0:
+            return ChangedGenes().get_changes()
+
+        firsts, seconds = indecies[0:cross_count:2], indecies[1:cross_count:2]
+        pairs_count = firsts.shape[0]
+
+        if self.crossover_type == "double_cut":
+            # avoid doing nothing (equal cuts)
+            cuts = np.sort(np.random.randint(1, chromosome_bytes, (pairs_count, 2)), axis=1)
+            cuts[:, 1] += cuts[:, 0] == cuts[:, 1]
+            cut1, cut2 = cuts[:, :1], cuts[:, 1:]
+        else:
+            cut1, cut2 = np.zeros((pairs_count, 1), dtype=np.int64), np.random.randint(1, chromosome_bytes,
+                                                                                        (pairs_count, 1))
+
+        # interchange the bytes between the cuts
+        byte_positions = np.arange(chromosome_bytes)
+        swapped = (byte_positions >= cut1) & (byte_positions < cut2)
 
-        self.crossover_procedure(population)
+        first_chromosomes, second_chromosomes = population[firsts], population[seconds]
+        population[firsts] = np.where(swapped, second_chromosomes, first_chromosomes)
+        population[seconds] = np.where(swapped, first_chromosomes, second_chromosomes)
+
+        # The bits that differ between the two chromosomes of a pair (in the swapped bytes) changed in both
+        different_bytes = np.where(swapped, first_chromosomes ^ second_chromosomes, 0).astype(np.uint8)
+        pairs, byte_positions = np.nonzero(different_bytes)
+        bits = np.unpackbits(different_bytes[pairs, byte_positions][:, np.newaxis], axis=1, bitorder="little")
+        byte_indecies, bit_positions = np.nonzero(bits)
+
+        pairs = pairs[byte_indecies]
+        genes = byte_positions[byte_indecies] * 8 + bit_positions
+        return np.concatenate((firsts[pairs], seconds[pairs])), np.concatenate((genes, genes))
+
+    def order_crossover(self, population):
+        # For the permutation chromosomes: each child keeps the middle part of one parent,
+        # and gets the other genes in the order of the other parent
+        pop_size = population.shape[0]
+        chromosome_size = population.shape[1]
+
+        # Select chromosomes for crossover (save their indecies)
+        indecies = np.nonzero(np.random.rand(pop_size) < self.crossover_rate)[0]
+        # If there are an odd number of selected chromosomes, just ignore the last
+        cross_count = len(indecies) - (len(indecies) % 2)
+
+        for index in range(0, cross_count, 2):
+            # get indecies of the two chromosomes in the population
+            first, second = indecies[index], indecies[index + 1]
+
+            cuts = [np.random.randint(0, chromosome_size), np.random.randint(0, chromosome_size)]
+            cut1, cut2 = min(cuts), max(cuts) + 1
+
+            first_parent, second_parent = population[first].copy(), population[second].copy()
+            population[first] = self.__order_child__(first_parent, second_parent, cut1, cut2)
+            population[second] = self.__order_child__(second_parent, first_parent, cut1, cut2)
+
+    def __order_child__(self, kept_parent, order_parent, cut1, cut2):
+        middle = kept_parent[cut1:cut2]
+        others = order_parent[~np.isin(order_parent, middle)]
+
+        return np.concatenate((others[:cut1], middle, others[cut1:]))
+
+    def execute(self, population):
+        # Returns the (rows, genes) of the changed genes (bit encodings only, None otherwise)
+        return self.crossover_procedure(population)
@@ -1,81 +1,9 @@
-from genetic_algorithm.eval_helpers import read_cost_matrix, get_unfeasible_matrix, get_unfeasible_paths
-import tqdm
+import numpy as np
 
+from evaluation.evaluation import Evaluation as BaseEvaluation
 
-class Evaluation:
 
-    def __init__(self, cost_matrix_file_path):
-
-        self.m, self.n, self.depots_capacities, self.cost_matrix = read_cost_matrix(cost_matrix_file_path)
-        self.cost_matrix_flat = self.cost_matrix.flatten()
-
-        self.violations_range = self.m + self.n
-        self.violations_functions = [self.get_unfeasible_arcs_violations,
-                                     self.get_single_entering_violations,
-                                     self.get_single_leaving_violations,
-                                     self.get_depot_violations,
-                                     self.get_depot_capacity_violations,
-                                     self.get_depot_paths_violations]
-        self.unfeasible_matrix = get_unfeasible_matrix(self.cost_matrix)
-
-    def get_unfeasible_arcs_violations(self, chromosome):
-        # Unfeasible arcs should not be chosen
-        # Counts and returns the number of unfeasible arcs chosen
-        return self.unfeasible_matrix.dot(chromosome)
-
-    def get_single_entering_violations(self, chromosome):
-        # 'sum' == 1.0 (constraint)
-        # Counts and returns the number of violations
-        violations = 0
-        for j in range(self.m, self.m + self.n):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j] for i in range(0, self.m + self.n)) != 1.0)
-
-        return violations
-
-    def get_single_leaving_violations(self, chromosome):
-        # 'sum' == 1.0 (constraint)
-        # Counts and returns the number of violations
-
-        violations = 0
-        for i in range(self.m, self.m + self.n):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j] for j in range(0, self.m + self.n)) != 1.0)
-
-        return violations
-
-    def get_depot_violations(self, chromosome):
-        # depot entering == depot leaving
-        # Counts and returns the number of violations
-        violations = 0
-        for depot_index in range(0, self.m):
-            violations += int(sum(chromosome[(self.m + self.n) * depot_index + j] for j in range(0, self.m + self.n)) !=
-                              sum(chromosome[(self.m + self.n) * i + depot_index] for i in range(0, self.m + self.n)))
-
-        return violations
-
-    def get_depot_capacity_violations(self, chromosome):
-        # Depots capacities should be met ( sum <= depot_capacity)
-        # Counts and returns the number of violations
-        violations = 0
-        for i in range(0, self.m):
-            violations += int(sum(chromosome[(self.m + self.n) * i + j]
-                                  for j in range(0, self.m + self.n)) > self.depots_capacities[i])
-
-        return violations
-
-    def get_depot_paths_violations(self, chromosome):
-        # Any path starting from a depot should end at the same depot
-        # Counts and returns the number of violations (the number of unfeasible paths)
-        return len(get_unfeasible_paths(self.m, self.n, chromosome))
-
-    def get_first_constraints_violations(self, chromosome):
-        violations = 0
-        violations += self.get_unfeasible_arcs_violations(chromosome)
-        violations += self.get_single_entering_violations(chromosome)
-        violations += self.get_single_leaving_violations(chromosome)
-        violations += self.get_depot_violations(chromosome)
-        violations += self.get_depot_capacity_violations(chromosome)
-
-        return violations
+class Evaluation(BaseEvaluation):
 
     # def get_all_constraints_violations(self, chromosome):
     #     violations = 0
@@ -109,10 +37,58 @@ class Evaluation:
 
         # return self.get_constraints_violations(chromosome)
 
-    def execute(self, population):
+    def unpack(self, population):
+        return population
+
+    def get_gene_values(self, population, rows, genes):
+        return population[rows, genes]
+
+    def get_sums(self, population):
+        # The entering / leaving arcs of every node and the number of unfeasible arcs, for every chromosome
+        # (all the first constraints are counted from these sums)
+        in_sums, out_sums = self.__get_in_out_sums__(population)
+        return in_sums.astype(np.float64), out_sums.astype(np.float64), self.__count_unfeasible_arcs__(population)
+
+    def get_evals(self, population, in_sums, out_sums, unfeasible_arcs):
+        first_violations = unfeasible_arcs + self.__count_single_entering__(in_sums) + \
+            self.__count_single_leaving__(out_sums) + self.__count_depot__(in_sums, out_sums) + \
+            self.__count_depot_capacity__(out_sums)
+
         evals = []
-        for chrom in population:
-            evals += [self.chromosome_eval(chrom)]
+        for index, chromosome_violations in enumerate(first_violations):
+            if chromosome_violations == 0:
+                chromosome = self.unpack(population[index:index + 1])[0]
+                evals += [self.get_depot_paths_violations(chromosome) / self.violations_range]
+            else:
+                evals += [self.violations_range + chromosome_violations]
 
         return evals
+
+    def execute(self, population):
+        # Same values as chromosome_eval, with the first constraints evaluated for the whole population at once
+        return self.get_evals(population, *self.get_sums(population))
         # return [self.chromosome_eval(chromosome) for chromosome in population]
+
+
+class PackedEvaluation(Evaluation):
+    # The rows of the population are packed bits (little bit order),
+    # they are only unpacked a few chromosomes at a time to be evaluated
+
+    def __init__(self, cost_matrix_file_path, memory_map=False, chunk_size=8):
+        super().__init__(cost_matrix_file_path, memory_map)
+        self.chunk_size = chunk_size
+        self.chromosome_size = self.cost_matrix_flat.shape[0]
+
+    def unpack(self, population):
+        return np.unpackbits(population, axis=1, count=self.chromosome_size, bitorder="little").astype(np.float64)
+
+    def get_gene_values(self, population, rows, genes):
+        return (population[rows, genes >> 3] >> (genes & 7).astype(np.uint8)) & 1
+
+    def get_sums(self, population):
+        chunks_sums = []
+        for chunk_start in range(0, population.shape[0], self.chunk_size):
+            chunk = self.unpack(population[chunk_start:chunk_start + self.chunk_size])
+            chunks_sums.append(super().get_sums(chunk))
+
+        return tuple(np.concatenate(sums) for sums in zip(*chunks_sums))
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class EvaluationCache:
+    # Keeps the sums of every chromosome (entering / leaving arcs of the nodes, unfeasible arcs)
+    # and its evaluation between the generations:
+    # the genes changed by the mutation and the crossover only update the sums of their row and column,
+    # and the chromosomes without changes keep their evaluation
+
+    def __init__(self, evaluation):
+        self.evaluation = evaluation
+        self.chromosome_size = evaluation.violations_range ** 2
+
+        # Above this number of changed genes, the sums of a chromosome are computed again
+        self.max_changes = self.chromosome_size // 16
+
+        self.in_sums = None
+        self.out_sums = None
+        self.unfeasible_arcs = None
+        self.evals = None
+
+        # The chromosomes whose evaluation has to be computed again (from their sums)
+        self.changed = None
+
+    def is_empty(self):
+        return self.evals is None
+
+    def apply_changes(self, population, changes):
+        # changes: the (rows, genes) of the bits that changed value (each at most once), after the change
+        if self.is_empty() or changes is None:
+            return
+
+        rows, genes = changes
+        # (the packed chromosomes can have unused bits at the end)
+        kept = genes < self.chromosome_size
+        rows, genes = rows[kept], genes[kept]
+
+        pop_size, nodes_count = self.out_sums.shape
+        changes_counts = np.bincount(rows, minlength=pop_size)
+        self.changed |= changes_counts > 0
+
+        # The chromosomes with too many changes (a crossover of two different chromosomes) are summed again
+        summed_rows = np.flatnonzero(changes_counts > self.max_changes)
+        if summed_rows.shape[0] > 0:
+            self.in_sums[summed_rows], self.out_sums[summed_rows], self.unfeasible_arcs[summed_rows] = \
+                self.evaluation.get_sums(population[summed_rows])
+
+            updated = changes_counts[rows] <= self.max_changes
+            rows, genes = rows[updated], genes[updated]
+
+        # +1 for the arcs added, -1 for the arcs removed
+        deltas = 2.0 * self.evaluation.get_gene_values(population, rows, genes) - 1.0
+
+        self.out_sums += np.bincount(rows * nodes_count + genes // nodes_count, weights=deltas,
+                                     minlength=pop_size * nodes_count).reshape(pop_size, nodes_count)
+        self.in_sums += np.bincount(rows * nodes_count + genes % nodes_count, weights=deltas,
+                                    minlength=pop_size * nodes_count).reshape(pop_size, nodes_count)
+        self.unfeasible_arcs += np.bincount(rows, weights=deltas * self.evaluation.unfeasible_matrix[genes],
+                                            minlength=pop_size)
+
+    def select(self, indecies):
+        # The selected chromosomes keep their sums and evaluations
+        if self.is_empty():
+            return
+
+        self.in_sums = self.in_sums[indecies]
+        self.out_sums = self.out_sums[indecies]
+        self.unfeasible_arcs = self.unfeasible_arcs[indecies]
+        self.evals = self.evals[indecies]
+        self.changed = self.changed[indecies]
+
+    def execute(self, population):
+        if self.is_empty() or self.evals.shape[0] != population.shape[0]:
+            self.in_sums, self.out_sums, self.unfeasible_arcs = self.evaluation.get_sums(population)
+            self.evals = np.array(self.evaluation.get_evals(population, self.in_sums, self.out_sums,
+                                                            self.unfeasible_arcs))
+        else:
+            changed = np.flatnonzero(self.changed)
+            if changed.shape[0] > 0:
+                self.evals[changed] = self.evaluation.get_evals(population[changed], self.in_sums[changed],
+                                                                self.out_sums[changed], self.unfeasible_arcs[changed])
+
+        self.changed = np.zeros(population.shape[0], dtype=bool)
+
+        return self.evals.tolist()
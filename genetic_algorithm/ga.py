@@ -3,10 +3,19 @@ import time
 import numpy as np
 
 from genetic_algorithm.crossover import Crossover
-from genetic_algorithm.evaluation import Evaluation
+from genetic_algorithm.evaluation import Evaluation, PackedEvaluation
+from genetic_algorithm.evaluation_cache import EvaluationCache
 from genetic_algorithm.mutation import Mutation
+from genetic_algorithm.permutation_decoder import PermutationDecoder
 from genetic_algorithm.selection import Selection
 
+# The crossover and mutation types supported by every encoding
+ENCODINGS = {
+    "bits": (["single_cut", "double_cut"], ["bit_flip"]),
+    "packed_bits": (["single_cut", "double_cut"], ["bit_flip"]),
+    "permutation": (["order"], ["swap", "insert"]),
+}
+
 
 class GeneticAlgorithm:
 
@@ -17,23 +26,65 @@ class GeneticAlgorithm:
                  crossover_type,
                  mutation_choosing_prob,
                  max_iterations,
-                 selection_pressure=1):
-
-        self.mutation = Mutation(mutation_rate, mutation_choosing_prob)
-        self.crossover = Crossover(crossover_rate, crossover_type)
-        self.selection = Selection()
+                 selection_pressure=1,
+                 encoding="bits",
+                 mutation_type="bit_flip",
+                 selection_type="roulette",
+                 tournament_size=2,
+                 elite_count=0,
+                 cached_evaluation=True):
+
+        # encoding = "bits" (the (m + n) ** 2 solution matrix) or "permutation" (the order of the trips,
+        # decoded into routes), which needs the "order" crossover and the "swap" or "insert" mutation
+        # "packed_bits" is the "bits" encoding stored with 8 genes per byte (np.packbits), with byte-aligned cuts
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding} (supported: {list(ENCODINGS)})")
+
+        crossover_types, mutation_types = ENCODINGS[encoding]
+        if crossover_type not in crossover_types or mutation_type not in mutation_types:
+            raise ValueError(f"The {encoding} encoding supports the crossovers {crossover_types} "
+                             f"and the mutations {mutation_types}")
+
+        self.encoding = encoding
+        self.selection = Selection(selection_type, tournament_size, elite_count)
 
         self.initial_pop_size = pop_size
         self.selection_pressure = selection_pressure
         self.max_iterations = max_iterations
 
         self.evals = []
-        self.evaluation = Evaluation(cost_matrix_file_path)
+        # The min eval of every generation
+        self.best_evals = []
+        if encoding == "permutation":
+            self.evaluation = PermutationDecoder(cost_matrix_file_path)
+        elif encoding == "packed_bits":
+            self.evaluation = PackedEvaluation(cost_matrix_file_path)
+        else:
+            self.evaluation = Evaluation(cost_matrix_file_path)
+
+        # With the bit encodings, the evaluations are updated from the genes changed in every generation
+        self.evaluation_cache = None
+        if cached_evaluation and encoding != "permutation":
+            self.evaluation_cache = EvaluationCache(self.evaluation)
 
         self.m = self.evaluation.m
         self.n = self.evaluation.n
-        self.chromosome_size = (self.m + self.n) ** 2
-        self.population = np.random.randint(0, 2, (pop_size, self.chromosome_size))
+
+        if encoding == "permutation":
+            # Random orders of the trips
+            self.chromosome_size = self.n
+            self.population = np.argsort(np.random.rand(pop_size, self.n), axis=1).astype(np.int32) + self.m
+        elif encoding == "packed_bits":
+            # Random bits, 8 per byte (the last byte of the rows may have unused bits)
+            self.chromosome_size = (self.m + self.n) ** 2
+            self.population = np.random.randint(0, 256, (pop_size, (self.chromosome_size + 7) // 8), dtype=np.uint8)
+        else:
+            self.chromosome_size = (self.m + self.n) ** 2
+            self.population = np.random.randint(0, 2, (pop_size, self.chromosome_size))
+
+        packed_size = self.chromosome_size if encoding == "packed_bits" else None
+        self.mutation = Mutation(mutation_rate, mutation_choosing_prob, mutation_type, packed_size)
+        self.crossover = Crossover(crossover_rate, crossover_type, packed=encoding == "packed_bits")
 
         self.fitness_values = []
 
@@ -54,6 +105,27 @@ class GeneticAlgorithm:
 
         return min_index
 
+    def get_best_chromosome(self):
+        return self.population[self.get_best_eval_chromosome_index()]
+
+    def get_best_solution(self):
+        # The best solution as a RouteSolution (permutation encoding only)
+        return self.evaluation.decode(self.get_best_chromosome())
+
+    def evaluation_execute(self):
+        if self.evaluation_cache is None:
+            return self.evaluation.execute(self.population)
+
+        return self.evaluation_cache.execute(self.population)
+
+    def apply_changes(self, changes, first_row):
+        # The changes are given for the rows of population[first_row:]
+        if self.evaluation_cache is None or changes is None:
+            return
+
+        rows, genes = changes
+        self.evaluation_cache.apply_changes(self.population, (rows + first_row, genes))
+
     def execute(self):
         print(self.m + self.n)
 
@@ -61,28 +133,36 @@ class GeneticAlgorithm:
             print(f"Iteration {iteration}")
             start = time.time()
 
+            # The elites (the first chromosomes after the selection) go through the generation unchanged
+            elite_count = self.selection.get_elite_count(self.population.shape[0])
+            offspring = self.population[elite_count:]
+
             # Mutation
-            self.mutation.execute(self.population)
+            self.apply_changes(self.mutation.execute(offspring), elite_count)
 
             # Crossover
-            self.crossover.execute(self.population)
+            self.apply_changes(self.crossover.execute(offspring), elite_count)
 
             # Evaluation
-            self.evals = self.evaluation.execute(self.population)
+            self.evals = self.evaluation_execute()
 
             # Fitness
             self.fitness_values = self.fitness_execute()
 
-            print("Min eval : ", min(self.evals))
+            self.best_evals.append(min(self.evals))
+            print("Min eval : ", self.best_evals[-1])
 
             # Selection
-            self.population = self.selection.execute(self.population, self.fitness_values)
+            selected_indecies = self.selection.select(self.fitness_values)
+            self.population = self.population[selected_indecies]
+            if self.evaluation_cache is not None:
+                self.evaluation_cache.select(selected_indecies)
 
             end = time.time()
             print(f"Elapsed time : {end - start} seconds")
 
         # Compute current evaluations and fitnesses
-        self.evals = self.evaluation.execute(self.population)
+        self.evals = self.evaluation_execute()
         self.fitness_values = self.fitness_execute()
 
         # best_eval_index = self.get_best_eval_chromosome_index()
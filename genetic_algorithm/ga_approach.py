@@ -14,4 +14,16 @@ if __name__ == '__main__':
                           max_iterations=1000,
                           selection_pressure=5.0)
 
+    # Compact encoding (the order of the trips, decoded into routes)
+    # ga = GeneticAlgorithm(file_path,
+    #                       pop_size=100,
+    #                       mutation_rate=0.01,
+    #                       crossover_rate=0.3,
+    #                       crossover_type="order",
+    #                       mutation_choosing_prob=1.0,
+    #                       max_iterations=1000,
+    #                       selection_pressure=5.0,
+    #                       encoding="permutation",
+    #                       mutation_type="swap")
+
     ga.execute()
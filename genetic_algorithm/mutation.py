@@ -3,19 +3,98 @@ import numpy as np
 
 class Mutation:
 
-    def __init__(self, mutation_prob, mutation_choosing_prob):
+    def __init__(self, mutation_prob, mutation_choosing_prob, mutation_type="bit_flip", packed_size=None):
         self.mutation_prob = mutation_prob
         self.mutation_choosing_prob = mutation_choosing_prob
+        self.mutation_type = mutation_type
 
-    def execute(self, population):
+        # The number of bits of the chromosomes packed with np.packbits (None: one gene per element)
+        self.packed_size = packed_size
+
+        self.mutation_procedure = self.bit_flip_mutation
+        if packed_size is not None:
+            self.mutation_procedure = self.packed_bit_flip_mutation
+        elif mutation_type == "swap":
+            self.mutation_procedure = self.swap_mutation
+        elif mutation_type == "insert":
+            self.mutation_procedure = self.insert_mutation
+
+    def bit_flip_mutation(self, population):
         pop_size, chromosome_size = population.shape
 
         # Select chromosomes for mutation (save their indecies)
         indecies = np.nonzero(np.random.rand(pop_size) < self.mutation_choosing_prob)[0]
 
+        rows, genes = [], []
         for index in indecies:
             # Create a mask with selected genes for mutation
             mutation_mask = np.array(np.random.rand(chromosome_size) < self.mutation_prob, dtype=np.byte)
 
             # Apply mutation
             population[index] = (population[index] + mutation_mask) % 2
+
+            genes.append(np.flatnonzero(mutation_mask))
+            rows.append(np.full(genes[-1].shape[0], index))
+
+        # The flipped genes (for the evaluation cache)
+        if len(genes) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        return np.concatenate(rows), np.concatenate(genes)
+
+    def packed_bit_flip_mutation(self, population):
+        # The rows of the population are packed bits (little bit order), so the selected genes are flipped with XOR
+        pop_size = population.shape[0]
+
+        # Select chromosomes for mutation (save their indecies)
+        indecies = np.nonzero(np.random.rand(pop_size) < self.mutation_choosing_prob)[0]
+        if len(indecies) == 0 or self.mutation_prob <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # The positions of the selected genes (in all the selected chromosomes, one after the other):
+        # the gaps between two selected genes follow a geometric distribution, so only the selected genes are drawn
+        total_size = len(indecies) * self.packed_size
+        expected_count = total_size * self.mutation_prob
+        positions = np.cumsum(np.random.geometric(self.mutation_prob,
+                                                  int(expected_count + 6 * np.sqrt(expected_count)) + 16)) - 1
+        while positions[-1] < total_size:
+            more_positions = np.cumsum(np.random.geometric(self.mutation_prob, positions.shape[0])) + positions[-1]
+            positions = np.concatenate((positions, more_positions))
+        positions = positions[positions < total_size]
+
+        rows = indecies[positions // self.packed_size]
+        genes = positions % self.packed_size
+
+        # Apply mutation (at the byte level, several genes of the same byte can be flipped at once)
+        np.bitwise_xor.at(population, (rows, genes >> 3), np.left_shift(1, genes & 7).astype(np.uint8))
+
+        return rows, genes
+
+    def swap_mutation(self, population):
+        # For the permutation chromosomes: every selected gene swaps its position with a random gene
+        pop_size, chromosome_size = population.shape
+
+        # Select chromosomes for mutation (save their indecies)
+        indecies = np.nonzero(np.random.rand(pop_size) < self.mutation_choosing_prob)[0]
+
+        for index in indecies:
+            for position in np.nonzero(np.random.rand(chromosome_size) < self.mutation_prob)[0]:
+                other_position = np.random.randint(0, chromosome_size)
+                population[index, [position, other_position]] = population[index, [other_position, position]]
+
+    def insert_mutation(self, population):
+        # For the permutation chromosomes: every selected gene is moved to a random position
+        pop_size, chromosome_size = population.shape
+
+        # Select chromosomes for mutation (save their indecies)
+        indecies = np.nonzero(np.random.rand(pop_size) < self.mutation_choosing_prob)[0]
+
+        for index in indecies:
+            for position in np.nonzero(np.random.rand(chromosome_size) < self.mutation_prob)[0]:
+                other_position = np.random.randint(0, chromosome_size)
+                gene = population[index, position]
+                population[index] = np.insert(np.delete(population[index], position), other_position, gene)
+
+    def execute(self, population):
+        # Returns the (rows, genes) of the flipped genes (bit encodings only, None otherwise)
+        return self.mutation_procedure(population)
@@ -0,0 +1,82 @@
+import numpy as np
+
+from ant_colony.route_solution import RouteSolution
+from evaluation.eval_helpers import read_cost_matrix
+
+
+class PermutationDecoder:
+    # A chromosome is a permutation of the trips (n genes instead of (m + n) ** 2)
+    # It is decoded by splitting it into routes (the runs of consecutive trips linked by feasible arcs),
+    # then every route is assigned to the depot with vehicles left that serves it at the lowest cost
+
+    def __init__(self, cost_matrix_file_path, memory_map=False):
+        self.m, self.n, self.depots_capacities, self.cost_matrix = read_cost_matrix(cost_matrix_file_path, memory_map)
+        self.depots_capacities_array = np.array(self.depots_capacities)
+
+        self.feasible = self.cost_matrix != -1
+
+        # The depot arcs costs (np.inf when unfeasible), for the cost of a vehicle from each depot
+        self.depot_out_costs = np.where(self.feasible[:self.m, :], self.cost_matrix[:self.m, :], np.inf)
+        self.depot_in_costs = np.where(self.feasible[:, :self.m], self.cost_matrix[:, :self.m], np.inf).T
+
+        # A violation (a vehicle over the capacity of its depot, or without feasible depot arcs)
+        # costs more than any vehicle
+        self.violation_penalty = 2.0 * float(self.cost_matrix.max())
+
+    def __split__(self, chromosome):
+        # The first and last positions of the routes
+        feasible_links = self.feasible[chromosome[:-1], chromosome[1:]]
+        route_starts = np.concatenate(([0], np.flatnonzero(~feasible_links) + 1))
+        route_ends = np.concatenate((route_starts[1:], [chromosome.shape[0]])) - 1
+
+        links_cost = float(self.cost_matrix[chromosome[:-1], chromosome[1:]][feasible_links].sum())
+
+        return route_starts, route_ends, links_cost
+
+    def __assign_depots__(self, first_trips, last_trips):
+        # The routes choose their depots in order (the cheapest one with vehicles left)
+        vehicle_costs = (self.depot_out_costs[:, first_trips] + self.depot_in_costs[:, last_trips]).T.tolist()
+        remaining_capacities = self.depots_capacities_array.tolist()
+
+        depots = []
+        depots_cost = 0.0
+        violations = 0
+        for route_costs in vehicle_costs:
+            available_costs = [cost if capacity > 0 else np.inf
+                               for cost, capacity in zip(route_costs, remaining_capacities)]
+            depot = min(range(self.m), key=available_costs.__getitem__)
+
+            if available_costs[depot] == np.inf:
+                # No depot with vehicles left (or no feasible depot arcs): the cheapest depot is used anyway
+                depot = min(range(self.m), key=route_costs.__getitem__)
+                violations += 1
+            else:
+                depots_cost += available_costs[depot]
+
+            remaining_capacities[depot] -= 1
+            depots.append(depot)
+
+        return depots, depots_cost, violations
+
+    def get_cost_and_violations(self, chromosome):
+        route_starts, route_ends, links_cost = self.__split__(chromosome)
+        _, depots_cost, violations = self.__assign_depots__(chromosome[route_starts], chromosome[route_ends])
+
+        return links_cost + depots_cost, violations
+
+    def decode(self, chromosome):
+        route_starts, route_ends, _ = self.__split__(chromosome)
+        depots, _, _ = self.__assign_depots__(chromosome[route_starts], chromosome[route_ends])
+
+        solution = RouteSolution(self.m, self.m + self.n)
+        for depot, start, end in zip(depots, route_starts.tolist(), route_ends.tolist()):
+            solution.add_route(depot, chromosome[start:end + 1].tolist())
+
+        return solution
+
+    def chromosome_eval(self, chromosome):
+        cost, violations = self.get_cost_and_violations(chromosome)
+        return cost + violations * self.violation_penalty
+
+    def execute(self, population):
+        return [self.chromosome_eval(chromosome) for chromosome in population]
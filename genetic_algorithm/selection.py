@@ -1,19 +1,70 @@
 import numpy as np
 
+SELECTION_TYPES = ["roulette", "tournament", "stochastic_universal"]
+
 
 class Selection:
 
-    def execute(self, population, fitness_values):
-        intervals = np.cumsum(fitness_values) / np.sum(fitness_values)
+    def __init__(self, selection_type="roulette", tournament_size=2, elite_count=0):
+        if selection_type not in SELECTION_TYPES:
+            raise ValueError(f"Unknown selection type: {selection_type} (supported: {SELECTION_TYPES})")
+
+        self.selection_type = selection_type
+        self.tournament_size = tournament_size
+
+        # The best chromosomes are copied to the next population without selection
+        self.elite_count = elite_count
+
+        self.selection_procedure = self.roulette_selection
+        if selection_type == "tournament":
+            self.selection_procedure = self.tournament_selection
+        elif selection_type == "stochastic_universal":
+            self.selection_procedure = self.stochastic_universal_selection
+
+    def __get_intervals__(self, fitness_values):
+        # The wheel: the upper bound of the interval of every chromosome
+        intervals = np.cumsum(fitness_values)
+        return intervals / intervals[-1]
+
+    def roulette_selection(self, fitness_values, count):
+        # The chromosome of a value is the first one whose interval ends after the value
+        intervals = self.__get_intervals__(fitness_values)
+        selected = np.searchsorted(intervals, np.random.rand(count), side="right")
+
+        # (rounding errors could leave the last interval end slightly below 1)
+        return np.minimum(selected, intervals.shape[0] - 1)
 
-        pop_size = population.shape[0]
-        selected = np.random.rand(pop_size)
-        selected_indecies = []
+    def stochastic_universal_selection(self, fitness_values, count):
+        # A single spin of a wheel with count equally spaced pointers
+        intervals = self.__get_intervals__(fitness_values)
+        pointers = (np.random.rand() + np.arange(count)) / count
+        selected = np.searchsorted(intervals, pointers, side="right")
 
-        for value in selected:
-            for index, interval in enumerate(intervals):
-                if value < interval:
-                    selected_indecies += [index]
-                    break
+        return np.minimum(selected, intervals.shape[0] - 1)
 
-        return population[selected_indecies]
+    def tournament_selection(self, fitness_values, count):
+        # The best of tournament_size random chromosomes (with replacement), for every selected chromosome
+        contestants = np.random.randint(0, fitness_values.shape[0], (count, self.tournament_size))
+        winners = np.argmax(fitness_values[contestants], axis=1)
+
+        return contestants[np.arange(count), winners]
+
+    def get_elite_count(self, pop_size):
+        return min(self.elite_count, pop_size)
+
+    def select(self, fitness_values):
+        # The indecies of the chromosomes of the next population (the elites first)
+        fitness_values = np.asarray(fitness_values, dtype=np.float64)
+
+        pop_size = fitness_values.shape[0]
+        elite_count = self.get_elite_count(pop_size)
+
+        selected_indecies = self.selection_procedure(fitness_values, pop_size - elite_count)
+        if elite_count > 0:
+            elite_indecies = np.argsort(-fitness_values, kind="stable")[:elite_count]
+            selected_indecies = np.concatenate((elite_indecies, selected_indecies))
+
+        return selected_indecies
+
+    def execute(self, population, fitness_values):
+        return population[self.select(fitness_values)]
@@ -0,0 +1,99 @@
+import numpy as np
+
+from ant_colony.feasible_arc_index import FeasibleArcIndex
+
+
+class ArcModel:
+
+    def __init__(self, m, n, depots_capacities, cost_matrix):
+        self.m = m
+        self.n = n
+        self.size = m + n
+        self.depots_capacities = np.array(depots_capacities, dtype=np.float64)
+
+        # There is a variable only for every feasible arc, numbered in the (source, destination) order of the index
+        self.arc_index = FeasibleArcIndex(cost_matrix)
+        self.sources = np.repeat(np.arange(self.size), self.arc_index.get_out_degrees())
+        self.destinations = self.arc_index.out_nodes.astype(np.int64)
+        self.costs = self.arc_index.out_costs.astype(np.float64)
+
+        # The (sorted) position of every arc in the flattened matrix, to find the variable of an arc
+        self.arc_keys = self.sources * self.size + self.destinations
+
+        # The variables of the in arcs of every node (in the order of the in arcs of the index)
+        in_sources = self.arc_index.in_nodes.astype(np.int64)
+        in_destinations = np.repeat(np.arange(self.size), self.arc_index.get_in_degrees())
+        self.in_arc_ids = np.searchsorted(self.arc_keys, in_sources * self.size + in_destinations)
+
+    def get_m(self):
+        return self.m
+
+    def get_n(self):
+        return self.n
+
+    def get_arcs_count(self):
+        return self.costs.shape[0]
+
+    def get_costs(self):
+        return self.costs
+
+    def get_sources(self):
+        return self.sources
+
+    def get_destinations(self):
+        return self.destinations
+
+    def get_out_arc_ids(self, node):
+        return np.arange(self.arc_index.out_offsets[node], self.arc_index.out_offsets[node + 1])
+
+    def get_in_arc_ids(self, node):
+        return self.in_arc_ids[self.arc_index.in_offsets[node]:self.arc_index.in_offsets[node + 1]]
+
+    def get_arc_ids(self, sources, destinations):
+        # The variables of the given (feasible) arcs
+        keys = np.asarray(sources, dtype=np.int64) * self.size + np.asarray(destinations, dtype=np.int64)
+        arc_ids = np.searchsorted(self.arc_keys, keys)
+
+        if np.any(arc_ids >= self.arc_keys.shape[0]) or np.any(self.arc_keys[arc_ids] != keys):
+            raise ValueError("Unfeasible arcs have no variables")
+
+        return arc_ids
+
+    def get_path_arc_ids(self, nodes):
+        return self.get_arc_ids(nodes[:-1], nodes[1:])
+
+    def get_constraint_rows(self):
+        # (name, arc ids, coefficients, sense, right hand side) of every constraint of the formulation
+        # ("E" for ==, "L" for <=)
+        rows = []
+
+        # Trips single-entering and single-leaving constraints
+        for trip in range(self.m, self.size):
+            in_arc_ids = self.get_in_arc_ids(trip)
+            rows.append(("trip_in_" + str(trip), in_arc_ids, np.ones(len(in_arc_ids)), "E", 1.0))
+
+        for trip in range(self.m, self.size):
+            out_arc_ids = self.get_out_arc_ids(trip)
+            rows.append(("trip_out_" + str(trip), out_arc_ids, np.ones(len(out_arc_ids)), "E", 1.0))
+
+        # Leaving depot == Entering depot constraints and depots capacity constraints
+        for depot in range(self.m):
+            out_arc_ids = self.get_out_arc_ids(depot)
+            in_arc_ids = self.get_in_arc_ids(depot)
+
+            rows.append(("depot_" + str(depot), np.concatenate((out_arc_ids, in_arc_ids)),
+                         np.concatenate((np.ones(len(out_arc_ids)), -np.ones(len(in_arc_ids)))), "E", 0.0))
+            rows.append(("depot_capacity_" + str(depot), out_arc_ids, np.ones(len(out_arc_ids)), "L",
+                         float(self.depots_capacities[depot])))
+
+        return rows
+
+    def to_solution_array(self, values):
+        # Flattened (m + n) x (m + n) solution matrix from the values of the variables
+        solution_array = np.zeros(self.size * self.size)
+        solution_array[self.arc_keys] = np.round(values)
+        return solution_array
+
+    def from_solution_array(self, solution_array):
+        # Values of the variables from a flattened (m + n) x (m + n) solution matrix
+        return np.asarray(solution_array).reshape(-1)[self.arc_keys]
@@ -1,153 +1,89 @@
 import time
 
-import cplex
-
-import gurobipy as gp
-from gurobipy import GRB
 import numpy as np
 
-env = gp.Env(empty=True)
-env.setParam("LogToConsole", 0)
-env.start()
-
-
-def process_first_line(line_str):
-    tokens = line_str.split()
-
-    m = int(tokens[0])
-    n = int(tokens[1])
-
-    depot_capaities = []
-    for index in range(2, len(tokens)):
-        depot_capaities += [int(tokens[index])]
-
-    return m, n, depot_capaities
-
-
-def process_matrix_line(matrix, line_str):
-    matrix_line = list(map(lambda t: int(t), line_str.split()))
-    return matrix + [matrix_line]
-
-
-def read_cost_matrix(file_path):
-    with open(file_path, "r") as file:
-        cost_matrix_list = []
-
-        line = file.readline()
-        m, n, depot_capacities = process_first_line(line)
-
-        line = file.readline()
-        while line:
-            cost_matrix_list = process_matrix_line(cost_matrix_list, line)
-            line = file.readline()
-
-    return m, n, depot_capacities, np.array(cost_matrix_list)
-
-
-def get_unfeasible_matrix(cost_matrix):
-    cost_matrix_flat = cost_matrix.flatten()
-
-    unfeasible_matrix_list = []
-    for index in range(cost_matrix_flat.shape[0]):
-        if cost_matrix_flat[index] == -1:
-            unfeasible_matrix_list += [1.0]
-        else:
-            unfeasible_matrix_list += [0.0]
-
-    unfeasible_matrix = np.array(unfeasible_matrix_list)
-    return unfeasible_matrix
-
+from evaluation.eval_helpers import read_cost_matrix, get_unfeasible_solution_paths
+from evaluation.solution_path import SolutionPath
+from ant_colony.route_solution import RouteSolution
+from ilp_approach.arc_model import ArcModel
+from ilp_approach.mip_backends import get_backend
 
-def solve(m, n, depots_capacities, cost_matrix, unfeasible_matrix, unfeasible_paths):
-    # Create the model
-    model = gp.Model("MD-VSP single commodity", env=env)
 
-    # Create the variables (corresponding to the arcs in the problem)
-    x = model.addMVar(shape=(m + n) * (m + n), vtype=GRB.BINARY, name="x")
+def get_path_cuts(m, n, solution_array):
+    # The unfeasible paths of a solution that no feasible solution contains entirely
+    # (a path stopped at a trip without successor can still be completed into a feasible one)
+    return [path for path in get_unfeasible_solution_paths(m, n, np.round(solution_array))
+            if path.get_kind() != SolutionPath.OPEN]
 
-    # Set the objective function ( sum(sum(c_ij * x_ij)) )
-    model.setObjective(cost_matrix.flatten() @ x, GRB.MINIMIZE)
 
+def build_model(m, n, depots_capacities, cost_matrix, backend="auto"):
+    # Only the feasible arcs have variables, so the model grows with the feasible arcs (not with (m + n) ^ 2)
+    arc_model = ArcModel(m, n, depots_capacities, cost_matrix)
 
-    # All unfeasible arcs should be zero
-    # (this is necessary because the cost matrix contains -1's for the unfeasible arcs
-    # which would not constrain the use of unfeasible solutions in gurobi)
-    model.addConstr(unfeasible_matrix @ x == 0.0, name="unfeasible")
+    mip_backend = get_backend(backend)
+    mip_backend.build(arc_model)
 
-    # Trips single-entering constraints ( constraint (m4n1000) for trips )
-    for j in range(m, m + n):
-        model.addConstr(sum(x[(m + n) * i + j] for i in range(0, m + n)) == 1.0,
-                        name="trip_in_" + str(j))
+    return mip_backend
 
-    # Trips single-leaving constraints ( constraint (m4n1500) for trips )
-    for i in range(m, m + n):
-        model.addConstr(sum(x[(m + n) * i + j] for j in range(0, m + n)) == 1.0,
-                        name="trip_out_" + str(i))
 
-    # Leaving depot == Entering depot constraints
-    for depot_index in range(0, m):
-        model.addConstr(sum(x[(m + n) * depot_index + j] for j in range(0, m + n)) ==
-                        sum(x[(m + n) * i + depot_index] for i in range(0, m + n)),
-                        name="depot_" + str(depot_index))
-
-    # Depots capacity constraints
-    for i in range(0, m):
-        model.addConstr(sum(x[(m + n) * i + j] for j in range(0, m + n)) <= depots_capacities[i],
-                        name="depot_capacity_" + str(i))
+def solve(m, n, depots_capacities, cost_matrix, unfeasible_paths, backend="auto", time_limit=None):
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend)
 
     # Add the path constraints
-    if len(unfeasible_paths) > 0:
-        for path in unfeasible_paths:
-            model.addConstr(sum(x[(m + n) * path[i] + path[i + 1]] for i in range(len(path) - 1)) <= (len(path) - 1))
+    for path in unfeasible_paths:
+        mip_backend.add_cut(mip_backend.get_arc_model().get_path_arc_ids(path))
 
     # Optimize model
-    model.optimize()
-
-    return model, x
-
-
-def follow_path_from_start(m, solution_matrix, starting_depot, first_trip):
-    current_path = [starting_depot, first_trip]
-
-    while current_path[-1] != starting_depot:
+    mip_backend.solve(time_limit=time_limit)
 
-        for next_index in range(solution_matrix.shape[0]):
-            if solution_matrix[current_path[-1], next_index] == 1.0:
-                current_path += [next_index]
-                break
+    return mip_backend
 
-        # if it gets to another depot => stop
-        if current_path[-1] < m:
-            break
 
-    if current_path[-1] != starting_depot:
-        return current_path
-    else:
-        return []
+def get_start_values(arc_model, cost_matrix, start_solution):
+    # Values of the variables (and cost) of a feasible solution, e.g. the best solution of an ant colony system
+    # (a RouteSolution or its (m + n) x (m + n) 0/1 matrix)
+    if isinstance(start_solution, RouteSolution):
+        start_solution = start_solution.to_matrix()
 
+    solution_array = np.asarray(start_solution, dtype=np.float64).reshape(-1)
+    values = arc_model.from_solution_array(solution_array)
+    if values.sum() != solution_array.sum():
+        raise ValueError("The start solution uses unfeasible arcs")
 
-def get_unfeasible_paths_for_depot(m, n, solution_array, starting_depot):
+    # Its cost is only an upper bound of the optimum if it is feasible
+    m, n = arc_model.get_m(), arc_model.get_n()
     solution_matrix = solution_array.reshape(m + n, m + n)
+    if np.any(solution_matrix[m:].sum(axis=1) != 1.0) or np.any(solution_matrix[:, m:].sum(axis=0) != 1.0) or \
+            np.any(solution_matrix[:m].sum(axis=1) > arc_model.depots_capacities) or \
+            len(get_path_cuts(m, n, solution_array)) > 0:
+        raise ValueError("The start solution is not feasible")
+
+    return values, float(solution_array.dot(cost_matrix.reshape(-1)))
 
-    paths = []
-    for start_trip in range(m + n):
-        if solution_matrix[starting_depot, start_trip] == 1.0:
-            paths += [follow_path_from_start(m, solution_matrix, starting_depot, first_trip=start_trip)]
 
-    unfeasible_paths = []
-    for path in paths:
-        if len(path) > 0:
-            unfeasible_paths += [path]
+def solve_lazy(m, n, depots_capacities, cost_matrix, backend="auto", time_limit=None, start_solution=None):
+    # A single model, where the path constraints are added only when the solver finds an integer solution
+    # that violates them. With Gurobi and CPLEX they are lazy constraints of a single branch and bound;
+    # PuLP has no callbacks, so its backend runs an iterative cut loop instead (the whole MIP is solved again
+    # after every round of cuts), which is much slower on the large instances (see has_lazy_constraints)
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend)
+    arc_model = mip_backend.get_arc_model()
 
-    return unfeasible_paths
+    # With a start solution, the search starts from its cost (instead of from no incumbent),
+    # so the branch and bound can prune the nodes that cannot improve on it from the first node
+    if start_solution is not None:
+        start_values, start_cost = get_start_values(arc_model, cost_matrix, start_solution)
+        mip_backend.set_start(start_values)
+        # Slightly above the start cost, so that the start itself is not cut off (the costs are integers)
+        mip_backend.set_cutoff(start_cost + 0.5)
 
+    def separate_paths(values):
+        solution_array = arc_model.to_solution_array(values)
+        return [arc_model.get_path_arc_ids(path.get_nodes()) for path in get_path_cuts(m, n, solution_array)]
 
-def get_unfeasible_paths(m, n, solution_array):
-    unfeasible_paths = []
-    for depot in range(m):
-        unfeasible_paths += get_unfeasible_paths_for_depot(m, n, solution_array, starting_depot=depot)
+    mip_backend.solve(separate_paths, time_limit)
 
-    return unfeasible_paths
+    return mip_backend
 
 
 def read_obj_file_paths(file_path):
@@ -166,49 +102,48 @@ def read_obj_file_paths(file_path):
 if __name__ == '__main__':
     file_path = "../data/m4n500/m4n500s0.inp"
     m, n, depots_capacities, cost_matrix = read_cost_matrix(file_path)
-    unfeasible_matrix = get_unfeasible_matrix(cost_matrix)
 
     print(cost_matrix)
     print(m, " ", n, " ", depots_capacities)
 
-    unfeasible_paths = []
-    iteration_count = 0
-    # unfeasible_paths, iteration_count = read_obj_file_paths("objective_0.out")
-
-    try:
-
-        model, x = solve(m, n, depots_capacities, cost_matrix, unfeasible_matrix, unfeasible_paths)
-        # unfeasible_paths += get_unfeasible_paths(m, n, x.X)
-
-        print(model.cbGetSolution())
-
-        # unfeasible_paths_count = len(unfeasible_paths) - 1
-        #
-        # while unfeasible_paths_count < len(unfeasible_paths):
-        #     start = time.time()
-        #
-        #     unfeasible_paths_count = len(unfeasible_paths)
-        #
-        #     model, x = solve(m, n, depots_capacities, cost_matrix, unfeasible_matrix, unfeasible_paths)
-        #     unfeasible_paths += get_unfeasible_paths(m, n, x.X)
-        #
-        #     end = time.time()
-        #     print(" ELAPES TIME : ", (end - start))
-        #
-        #     print("Current Obj (iteration ", iteration_count, ") : ", model.objVal)
-        #
-        #     # np.save("results.npy", x.X)
-        #     # with open("objective_1.out", "w") as file:
-        #     #     file.write(str(model.objVal) + "\n")
-        #     #     file.write("Iteration: " + str(iteration_count) + "\n")
-        #     #     file.write(str(unfeasible_paths))
-        #
-        #     iteration_count += 1
-        #
-        # print("Final solution:\n", x.X)
-        # print("Final Obj (iteration ", iteration_count, ") : ", model.objVal)
-
-    except gp.GurobiError as e:
-        print('Error code ' + str(e.errno) + ": " + str(e))
-    except AttributeError:
-        print('Encountered an attribute error')
+    # "gurobi", "cplex", "pulp" (open-source solvers) or "auto" (the first one installed)
+    backend = "auto"
+    # Path constraints added to a single model (lazy constraints with Gurobi and CPLEX, a cut loop with PuLP)
+    # instead of building the model again for every set of paths
+    lazy = True
+
+    start = time.time()
+
+    if lazy:
+        mip_backend = solve_lazy(m, n, depots_capacities, cost_matrix, backend)
+        print("Final Obj : ", mip_backend.get_objective_value(), " (", mip_backend.get_cuts_count(), " path cuts, ",
+              "lazy constraints" if mip_backend.has_lazy_constraints() else
+              f"cut loop of {mip_backend.get_solves_count()} solves", ")")
+
+    else:
+        unfeasible_paths = []
+        iteration_count = 0
+        # unfeasible_paths, iteration_count = read_obj_file_paths("objective_0.out")
+
+        unfeasible_paths_count = -1
+
+        while unfeasible_paths_count < len(unfeasible_paths):
+            unfeasible_paths_count = len(unfeasible_paths)
+
+            mip_backend = solve(m, n, depots_capacities, cost_matrix, unfeasible_paths, backend)
+            solution_array = mip_backend.get_arc_model().to_solution_array(mip_backend.get_values())
+            unfeasible_paths += [path.get_nodes() for path in get_path_cuts(m, n, solution_array)]
+
+            print("Current Obj (iteration ", iteration_count, ") : ", mip_backend.get_objective_value())
+
+            # np.save("results.npy", solution_array)
+            # with open("objective_1.out", "w") as file:
+            #     file.write(str(mip_backend.get_objective_value()) + "\n")
+            #     file.write("Iteration: " + str(iteration_count) + "\n")
+            #     file.write(str(unfeasible_paths))
+
+            iteration_count += 1
+
+        print("Final Obj (iteration ", iteration_count, ") : ", mip_backend.get_objective_value())
+
+    print(" ELAPSED TIME : ", (time.time() - start))
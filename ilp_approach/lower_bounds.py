@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+
+from evaluation.eval_helpers import read_cost_matrix
+from ilp_approach.arc_model import ArcModel
+from ilp_approach.mip_backends import get_backend
+
+
+def compute_lp_relaxation_bound(m, n, depots_capacities, cost_matrix, backend="auto", time_limit=None):
+    # Optimum of the arc formulation with the variables relaxed to [0, 1] (without the path constraints)
+    mip_backend = get_backend(backend)
+    mip_backend.build(ArcModel(m, n, depots_capacities, cost_matrix), relaxed=True)
+    mip_backend.solve(time_limit=time_limit)
+
+    # Only the optimum is a lower bound (a solution found before the time limit is an upper value of the LP)
+    if not mip_backend.is_optimal():
+        raise RuntimeError("The LP relaxation was not solved to optimality")
+
+    return float(mip_backend.get_objective_value())
+
+
+def compute_degree_bound(m, n, depots_capacities, cost_matrix):
+    # Every trip has exactly one in arc and one out arc (and all the costs are non-negative), so the cheapest
+    # in arcs of the trips (or the cheapest out arcs) cost at most as much as any solution
+    # (weaker than the LP relaxation, but it does not need any solver)
+    trip_costs = np.where(cost_matrix == -1, np.inf, cost_matrix.astype(np.float64))
+
+    in_bound = np.min(trip_costs[:, m:], axis=0).sum()
+    out_bound = np.min(trip_costs[m:, :], axis=1).sum()
+
+    return float(max(in_bound, out_bound))
+
+
+BOUND_METHODS = {
+    "lp": compute_lp_relaxation_bound,
+    "degree": compute_degree_bound,
+}
+
+
+def get_lower_bound(file_path, method="lp", use_cache=True, **options):
+    # The bounds are saved next to the instance file, and computed again only when the instance file changes
+    if method not in BOUND_METHODS:
+        raise ValueError(f"Unknown bound method: {method} (supported: {list(BOUND_METHODS)})")
+
+    cache_path = f"{file_path}.bounds.json"
+    file_stat = os.stat(file_path)
+
+    cache = None
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            cache = None
+
+    if cache is None or cache.get("mtime_ns") != file_stat.st_mtime_ns or cache.get("size") != file_stat.st_size:
+        cache = {"mtime_ns": file_stat.st_mtime_ns, "size": file_stat.st_size, "bounds": dict()}
+
+    if method not in cache["bounds"]:
+        m, n, depots_capacities, cost_matrix = read_cost_matrix(file_path)
+        cache["bounds"][method] = BOUND_METHODS[method](m, n, depots_capacities, cost_matrix, **options)
+
+        if use_cache:
+            try:
+                # Written under a temporary name first, so that concurrent readers never see a partial file
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as file:
+                    json.dump(cache, file)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # The cache is only an optimization (e.g. the data directory could be read-only)
+                pass
+
+    return cache["bounds"][method]
+
+
+def get_gap(cost, lower_bound):
+    # Optimality gap (percent) of a cost, relative to a lower bound of the optimum
+    return (cost - lower_bound) / lower_bound * 100.0
@@ -0,0 +1,437 @@
+import importlib.util
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Shared by all the Gurobi models of the process (started on first use)
+gurobi_env = None
+
+
+class MIPBackend(ABC):
+    # The solver packages are only imported when a backend is created,
+    # so the exact approach can be imported (and run with any available solver) on machines without licenses
+
+    def __init__(self):
+        self.arc_model = None
+        self.cuts_count = 0
+        self.solves_count = 0
+
+    @abstractmethod
+    def build(self, arc_model, relaxed=False):
+        # Binary variable for every feasible arc of the arc model, with its constraints and cost objective
+        # (relaxed: continuous variables in [0, 1], for the LP relaxation)
+        pass
+
+    @abstractmethod
+    def add_cut(self, arc_ids):
+        # At most (arcs count - 1) of the given arcs can be chosen
+        pass
+
+    @abstractmethod
+    def set_start(self, values):
+        # Initial incumbent (values of the variables of a feasible solution)
+        pass
+
+    @abstractmethod
+    def set_cutoff(self, cutoff):
+        # The nodes whose bound is not better than the cutoff are pruned
+        pass
+
+    @abstractmethod
+    def solve(self, separate=None, time_limit=None):
+        # separate(values) returns the arc ids of the cuts violated by an integer solution
+        # (added as lazy constraints, or by an iterative cut loop for the solvers without callbacks)
+        pass
+
+    def has_lazy_constraints(self):
+        # The cuts are separated inside a single branch and bound (from a solver callback)
+        return True
+
+    @abstractmethod
+    def has_solution(self):
+        # An incumbent was found (it is not optimal when the solve stopped early, e.g. at the time limit)
+        pass
+
+    @abstractmethod
+    def is_optimal(self):
+        # The incumbent is proven optimal
+        pass
+
+    @abstractmethod
+    def get_values(self):
+        # The values of the variables of the incumbent
+        pass
+
+    @abstractmethod
+    def get_objective_value(self):
+        pass
+
+    @abstractmethod
+    def get_best_bound(self):
+        # The lower bound of the optimum proven by the solve (None without one)
+        pass
+
+    def get_arc_model(self):
+        return self.arc_model
+
+    def get_cuts_count(self):
+        return self.cuts_count
+
+    def get_solves_count(self):
+        return self.solves_count
+
+
+class GurobiBackend(MIPBackend):
+
+    def __init__(self):
+        super().__init__()
+        import gurobipy
+        self.gp = gurobipy
+
+        self.model = None
+        self.x = None
+
+    def __get_env__(self):
+        global gurobi_env
+        if gurobi_env is None:
+            gurobi_env = self.gp.Env(empty=True)
+            gurobi_env.setParam("LogToConsole", 0)
+            gurobi_env.start()
+
+        return gurobi_env
+
+    def build(self, arc_model, relaxed=False):
+        GRB = self.gp.GRB
+        self.arc_model = arc_model
+
+        # Create the model
+        self.model = self.gp.Model("MD-VSP single commodity", env=self.__get_env__())
+
+        # Create the variables (corresponding to the feasible arcs in the problem)
+        self.x = list(self.model.addVars(arc_model.get_arcs_count(), lb=0.0, ub=1.0,
+                                         vtype=GRB.CONTINUOUS if relaxed else GRB.BINARY, name="x").values())
+
+        # Set the objective function ( sum(sum(c_ij * x_ij)) )
+        self.model.setObjective(self.gp.LinExpr(arc_model.get_costs().tolist(), self.x), GRB.MINIMIZE)
+
+        # Trips single-entering / single-leaving, depot leaving == entering and depots capacity constraints
+        for name, arc_ids, coefficients, sense, rhs in arc_model.get_constraint_rows():
+            expression = self.gp.LinExpr(coefficients.tolist(), [self.x[arc_id] for arc_id in arc_ids.tolist()])
+            self.model.addLConstr(expression, GRB.EQUAL if sense == "E" else GRB.LESS_EQUAL, rhs, name=name)
+
+    def __get_cut__(self, arc_ids):
+        return self.gp.quicksum(self.x[arc_id] for arc_id in arc_ids.tolist()) <= len(arc_ids) - 1
+
+    def add_cut(self, arc_ids):
+        self.model.addConstr(self.__get_cut__(arc_ids))
+        self.cuts_count += 1
+
+    def set_start(self, values):
+        for variable, value in zip(self.x, np.asarray(values).tolist()):
+            variable.Start = value
+
+    def set_cutoff(self, cutoff):
+        self.model.Params.Cutoff = cutoff
+
+    def solve(self, separate=None, time_limit=None):
+        if time_limit is not None:
+            self.model.Params.TimeLimit = time_limit
+
+        self.solves_count += 1
+        if separate is None:
+            self.model.optimize()
+            return
+
+        self.model.Params.LazyConstraints = 1
+
+        def separate_cuts(callback_model, where):
+            if where == self.gp.GRB.Callback.MIPSOL:
+                for arc_ids in separate(np.array(callback_model.cbGetSolution(self.x))):
+                    callback_model.cbLazy(self.__get_cut__(arc_ids))
+                    self.cuts_count += 1
+
+        self.model.optimize(separate_cuts)
+
+    def has_solution(self):
+        return self.model.SolCount > 0
+
+    def is_optimal(self):
+        return self.model.Status == self.gp.GRB.OPTIMAL
+
+    def get_values(self):
+        return np.array(self.model.getAttr("X", self.x))
+
+    def get_objective_value(self):
+        return self.model.ObjVal
+
+    def get_best_bound(self):
+        if not self.model.IsMIP:
+            return self.model.ObjVal if self.is_optimal() else None
+
+        try:
+            return self.model.ObjBound
+        except self.gp.GurobiError:
+            return None
+
+
+class CplexBackend(MIPBackend):
+
+    def __init__(self):
+        super().__init__()
+        import cplex
+        self.cplex = cplex
+
+        self.model = None
+
+    def build(self, arc_model, relaxed=False):
+        self.arc_model = arc_model
+
+        self.model = self.cplex.Cplex()
+        self.model.set_log_stream(None)
+        self.model.set_results_stream(None)
+        self.model.set_warning_stream(None)
+
+        self.model.objective.set_sense(self.model.objective.sense.minimize)
+        variables_type = self.model.variables.type.continuous if relaxed else self.model.variables.type.binary
+        self.model.variables.add(obj=arc_model.get_costs().tolist(),
+                                 lb=[0.0] * arc_model.get_arcs_count(),
+                                 ub=[1.0] * arc_model.get_arcs_count(),
+                                 types=[variables_type] * arc_model.get_arcs_count())
+
+        rows = arc_model.get_constraint_rows()
+        self.model.linear_constraints.add(
+            lin_expr=[self.cplex.SparsePair(ind=arc_ids.tolist(), val=coefficients.tolist())
+                      for _, arc_ids, coefficients, _, _ in rows],
+            senses=[sense for _, _, _, sense, _ in rows],
+            rhs=[rhs for _, _, _, _, rhs in rows],
+            names=[name for name, _, _, _, _ in rows])
+
+    def add_cut(self, arc_ids):
+        self.model.linear_constraints.add(
+            lin_expr=[self.cplex.SparsePair(ind=arc_ids.tolist(), val=[1.0] * len(arc_ids))],
+            senses=["L"],
+            rhs=[len(arc_ids) - 1.0])
+        self.cuts_count += 1
+
+    def set_start(self, values):
+        self.model.MIP_starts.add(self.cplex.SparsePair(ind=list(range(len(values))), val=list(values)),
+                                  self.model.MIP_starts.effort_level.check_feasibility)
+
+    def set_cutoff(self, cutoff):
+        self.model.parameters.mip.tolerances.uppercutoff.set(cutoff)
+
+    def solve(self, separate=None, time_limit=None):
+        if time_limit is not None:
+            self.model.parameters.timelimit.set(time_limit)
+
+        if separate is not None:
+            cplex = self.cplex
+            backend = self
+
+            class SeparationCallback(cplex.callbacks.LazyConstraintCallback):
+
+                def __call__(self):
+                    for arc_ids in separate(np.array(self.get_values())):
+                        self.add(constraint=cplex.SparsePair(ind=arc_ids.tolist(), val=[1.0] * len(arc_ids)),
+                                 sense="L",
+                                 rhs=len(arc_ids) - 1.0)
+                        backend.cuts_count += 1
+
+            self.model.register_callback(SeparationCallback)
+
+        self.solves_count += 1
+        self.model.solve()
+
+    def has_solution(self):
+        return self.model.solution.is_primal_feasible()
+
+    def is_optimal(self):
+        status = self.model.solution.status
+        return self.model.solution.get_status() in [status.optimal, status.MIP_optimal, status.optimal_tolerance]
+
+    def get_values(self):
+        return np.array(self.model.solution.get_values())
+
+    def get_objective_value(self):
+        return self.model.solution.get_objective_value()
+
+    def get_best_bound(self):
+        if self.model.get_problem_type() == self.model.problem_type.LP:
+            return self.get_objective_value() if self.is_optimal() else None
+
+        try:
+            return self.model.solution.MIP.get_best_objective()
+        except self.cplex.exceptions.CplexError:
+            return None
+
+
+# The PuLP solvers that run the CBC command line (which takes a cutoff)
+CBC_SOLVER_NAMES = ["PULP_CBC_CMD", "COIN_CMD"]
+
+
+class PulpBackend(MIPBackend):
+    # Open-source solvers through PuLP (CBC by default, e.g. HiGHS_CMD otherwise)
+    # This is the backend that needs no license: "pip install pulp" is enough (its wheels include CBC)
+    # PuLP has no solver callbacks, so there are no lazy constraints: the cuts are separated by an iterative cut
+    # loop, where the whole MIP is solved again from scratch after every round of cuts
+    # (on m4n500s0, more than an hour and 443 cuts without reaching a solution with feasible paths)
+
+    def __init__(self, solver_name="PULP_CBC_CMD", log_path=None):
+        super().__init__()
+        import pulp
+        self.pulp = pulp
+
+        self.solver_name = solver_name
+        # The log of the solver (of the last solve of the cut loop), e.g. to check that it read the start
+        self.log_path = log_path
+        self.model = None
+        self.x = None
+        self.cutoff = None
+        self.start_values = None
+
+        # The incumbent (the solution with feasible paths of the cut loop, or the start), the best bound
+        # (the optimum of the last solve: every solve of the cut loop is a relaxation of the model with all the cuts)
+        # and whether the incumbent is the optimum
+        self.values = None
+        self.objective_value = None
+        self.best_bound = None
+        self.optimal = False
+
+    def build(self, arc_model, relaxed=False):
+        pulp = self.pulp
+        self.arc_model = arc_model
+
+        self.model = pulp.LpProblem("MD-VSP_single_commodity", pulp.LpMinimize)
+        variables_category = pulp.LpContinuous if relaxed else pulp.LpBinary
+        self.x = [pulp.LpVariable(f"x_{i}_{j}", lowBound=0, upBound=1, cat=variables_category)
+                  for i, j in zip(arc_model.get_sources().tolist(), arc_model.get_destinations().tolist())]
+        self.model += pulp.lpSum(cost * variable for cost, variable in zip(arc_model.get_costs().tolist(), self.x))
+
+        for name, arc_ids, coefficients, sense, rhs in arc_model.get_constraint_rows():
+            expression = pulp.lpSum(coefficient * self.x[arc_id]
+                                    for arc_id, coefficient in zip(arc_ids.tolist(), coefficients.tolist()))
+            self.model += (expression == rhs if sense == "E" else expression <= rhs), name
+
+    def add_cut(self, arc_ids):
+        self.model += self.pulp.lpSum(self.x[arc_id] for arc_id in arc_ids.tolist()) <= len(arc_ids) - 1
+        self.cuts_count += 1
+
+    def set_start(self, values):
+        # Used by the solvers that support warm starts, at every solve of the cut loop
+        # (the start is feasible, so it satisfies all the cuts), and the incumbent until a better one is found
+        self.start_values = np.asarray(values, dtype=np.float64)
+
+    def set_cutoff(self, cutoff):
+        # PuLP has no solver independent cutoff: it is passed to CBC on its command line,
+        # the other solvers only use the start to bound the search
+        self.cutoff = cutoff
+
+    def has_lazy_constraints(self):
+        return False
+
+    def __solve_once__(self, deadline):
+        options = []
+        if self.cutoff is not None and self.solver_name in CBC_SOLVER_NAMES:
+            options.append(f"cutoff {self.cutoff}")
+
+        # (the values of the variables are replaced by the solution of every solve)
+        if self.start_values is not None:
+            for variable, value in zip(self.x, self.start_values.tolist()):
+                variable.setInitialValue(value)
+
+        remaining_time = max(deadline - time.time(), 1.0) if deadline is not None else None
+        solver_options = dict(msg=False, warmStart=self.start_values is not None, timeLimit=remaining_time,
+                              options=options)
+        if self.log_path is not None:
+            solver_options["logPath"] = self.log_path
+        solver = self.pulp.getSolver(self.solver_name, **solver_options)
+
+        self.solves_count += 1
+        self.model.solve(solver)
+
+        # A solution (status "Optimal") is only proven optimal with an optimal solution status
+        # (CBC reports an "Optimal" status with its last incumbent when it stops at the time limit)
+        has_solution = self.pulp.LpStatus[self.model.status] == "Optimal"
+        return has_solution, has_solution and self.model.sol_status == self.pulp.LpSolutionOptimal
+
+    def __set_incumbent__(self, values, objective_value):
+        if self.objective_value is None or objective_value < self.objective_value:
+            self.values, self.objective_value = values, objective_value
+
+    def solve(self, separate=None, time_limit=None):
+        # The time limit is shared by all the solves of the cut loop
+        deadline = time.time() + time_limit if time_limit is not None else None
+
+        self.values, self.objective_value, self.best_bound, self.optimal = None, None, None, False
+        if self.start_values is not None:
+            self.__set_incumbent__(self.start_values, float(self.start_values.dot(self.arc_model.get_costs())))
+
+        # Iterative cut loop: solved again with the cuts violated by the last solution, until it violates none
+        while True:
+            has_solution, optimal = self.__solve_once__(deadline)
+            if not has_solution:
+                break
+
+            values = np.array([variable.value() for variable in self.x], dtype=np.float64)
+            objective_value = self.model.objective.value()
+            cuts = separate(values) if separate is not None else []
+
+            if len(cuts) == 0:
+                self.__set_incumbent__(values, objective_value)
+                if optimal:
+                    self.optimal = True
+                    self.best_bound = objective_value
+                break
+
+            # (a solution found at the time limit is not a bound, and the next solve would have no time left)
+            if not optimal:
+                break
+            self.best_bound = objective_value
+            if deadline is not None and time.time() >= deadline:
+                break
+
+            for arc_ids in cuts:
+                self.add_cut(arc_ids)
+
+    def has_solution(self):
+        return self.values is not None
+
+    def is_optimal(self):
+        return self.optimal
+
+    def get_values(self):
+        return self.values
+
+    def get_objective_value(self):
+        return self.objective_value
+
+    def get_best_bound(self):
+        return self.best_bound
+
+
+BACKENDS = {
+    "gurobi": (GurobiBackend, "gurobipy"),
+    "cplex": (CplexBackend, "cplex"),
+    "pulp": (PulpBackend, "pulp"),
+}
+
+
+def get_available_backends():
+    # The backends whose solver packages are installed (in order of preference)
+    return [name for name, (_, package) in BACKENDS.items() if importlib.util.find_spec(package) is not None]
+
+
+def get_backend(name="auto", **options):
+    # "auto" selects the first available backend
+    if name == "auto":
+        available_backends = get_available_backends()
+        if len(available_backends) == 0:
+            raise ImportError(f"No MIP solver package is installed (supported: {list(BACKENDS)})")
+        name = available_backends[0]
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown MIP backend: {name} (supported: {list(BACKENDS)})")
+
+    backend_class, _ = BACKENDS[name]
+    return backend_class(**options)
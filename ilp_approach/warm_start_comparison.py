@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from ant_colony_3.ant_colony_system3 import AntColonySystem3
+from evaluation.eval_helpers import read_cost_matrix
+from ilp_approach.integer_linear_programming_approach import solve_lazy
+from ilp_approach.lower_bounds import get_gap
+
+
+def get_sub_instance(m, n, depots_capacities, cost_matrix, trips_count):
+    # The depots and the first trips of an instance (the depots capacities are scaled to the trips kept),
+    # a smaller instance that the exact solver can finish
+    nodes = np.concatenate((np.arange(m), m + np.arange(trips_count)))
+    sub_capacities = [int(np.ceil(capacity * trips_count / n)) for capacity in depots_capacities]
+
+    return m, trips_count, sub_capacities, np.array(cost_matrix[np.ix_(nodes, nodes)])
+
+
+def run_acs(m, n, depots_capacities, cost_matrix):
+    # A feasible solution found in seconds by the ant colony system (its logs go to a scratch directory)
+    np.random.seed(0)
+    random.seed(0)
+
+    logs_dir = tempfile.mkdtemp(prefix="warm_start_comparison_")
+    return AntColonySystem3(cost_save_path=os.path.join(logs_dir, "acs_cost.txt"),
+                            solution_save_path=os.path.join(logs_dir, "acs_solution.txt"),
+                            m=m,
+                            n=n,
+                            cost_matrix=cost_matrix,
+                            depot_capacities=depots_capacities,
+                            number_of_iterations=10,
+                            number_of_ants=10,
+                            tau_0=1.0,
+                            alpha=1.0,
+                            beta=2.0,
+                            ro=0.1,
+                            phi=0.1,
+                            q_0=0.5,
+                            teleport_factor=0.5).execute()
+
+
+def compare_starts(name, m, n, depots_capacities, cost_matrix, backend, time_limit):
+    start = time.time()
+    acs_solution, acs_cost = run_acs(m, n, depots_capacities, cost_matrix)
+    acs_time = time.time() - start
+    print(f"{name} ACS_3 : {acs_cost} ({acs_time:.2f} seconds)")
+
+    for start_name, start_solution in [("cold start", None), ("warm start", acs_solution)]:
+        start = time.time()
+        mip_backend = solve_lazy(m, n, depots_capacities, cost_matrix, backend, time_limit, start_solution)
+        elapsed_time = time.time() - start
+
+        # The incumbent (None without a solution with feasible paths), the best bound and their gap
+        incumbent = mip_backend.get_objective_value() if mip_backend.has_solution() else None
+        best_bound = mip_backend.get_best_bound()
+        gap = get_gap(incumbent, best_bound) if incumbent is not None and best_bound else None
+
+        print(f"{name} {start_name} : {'optimal' if mip_backend.is_optimal() else 'stopped'}, "
+              f"incumbent {incumbent}, bound {best_bound}, gap {'-' if gap is None else f'{gap:.2f}%'} "
+              f"({elapsed_time:.2f} seconds, {mip_backend.get_cuts_count()} path cuts, "
+              f"{mip_backend.get_solves_count()} solves)")
+
+
+if __name__ == '__main__':
+    file_path = "../data/m4n500/m4n500s0.inp"
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(file_path)
+
+    # "gurobi", "cplex", "pulp" (open-source solvers) or "auto" (the first one installed)
+    backend = "auto"
+    time_limit = 3600
+
+    # The first trips of the instance (solved to optimality by CBC), then the whole instance (time limited)
+    for trips_count in [100, 200, n]:
+        compare_starts(f"m4n500s0 ({trips_count} trips)",
+                       *get_sub_instance(m, n, depots_capacities, cost_matrix, trips_count), backend, time_limit)
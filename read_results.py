@@ -1,5 +1,65 @@
+import re
+
 import numpy as np
 
+from ilp_approach.lower_bounds import get_lower_bound, get_gap
+
+
+def get_instance_path(data_dir, experiment):
+    # The experiments are named after the instance files (e.g. m4n500s0.inp_sorted -> data/m4n500/m4n500s0.inp)
+    instance_name = experiment.split(".inp")[0]
+    group_name = re.match(r"m\d+n\d+", instance_name).group(0)
+    return f"{data_dir}/{group_name}/{instance_name}.inp"
+
+
+def format_value(value):
+    return f"{value:,}".replace(',', ' ').replace('.', ',')
+
+
+def read_runs_bests(file_path, runs):
+    # The best cost of every run (from the costs logged at every iteration)
+    runs_bests = []
+
+    for run in range(runs):
+
+        costs = []
+        with open(f"{file_path}/cost_run_{run}.txt") as file:
+            line = file.readline()
+            while line:
+                costs += [int(float(line.strip().split(": ")[1]))]
+                line = file.readline()
+
+        runs_bests += [min(costs)]
+
+    return runs_bests
+
+
+def get_table_row(experiment, runs_bests, lower_bound=None):
+    # The LaTeX row of an experiment (min, max, mean, median and std of the best costs of the runs),
+    # with a lower bound: the gaps of the runs as LaTeX comments, and the bound, min and mean gaps in the row
+    run_values = [np.min(runs_bests),
+                  np.max(runs_bests),
+                  np.mean(runs_bests),
+                  np.median(runs_bests),
+                  np.std(runs_bests)]
+
+    values_str = [experiment] + [format_value(x) for x in run_values]
+    comments = []
+
+    if lower_bound is not None:
+        runs_gaps = [get_gap(cost, lower_bound) for cost in runs_bests]
+
+        # (as comments, so the rows can still be pasted as they are)
+        for run, (cost, gap) in enumerate(zip(runs_bests, runs_gaps)):
+            comments += [f"% {experiment} run {run}: {cost} (gap {gap:.2f}%)"]
+
+        values_str += [format_value(round(lower_bound, 2)),
+                       format_value(round(np.min(runs_gaps), 2)),
+                       format_value(round(np.mean(runs_gaps), 2))]
+
+    return comments, " & ".join(values_str) + " \\\\"
+
+
 if __name__ == '__main__':
 
     # dir_name = "./results"
@@ -31,27 +91,21 @@ if __name__ == '__main__':
 
     runs = 30
 
-    for file_path, algorithm, experiment in paths:
-
-        runs_bests = []
+    # Gap report mode: adds the optimality gaps (relative to a lower bound of every instance) to the table rows
+    # ("lp": LP relaxation, needs a MIP solver; "degree": cheapest in / out arcs of the trips, no solver needed)
+    report_gaps = False
+    bound_method = "lp"
+    data_dir = "./data"
 
-        for run in range(runs):
-
-            costs = []
-            with open(f"{file_path}/cost_run_{run}.txt") as file:
-                line = file.readline()
-                while line:
-                    costs += [int(float(line.strip().split(": ")[1]))]
-                    line = file.readline()
+    for file_path, algorithm, experiment in paths:
 
-            runs_bests += [min(costs)]
+        runs_bests = read_runs_bests(file_path, runs)
 
-        run_values = [np.min(runs_bests),
-                      np.max(runs_bests),
-                      np.mean(runs_bests),
-                      np.median(runs_bests),
-                      np.std(runs_bests)]
+        lower_bound = None
+        if report_gaps:
+            lower_bound = get_lower_bound(get_instance_path(data_dir, experiment), method=bound_method)
 
-        values_str = [experiment] + [f"{x:,}".replace(',', ' ').replace('.', ',') for x in run_values]
-        str_vals = " & ".join(values_str) + " \\\\"
-        print(str_vals)
+        comments, row = get_table_row(experiment, runs_bests, lower_bound)
+        for comment in comments:
+            print(comment)
+        print(row)
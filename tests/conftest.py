@@ -0,0 +1,24 @@
+import pytest
+
+from ilp_approach.mip_backends import BACKENDS, get_available_backends
+from tests.instances import generate_instance, write_instance
+
+
+@pytest.fixture
+def instance_file(tmp_path):
+    # Writes a random instance and returns its path (the parsed matrix cache is written next to it)
+    def make_instance_file(m=2, n=8, seed=0, depot_capacity=None):
+        return write_instance(tmp_path / f"m{m}n{n}s{seed}.inp", *generate_instance(m, n, seed, depot_capacity))
+
+    return make_instance_file
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    # Every MIP backend, skipped when its solver package is not installed
+    # ("pip install pulp" for the free one, gurobipy and cplex come with size-limited licenses)
+    name = request.param
+    if name not in get_available_backends():
+        pytest.skip(f"the {name} backend needs the {BACKENDS[name][1]} package")
+
+    return name
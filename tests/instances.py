@@ -0,0 +1,111 @@
+import functools
+
+import numpy as np
+
+
+def generate_instance(m, n, seed=0, depot_capacity=None):
+    # A random MD-VSP instance: every trip goes from the area of a depot to the area of another one,
+    # in a time window, and a trip can follow another one when there is enough time to drive between them
+    # (a vehicle that ends its day at the depot where its last trip ends is the cheapest,
+    # so the path constraints that send it back to its own depot are needed)
+    rng = np.random.RandomState(seed)
+
+    depot_positions = rng.randint(0, 100, (m, 2))
+    start_depots, end_depots = rng.randint(0, m, n), rng.randint(0, m, n)
+    start_positions = depot_positions[start_depots] + rng.randint(-5, 6, (n, 2))
+    end_positions = depot_positions[end_depots] + rng.randint(-5, 6, (n, 2))
+
+    def get_distances(sources, destinations):
+        return np.abs(sources[:, np.newaxis, :] - destinations[np.newaxis, :, :]).sum(axis=2)
+
+    start_times = rng.randint(0, 400, n)
+    end_times = start_times + get_distances(start_positions, end_positions).diagonal() + rng.randint(5, 30, n)
+
+    cost_matrix = np.full((m + n, m + n), -1, dtype=np.int32)
+
+    travels = get_distances(end_positions, start_positions)
+    waits = start_times[np.newaxis, :] - end_times[:, np.newaxis] - travels
+    feasible = waits >= 0
+    np.fill_diagonal(feasible, False)
+    cost_matrix[m:, m:][feasible] = (travels + waits)[feasible]
+
+    # The vehicles have a fixed cost (on the arcs leaving the depots)
+    cost_matrix[:m, m:] = 1000 + get_distances(depot_positions, start_positions)
+    cost_matrix[m:, :m] = get_distances(end_positions, depot_positions)
+
+    if depot_capacity is None:
+        depot_capacity = n
+    return m, n, [depot_capacity] * m, cost_matrix
+
+
+def write_instance(path, m, n, depot_capacities, cost_matrix):
+    with open(path, "w") as file:
+        file.write("\t".join(str(value) for value in [m, n] + list(depot_capacities)) + "\n")
+        for row in cost_matrix:
+            file.write("\t".join(str(value) for value in row) + "\n")
+
+    return str(path)
+
+
+def get_vehicle_costs(m, n, cost_matrix):
+    # The cost of the cheapest vehicle from every depot that serves exactly a set of trips (np.inf if none)
+    trips_count = 1 << n
+    chain_costs = np.full((trips_count, n, m), np.inf)
+    for trip in range(n):
+        chain_costs[1 << trip, trip] = cost_matrix[:m, m + trip]
+
+    # chain_costs[trips, last, depot]: from the depot through all the trips, ending at the last trip
+    for trips in range(1, trips_count):
+        for last in range(n):
+            if not np.isfinite(chain_costs[trips, last]).any():
+                continue
+
+            for following in range(n):
+                arc_cost = cost_matrix[m + last, m + following]
+                if (trips >> following) & 1 or arc_cost == -1:
+                    continue
+
+                following_trips = trips | (1 << following)
+                chain_costs[following_trips, following] = np.minimum(chain_costs[following_trips, following],
+                                                                      chain_costs[trips, last] + arc_cost)
+
+    return (chain_costs + cost_matrix[m:, :m][np.newaxis, :, :]).min(axis=1)
+
+
+def get_brute_force_optimum(m, n, depots_capacities, cost_matrix):
+    vehicle_costs = get_vehicle_costs(m, n, cost_matrix)
+
+    @functools.lru_cache(maxsize=None)
+    def cover(trips, capacities):
+        # The cheapest vehicles that serve all the trips, with the depots capacities left
+        if trips == 0:
+            return 0.0
+
+        # The vehicle of the lowest trip left serves a subset of the trips left
+        lowest_trip = trips & -trips
+        best_cost = np.inf
+        vehicle_trips = trips
+        while vehicle_trips > 0:
+            if vehicle_trips & lowest_trip:
+                for depot in range(m):
+                    if capacities[depot] > 0 and np.isfinite(vehicle_costs[vehicle_trips, depot]):
+                        capacities_left = capacities[:depot] + (capacities[depot] - 1,) + capacities[depot + 1:]
+                        best_cost = min(best_cost, vehicle_costs[vehicle_trips, depot] +
+                                        cover(trips & ~vehicle_trips, capacities_left))
+
+            vehicle_trips = (vehicle_trips - 1) & trips
+
+        return best_cost
+
+    return cover((1 << n) - 1, tuple(depots_capacities))
+
+
+def get_single_trip_vehicles(m, n):
+    # A feasible solution with a vehicle for every trip (from the depots in turn)
+    solution_matrix = np.zeros((m + n, m + n))
+    for trip in range(n):
+        depot = trip % m
+        solution_matrix[depot, m + trip] = 1.0
+        solution_matrix[m + trip, depot] = 1.0
+
+    return solution_matrix
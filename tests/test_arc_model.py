@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from ilp_approach.arc_model import ArcModel
+from tests.instances import generate_instance
+
+
+@pytest.fixture
+def arc_model_instance():
+    m, n, depots_capacities, cost_matrix = generate_instance(2, 12, 0, depot_capacity=5)
+    return ArcModel(m, n, depots_capacities, cost_matrix), cost_matrix
+
+
+def test_variables_of_the_feasible_arcs(arc_model_instance):
+    arc_model, cost_matrix = arc_model_instance
+    sources, destinations = np.nonzero(cost_matrix != -1)
+
+    assert arc_model.get_arcs_count() == sources.shape[0]
+    assert np.array_equal(arc_model.get_sources(), sources)
+    assert np.array_equal(arc_model.get_destinations(), destinations)
+    assert np.array_equal(arc_model.get_costs(), cost_matrix[sources, destinations])
+    assert np.array_equal(arc_model.get_arc_ids(sources, destinations), np.arange(sources.shape[0]))
+
+    with pytest.raises(ValueError):
+        arc_model.get_arc_ids([0], [0])
+
+
+def test_constraint_rows_match_the_incidences(arc_model_instance):
+    arc_model, cost_matrix = arc_model_instance
+    m, size = arc_model.get_m(), cost_matrix.shape[0]
+
+    # The dense (nodes x arcs) incidence matrices
+    out_incidence = np.zeros((size, arc_model.get_arcs_count()))
+    out_incidence[arc_model.get_sources(), np.arange(arc_model.get_arcs_count())] = 1.0
+    in_incidence = np.zeros((size, arc_model.get_arcs_count()))
+    in_incidence[arc_model.get_destinations(), np.arange(arc_model.get_arcs_count())] = 1.0
+
+    expected_rows = [(f"trip_in_{trip}", in_incidence[trip], "E", 1.0) for trip in range(m, size)] + \
+        [(f"trip_out_{trip}", out_incidence[trip], "E", 1.0) for trip in range(m, size)]
+    for depot in range(m):
+        expected_rows += [(f"depot_{depot}", out_incidence[depot] - in_incidence[depot], "E", 0.0),
+                          (f"depot_capacity_{depot}", out_incidence[depot], "L", 5.0)]
+
+    rows = arc_model.get_constraint_rows()
+    assert len(rows) == len(expected_rows)
+    for (name, arc_ids, coefficients, sense, rhs), (expected_name, expected_row, expected_sense, expected_rhs) in \
+            zip(rows, expected_rows):
+        row = np.zeros(arc_model.get_arcs_count())
+        np.add.at(row, arc_ids, coefficients)
+
+        assert (name, sense, rhs) == (expected_name, expected_sense, expected_rhs)
+        assert np.array_equal(row, expected_row)
+
+
+def test_solution_array_round_trip(arc_model_instance):
+    arc_model, cost_matrix = arc_model_instance
+    values = (np.random.RandomState(0).rand(arc_model.get_arcs_count()) < 0.3).astype(np.float64)
+
+    solution_array = arc_model.to_solution_array(values)
+    assert np.all(solution_array[cost_matrix.reshape(-1) == -1] == 0.0)
+    assert np.array_equal(arc_model.from_solution_array(solution_array), values)
+    assert solution_array.dot(cost_matrix.reshape(-1)) == pytest.approx(values.dot(arc_model.get_costs()))
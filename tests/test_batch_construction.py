@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+from ant_colony.batch_construction import BatchConstructionPool
+from ant_colony.heuristic_cache import HeuristicCache
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony_2.ant_colony_system2 import Ant2, AntColonySystem2
+from ant_colony_3.ant_colony_system3 import Ant3, AntColonySystem3
+from evaluation.eval_helpers import read_cost_matrix
+
+ACS_PARAMS = dict(number_of_iterations=3, number_of_ants=4, tau_0=1.0, alpha=1.0, beta=2.0, ro=0.1, phi=0.1,
+                  q_0=0.5, teleport_factor=0.5)
+
+
+def run_colony(acs_class, file_path, log_dir, batch_workers, seed):
+    m, n, depot_capacities, cost_matrix = read_cost_matrix(file_path)
+    acs = acs_class(str(log_dir / f"cost_{batch_workers}.txt"), str(log_dir / f"solution_{batch_workers}.txt"),
+                    m, n, cost_matrix, depot_capacities, batch_workers=batch_workers, seed=seed, **ACS_PARAMS)
+    solution, cost = acs.execute()
+
+    with open(log_dir / f"cost_{batch_workers}.txt") as file:
+        return solution.get_routes(), cost, file.read()
+
+
+@pytest.mark.parametrize("acs_class", [AntColonySystem2, AntColonySystem3])
+def test_batch_results_do_not_depend_on_the_workers_count(instance_file, tmp_path, acs_class):
+    file_path = instance_file(2, 20, 0, 20)
+
+    one_worker = run_colony(acs_class, file_path, tmp_path, 1, seed=7)
+    three_workers = run_colony(acs_class, file_path, tmp_path, 3, seed=7)
+
+    assert one_worker == three_workers
+
+
+@pytest.mark.parametrize("ant_class", [Ant2, Ant3])
+def test_batch_constructions_match_the_serial_constructions(instance_file, ant_class):
+    m, n, depot_capacities, cost_matrix = read_cost_matrix(instance_file(2, 20, 1, 20))
+    problem_graph = ProblemGraph(cost_matrix, m, n, depot_capacities)
+    heuristic_cache = HeuristicCache(cost_matrix, 2.0)
+    ant_params = (1.0, 1.0, 2.0, 0.1, 0.5, 0.5)
+
+    rng = np.random.RandomState(0)
+    pheromone_matrix = rng.uniform(0.5, 1.5, cost_matrix.shape)
+
+    batch_pool = BatchConstructionPool(ant_class, problem_graph, heuristic_cache, ant_params, 2, seed=3)
+    try:
+        constructions = batch_pool.construct_solutions(pheromone_matrix, 5)
+    finally:
+        batch_pool.close()
+
+    # Every ant of the batch constructs the solution of a serial ant with the same seed and pheromones
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(3).spawn(5)]
+    ant = ant_class(problem_graph, pheromone_matrix, heuristic_cache, ant_params)
+    for seed, (solution, cost, retries) in zip(seeds, constructions):
+        np.random.seed(seed)
+        random.seed(seed)
+        ant.set_global_pheromone_matrix(pheromone_matrix)
+        ant.construct_solution()
+
+        assert solution.get_routes() == ant.get_solution().get_routes()
+        assert cost == ant.get_solution_cost() == solution.get_cost(cost_matrix)
+        assert retries == ant.get_retries_count()
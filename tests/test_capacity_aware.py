@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from ant_colony.ant_colony_system import Ant, AntColonySystem
+from ant_colony.heuristic_cache import HeuristicCache
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony_2.ant_colony_system2 import Ant2, AntColonySystem2
+from ant_colony_3.ant_colony_system3 import Ant3, AntColonySystem3
+from tests.instances import generate_instance
+
+# Tight capacities: the constructions that ignore them exceed them
+INSTANCES = [(1, 3), (4, 4), (5, 3)]
+
+
+def get_instance(ant_class, seed, depot_capacity):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 8, seed, depot_capacity)
+    if ant_class is not Ant:
+        return m, n, depot_capacities, cost_matrix
+
+    # The first depot and all the trips (with the capacity of both depots, so that it can serve them)
+    nodes = [0] + list(range(m, m + n))
+    return 1, n, [2 * depot_capacity], cost_matrix[np.ix_(nodes, nodes)]
+
+
+def check_solution(solution, m, n, depot_capacities):
+    # Every trip is served exactly once, and no depot sends more vehicles than its capacity
+    trips = sorted(trip for depot_routes in solution.get_routes() for route in depot_routes for trip in route)
+    assert trips == list(range(m, m + n))
+
+    for depot in range(m):
+        assert len(solution.get_depot_routes(depot)) <= depot_capacities[depot]
+
+
+@pytest.mark.parametrize("ant_class", [Ant, Ant2, Ant3])
+@pytest.mark.parametrize("seed, depot_capacity", INSTANCES)
+def test_capacity_aware_constructions_meet_the_capacities(ant_class, seed, depot_capacity):
+    m, n, depot_capacities, cost_matrix = get_instance(ant_class, seed, depot_capacity)
+    ant_params = (1.0, 1.0, 2.0, 0.1, 0.5) if ant_class is Ant else (1.0, 1.0, 2.0, 0.1, 0.5, 0.5)
+    ant = ant_class(ProblemGraph(cost_matrix, m, n, depot_capacities), np.full(cost_matrix.shape, 1.0),
+                    HeuristicCache(cost_matrix, 2.0), ant_params, capacity_aware=True)
+
+    np.random.seed(seed)
+    random.seed(seed)
+    for _ in range(30):
+        ant.construct_solution()
+
+        check_solution(ant.get_solution(), m, n, depot_capacities)
+        assert ant.get_solution_cost() == ant.get_solution().get_cost(cost_matrix)
+        assert not ant.construction_state.exceeds_capacities()
+
+
+@pytest.mark.parametrize("acs_class", [AntColonySystem2, AntColonySystem3])
+@pytest.mark.parametrize("seed, depot_capacity", INSTANCES)
+def test_capacity_aware_colonies_meet_the_capacities(tmp_path, acs_class, seed, depot_capacity):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 8, seed, depot_capacity)
+
+    np.random.seed(seed)
+    random.seed(seed)
+    acs = acs_class(str(tmp_path / "cost.txt"), str(tmp_path / "solution.txt"), m, n, cost_matrix,
+                    depot_capacities, 5, 5, 1.0, 1.0, 2.0, 0.1, 0.1, 0.5, 0.5, capacity_aware=True)
+    solution, cost = acs.execute()
+
+    check_solution(solution, m, n, depot_capacities)
+    assert cost == solution.get_cost(cost_matrix)
+    assert acs.get_constructions_count() == 25
+
+
+def test_capacity_aware_single_depot_colony_meets_the_capacity():
+    m, n, depot_capacities, cost_matrix = get_instance(Ant, 1, 2)
+
+    np.random.seed(0)
+    acs = AntColonySystem(cost_matrix, depot_capacities[0], (5, 1.0, 1.0, 2.0, 0.1, 0.1, 0.5), capacity_aware=True)
+    for _ in range(5):
+        acs.execute_iteration()
+
+    check_solution(acs.get_best_solution(), m, n, depot_capacities)
@@ -0,0 +1,62 @@
+import multiprocessing
+
+import pytest
+
+from ant_colony import colony_workers
+from ant_colony.ant_colonies_solver import AntColoniesSolver
+from ant_colony.colony_workers import ColonyWorkers
+from ant_colony.partitioning.partitioner import Partitioner
+from ant_colony.problem_graph import ProblemGraph
+from tests.instances import generate_instance
+
+ACS_PARAMS = dict(number_of_iterations=3, number_of_ants=3, tau_0=1.0, alpha=1.0, beta=2.0, ro=0.1, phi=0.1, q_0=0.5)
+
+
+def run_solver(tmp_path, number_of_workers, seed):
+    m, n, depot_capacities, cost_matrix = generate_instance(3, 24, 0)
+    partitioner = Partitioner(ProblemGraph(cost_matrix, m, n, depot_capacities), "index_blocks")
+    partitioner.execute()
+
+    cost_path = tmp_path / f"cost_{number_of_workers}.txt"
+    solver = AntColoniesSolver(str(cost_path), str(tmp_path / f"solution_{number_of_workers}.txt"), partitioner,
+                               colony_workers=number_of_workers, seed=seed, **ACS_PARAMS)
+    solution, cost = solver.solve()
+
+    with open(cost_path) as file:
+        return solution.get_routes(), cost, file.read(), solver.get_constructions_count()
+
+
+def test_results_do_not_depend_on_the_workers_count(tmp_path):
+    # Every colony has its own seed, whatever the worker that runs it
+    one_worker = run_solver(tmp_path, 1, seed=5)
+
+    assert run_solver(tmp_path, 2, seed=5) == one_worker
+    assert run_solver(tmp_path, 3, seed=5) == one_worker
+    assert one_worker[3] == 3 * 3 * 3
+
+
+class FailingProcess(multiprocessing.Process):
+    # The second worker cannot be started
+    started = []
+
+    def start(self):
+        if len(FailingProcess.started) == 1:
+            raise OSError("cannot start the worker")
+
+        super().start()
+        FailingProcess.started.append(self)
+
+
+def test_started_workers_are_stopped_when_a_worker_cannot_start(monkeypatch):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 8, 0)
+    colonies_params = [(cost_matrix[:5, :5], 4, (3, 1.0, 1.0, 2.0, 0.1, 0.1, 0.5), dict())] * 3
+
+    FailingProcess.started = []
+    monkeypatch.setattr(colony_workers.multiprocessing, "Process", FailingProcess)
+
+    with pytest.raises(OSError, match="cannot start"):
+        ColonyWorkers(colonies_params, 3, seed=0)
+
+    assert len(FailingProcess.started) == 1
+    assert not FailingProcess.started[0].is_alive()
+    assert FailingProcess.started[0].exitcode == 0
@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from data_readers.cost_matrix_reader import CostMatrixReader, get_memory_map_path
+from tests.instances import generate_instance, write_instance
+
+
+@pytest.fixture
+def instance(tmp_path):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 10, 0)
+    return write_instance(tmp_path / "m2n10s0.inp", m, n, depot_capacities, cost_matrix), cost_matrix
+
+
+def forbid_parsing(monkeypatch):
+    def parse(reader):
+        raise AssertionError("the instance was parsed instead of read from the cache")
+
+    monkeypatch.setattr(CostMatrixReader, "__parse__", parse)
+
+
+def test_parsing_writes_the_cache(instance, monkeypatch):
+    file_path, cost_matrix = instance
+
+    m, n, depot_capacities, parsed_matrix = CostMatrixReader(file_path).read()
+    assert (m, n, depot_capacities) == (2, 10, [10, 10])
+    assert np.array_equal(parsed_matrix, cost_matrix)
+
+    # (the temporary files were all replaced)
+    assert sorted(os.listdir(os.path.dirname(file_path))) == \
+        ["m2n10s0.inp", "m2n10s0.inp.meta.json", "m2n10s0.inp.npy"]
+
+    forbid_parsing(monkeypatch)
+    m, n, depot_capacities, cached_matrix = CostMatrixReader(file_path).read()
+    assert (m, n, depot_capacities) == (2, 10, [10, 10])
+    assert np.array_equal(cached_matrix, cost_matrix)
+
+    cached_matrix = CostMatrixReader(file_path, memory_map=True).read()[3]
+    assert get_memory_map_path(cached_matrix) == f"{file_path}.npy"
+    assert np.array_equal(cached_matrix, cost_matrix)
+
+
+def test_touched_instance_keeps_the_cache(instance, monkeypatch):
+    file_path, cost_matrix = instance
+    CostMatrixReader(file_path).read()
+
+    # A new modification time with the same content: the hash validates the cache, and the times are updated
+    file_stat = os.stat(file_path)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+
+    forbid_parsing(monkeypatch)
+    assert np.array_equal(CostMatrixReader(file_path).read()[3], cost_matrix)
+
+    with open(f"{file_path}.meta.json") as file:
+        assert json.load(file)["mtime_ns"] == os.stat(file_path).st_mtime_ns
+
+
+def test_modified_instance_invalidates_the_cache(instance):
+    file_path, cost_matrix = instance
+    CostMatrixReader(file_path).read()
+
+    # (the same size and a later modification time, so only the hash tells the change)
+    modified_matrix = cost_matrix.copy()
+    modified_matrix[0, 2] = 9999 if modified_matrix[0, 2] != 9999 else 9998
+    file_stat = os.stat(file_path)
+    write_instance(file_path, 2, 10, [10, 10], modified_matrix)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+    assert os.stat(file_path).st_size == file_stat.st_size
+
+    assert np.array_equal(CostMatrixReader(file_path).read()[3], modified_matrix)
+    assert np.array_equal(np.load(f"{file_path}.npy"), modified_matrix)
+
+
+@pytest.mark.parametrize("corrupt_file", [".npy", ".meta.json"])
+def test_corrupt_cache_falls_back_to_parsing(instance, corrupt_file):
+    file_path, cost_matrix = instance
+    CostMatrixReader(file_path).read()
+
+    with open(f"{file_path}{corrupt_file}", "wb") as file:
+        file.write(b"\x93NUMPY garbage")
+
+    assert np.array_equal(CostMatrixReader(file_path).read()[3], cost_matrix)
+
+    # (the cache was written again)
+    assert np.array_equal(np.load(f"{file_path}.npy"), cost_matrix)
+    with open(f"{file_path}.meta.json") as file:
+        assert json.load(file)["n"] == 10
+
+
+def test_read_only_directory_still_reads(instance, monkeypatch):
+    file_path, cost_matrix = instance
+
+    def fail_replace(source, destination):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    assert np.array_equal(CostMatrixReader(file_path).read()[3], cost_matrix)
+
+    # (no cache and no temporary file is left)
+    assert os.listdir(os.path.dirname(file_path)) == ["m2n10s0.inp"]
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from evaluation.evaluation import Evaluation
+
+
+class LoopEvaluation:
+    # The previous evaluation of the first constraints (chromosome by chromosome, with Python loops)
+
+    def __init__(self, m, n, depots_capacities, unfeasible_matrix):
+        self.m, self.n = m, n
+        self.depots_capacities = depots_capacities
+        self.unfeasible_matrix = unfeasible_matrix
+
+    def get_unfeasible_arcs_violations(self, chromosome):
+        return self.unfeasible_matrix.dot(chromosome)
+
+    def get_single_entering_violations(self, chromosome):
+        violations = 0
+        for j in range(self.m, self.m + self.n):
+            violations += int(sum(chromosome[(self.m + self.n) * i + j] for i in range(0, self.m + self.n)) != 1.0)
+
+        return violations
+
+    def get_single_leaving_violations(self, chromosome):
+        violations = 0
+        for i in range(self.m, self.m + self.n):
+            violations += int(sum(chromosome[(self.m + self.n) * i + j] for j in range(0, self.m + self.n)) != 1.0)
+
+        return violations
+
+    def get_depot_violations(self, chromosome):
+        violations = 0
+        for depot_index in range(0, self.m):
+            violations += int(sum(chromosome[(self.m + self.n) * depot_index + j] for j in range(0, self.m + self.n)) !=
+                              sum(chromosome[(self.m + self.n) * i + depot_index] for i in range(0, self.m + self.n)))
+
+        return violations
+
+    def get_depot_capacity_violations(self, chromosome):
+        violations = 0
+        for i in range(0, self.m):
+            violations += int(sum(chromosome[(self.m + self.n) * i + j]
+                                  for j in range(0, self.m + self.n)) > self.depots_capacities[i])
+
+        return violations
+
+
+def get_population(m, n, rng):
+    # Random chromosomes of different densities, and feasible ones (a vehicle for every trip) with a few changes
+    size = (m + n) ** 2
+    population = [(rng.rand(size) < density).astype(np.float64) for density in [0.01, 0.05, 0.2, 0.5]]
+
+    for changes_count in [0, 1, 3]:
+        solution_matrix = np.zeros((m + n, m + n))
+        for trip in range(m, m + n):
+            depot = trip % m
+            solution_matrix[depot, trip] = solution_matrix[trip, depot] = 1.0
+
+        chromosome = solution_matrix.reshape(-1)
+        changed_genes = rng.randint(0, size, changes_count)
+        chromosome[changed_genes] = 1.0 - chromosome[changed_genes]
+        population.append(chromosome)
+
+    return np.array(population)
+
+
+CONSTRAINTS = ["unfeasible_arcs", "single_entering", "single_leaving", "depot", "depot_capacity"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("dtype", [np.float64, np.int8])
+def test_evaluate_population_matches_the_loops(instance_file, seed, dtype):
+    evaluation = Evaluation(instance_file(2, 12, seed, depot_capacity=6))
+    loop_evaluation = LoopEvaluation(evaluation.m, evaluation.n, evaluation.depots_capacities,
+                                     evaluation.unfeasible_matrix)
+
+    population = get_population(evaluation.m, evaluation.n, np.random.RandomState(seed))
+    violations = evaluation.evaluate_population(population.astype(dtype))
+
+    for constraint in CONSTRAINTS:
+        expected = [getattr(loop_evaluation, f"get_{constraint}_violations")(chromosome) for chromosome in population]
+        assert violations[constraint].tolist() == expected, constraint
+
+        # (the single chromosome getters give the same values)
+        assert [getattr(evaluation, f"get_{constraint}_violations")(chromosome) for chromosome in population] == \
+            expected, constraint
+
+    expected_first = [sum(getattr(loop_evaluation, f"get_{constraint}_violations")(chromosome)
+                          for constraint in CONSTRAINTS) for chromosome in population]
+    assert violations["first_constraints"].tolist() == expected_first
+    assert [evaluation.get_first_constraints_violations(chromosome) for chromosome in population] == expected_first
+
+    # (the feasible chromosome without changes respects all the first constraints, the dense ones exceed the capacities)
+    assert expected_first[4] == 0
+    assert violations["depot_capacity"][3] > 0
+
+
+def test_evaluate_population_with_depot_paths(instance_file):
+    evaluation = Evaluation(instance_file(2, 12, 0))
+    population = get_population(evaluation.m, evaluation.n, np.random.RandomState(0))
+
+    violations = evaluation.evaluate_population(population, with_depot_paths=True)
+    assert violations["depot_paths"].tolist() == [evaluation.get_depot_paths_violations(chromosome)
+                                                  for chromosome in population]
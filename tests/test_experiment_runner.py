@@ -0,0 +1,28 @@
+from experiments.experiment_runner import ExperimentRunner
+
+ACS_PARAMS = dict(number_of_iterations=2, number_of_ants=3, tau_0=1.0, alpha=1.0, beta=2.0, ro=0.1, phi=0.1, q_0=0.5)
+
+
+def test_jobs_with_worker_processes_run_in_parallel_workers(instance_file, tmp_path):
+    # The jobs start their own worker processes from the (parallel) workers of the runner
+    file_path = instance_file(2, 8, 0, 8)
+    spec = {
+        "runs": 2,
+        "instances": [file_path],
+        "algorithms": [
+            {"name": "ACS_1", "results_dir": str(tmp_path / "acs_1"),
+             "parameter_sets": {"colony_workers": dict(colony_workers=2, **ACS_PARAMS)}},
+            {"name": "ACS_2", "results_dir": str(tmp_path / "acs_2"),
+             "parameter_sets": {"batch_workers": dict(batch_workers=2, teleport_factor=0.5, **ACS_PARAMS)}},
+            {"name": "ACS_3", "results_dir": str(tmp_path / "acs_3"),
+             "parameter_sets": {"batch_workers": dict(batch_workers=2, teleport_factor=0.5, **ACS_PARAMS)}},
+        ],
+        "seed": 0,
+        "manifest_path": str(tmp_path / "manifest.json"),
+    }
+
+    jobs = ExperimentRunner(spec, number_of_workers=2).execute()
+
+    assert len(jobs) == 6
+    assert [job.get("error") for job in jobs] == [None] * 6
+    assert all(job["status"] == "done" for job in jobs)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from ant_colony.feasibility_bitset import FeasibilityBitset, get_first_node, get_nodes
+from tests.instances import generate_instance
+
+
+@pytest.mark.parametrize("m, n, seed", [(2, 8, 0), (3, 40, 1), (4, 100, 2)])
+def test_bits_match_the_matrix(m, n, seed):
+    _, _, _, cost_matrix = generate_instance(m, n, seed)
+    feasibility = FeasibilityBitset(cost_matrix)
+    feasible = cost_matrix != -1
+
+    assert feasibility.get_size() == m + n
+    for node in range(m + n):
+        assert get_nodes(feasibility.get_out_bits(node)) == np.nonzero(feasible[node])[0].tolist()
+        assert get_nodes(feasibility.get_in_bits(node)) == np.nonzero(feasible[:, node])[0].tolist()
+
+    sources, destinations = np.nonzero(np.ones_like(feasible))
+    assert np.array_equal(feasibility.are_feasible(sources, destinations), feasible[sources, destinations])
+    assert all(feasibility.is_feasible(source, destination) == feasible[source, destination]
+               for source, destination in zip(sources[::7], destinations[::7]))
+
+
+@pytest.mark.parametrize("m, n, seed", [(2, 8, 0), (3, 40, 1), (4, 100, 2)])
+def test_feasible_successors_and_predecessors(m, n, seed):
+    _, _, _, cost_matrix = generate_instance(m, n, seed)
+    feasibility = FeasibilityBitset(cost_matrix)
+    feasible = cost_matrix != -1
+
+    rng = np.random.RandomState(seed)
+    for node in range(m + n):
+        nodes = np.sort(rng.choice(m + n, rng.randint(0, m + n), replace=False))
+        nodes_bits = feasibility.to_bits(nodes)
+        nodes = nodes.tolist()
+
+        assert get_nodes(feasibility.get_feasible_successors(node, nodes_bits)) == \
+            [other for other in nodes if feasible[node, other]]
+        assert get_nodes(feasibility.get_feasible_predecessors(node, nodes_bits)) == \
+            [other for other in nodes if feasible[other, node]]
+
+
+def test_nodes_of_the_bits():
+    assert get_nodes(0) == []
+    assert get_nodes(0b1) == [0]
+    assert get_nodes((1 << 70) | (1 << 8) | 0b110) == [1, 2, 8, 70]
+
+    assert get_first_node(0b1) == 0
+    assert get_first_node((1 << 70) | (1 << 8)) == 8
+    assert get_first_node(1 << 200) == 200
+
+
+def test_rows_longer_than_a_byte():
+    # (the packed rows of the nodes after the eighth one span several bytes)
+    cost_matrix = np.full((11, 11), -1)
+    cost_matrix[3, [0, 7, 8, 10]] = 5
+    cost_matrix[10, 9] = 0
+    feasibility = FeasibilityBitset(cost_matrix)
+
+    assert get_nodes(feasibility.get_out_bits(3)) == [0, 7, 8, 10]
+    assert get_nodes(feasibility.get_in_bits(9)) == [10]
+    assert feasibility.are_feasible([3, 3, 3, 10, 9], [8, 9, 10, 9, 10]).tolist() == [True, False, True, True, False]
+    assert get_nodes(feasibility.get_out_bits(0)) == []
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from ant_colony.feasible_arc_index import FeasibleArcIndex
+from tests.instances import generate_instance
+
+
+@pytest.mark.parametrize("m, n, seed", [(2, 8, 0), (3, 40, 1), (4, 100, 2)])
+def test_neighbours_match_the_matrix(m, n, seed):
+    _, _, _, cost_matrix = generate_instance(m, n, seed)
+    arc_index = FeasibleArcIndex(cost_matrix)
+    feasible = cost_matrix != -1
+
+    assert arc_index.get_size() == m + n
+    assert arc_index.get_arcs_count() == np.count_nonzero(feasible)
+    assert np.array_equal(arc_index.get_out_degrees(), feasible.sum(axis=1))
+    assert np.array_equal(arc_index.get_in_degrees(), feasible.sum(axis=0))
+
+    for node in range(m + n):
+        out_neighbours = np.nonzero(feasible[node])[0]
+        assert np.array_equal(arc_index.get_out_neighbours(node), out_neighbours)
+        assert np.array_equal(arc_index.get_out_costs(node), cost_matrix[node, out_neighbours])
+
+        in_neighbours = np.nonzero(feasible[:, node])[0]
+        assert np.array_equal(arc_index.get_in_neighbours(node), in_neighbours)
+        assert np.array_equal(arc_index.get_in_costs(node), cost_matrix[in_neighbours, node])
+
+
+def test_nodes_without_arcs():
+    cost_matrix = np.full((4, 4), -1)
+    cost_matrix[0, 2] = 5
+    cost_matrix[2, 0] = 0
+    arc_index = FeasibleArcIndex(cost_matrix)
+
+    assert arc_index.get_arcs_count() == 2
+    assert arc_index.get_out_neighbours(1).shape == (0,)
+    assert arc_index.get_in_neighbours(3).shape == (0,)
+    assert arc_index.get_out_neighbours(0).tolist() == [2]
+    assert arc_index.get_in_costs(0).tolist() == [0]
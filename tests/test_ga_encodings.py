@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from evaluation.eval_helpers import get_unfeasible_paths
+from genetic_algorithm.crossover import Crossover
+from genetic_algorithm.evaluation import Evaluation, PackedEvaluation
+from genetic_algorithm.mutation import Mutation
+from genetic_algorithm.permutation_decoder import PermutationDecoder
+from tests.instances import get_single_trip_vehicles
+
+
+def pack(population):
+    return np.packbits(np.asarray(population, dtype=np.uint8), axis=1, bitorder="little")
+
+
+def unpack(population, chromosome_size):
+    return np.unpackbits(population, axis=1, count=chromosome_size, bitorder="little")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_decoded_permutations_are_feasible_route_sets(instance_file, seed):
+    # (with enough vehicles in every depot)
+    decoder = PermutationDecoder(instance_file(2, 30, seed))
+    m, n = decoder.m, decoder.n
+    evaluation = Evaluation(instance_file(2, 30, seed))
+
+    rng = np.random.RandomState(seed)
+    for _ in range(20):
+        chromosome = rng.permutation(np.arange(m, m + n))
+        solution = decoder.decode(chromosome)
+
+        # Every trip is served once, by a vehicle that leaves and returns to the same depot through feasible arcs
+        routes = [route for depot_routes in solution.get_routes() for route in depot_routes]
+        assert sorted(trip for route in routes for trip in route) == list(range(m, m + n))
+        # (the routes are the runs of the chromosome)
+        positions = {trip: position for position, trip in enumerate(chromosome.tolist())}
+        routes.sort(key=lambda route: positions[route[0]])
+        assert [trip for route in routes for trip in route] == chromosome.tolist()
+
+        solution_array = solution.to_matrix().reshape(-1)
+        assert evaluation.get_first_constraints_violations(solution_array) == 0
+        assert get_unfeasible_paths(m, n, solution_array) == []
+
+        cost, violations = decoder.get_cost_and_violations(chromosome)
+        assert violations == 0
+        assert cost == solution.get_cost(decoder.cost_matrix)
+        assert decoder.chromosome_eval(chromosome) == cost
+
+
+def test_decoded_permutations_over_the_capacities(instance_file):
+    # With a single vehicle in every depot, the routes over the capacities are counted as violations
+    decoder = PermutationDecoder(instance_file(2, 30, 0, 1))
+    m, n = decoder.m, decoder.n
+
+    chromosome = np.random.RandomState(0).permutation(np.arange(m, m + n))
+    solution = decoder.decode(chromosome)
+    cost, violations = decoder.get_cost_and_violations(chromosome)
+
+    vehicles_count = sum(len(depot_routes) for depot_routes in solution.get_routes())
+    assert violations == vehicles_count - 2 > 0
+    assert decoder.chromosome_eval(chromosome) == cost + violations * decoder.violation_penalty
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_packed_and_bit_encodings_have_the_same_fitness(instance_file, seed):
+    file_path = instance_file(2, 8, seed)
+    evaluation, packed_evaluation = Evaluation(file_path), PackedEvaluation(file_path, chunk_size=3)
+    m, n, chromosome_size = evaluation.m, evaluation.n, evaluation.cost_matrix_flat.shape[0]
+
+    # Random genomes, sparse ones (only the paths violations differ) and feasible ones
+    rng = np.random.RandomState(seed)
+    decoder = PermutationDecoder(file_path)
+    population = np.concatenate((
+        rng.randint(0, 2, (6, chromosome_size)),
+        (rng.rand(6, chromosome_size) < 0.02).astype(np.int64),
+        [get_single_trip_vehicles(m, n).reshape(-1).astype(np.int64)],
+        [decoder.decode(rng.permutation(np.arange(m, m + n))).to_matrix().reshape(-1) for _ in range(3)],
+    ))
+
+    evals = evaluation.execute(population)
+    assert packed_evaluation.execute(pack(population)) == evals
+    assert evals == [evaluation.chromosome_eval(chromosome) for chromosome in population]
+    assert min(evals) == 0.0
+
+    rows, genes = np.nonzero(rng.rand(*population.shape) < 0.1)
+    assert np.array_equal(packed_evaluation.get_gene_values(pack(population), rows, genes), population[rows, genes])
+
+
+@pytest.mark.parametrize("mutation_prob", [0.001, 0.05])
+def test_packed_mutation_flips_the_returned_genes(mutation_prob):
+    # (100 bits: the last byte of every row has 4 unused bits)
+    chromosome_size = 100
+    population = np.random.RandomState(0).randint(0, 2, (40, chromosome_size))
+    packed_population = pack(population)
+
+    np.random.seed(1)
+    rows, genes = Mutation(mutation_prob, 0.5, packed_size=chromosome_size).execute(packed_population)
+
+    # The genes are drawn once (geometric gaps between the selected positions)
+    assert len(set(zip(rows.tolist(), genes.tolist()))) == rows.shape[0]
+    assert np.all(genes < chromosome_size)
+
+    expected_population = population.copy()
+    expected_population[rows, genes] ^= 1
+    assert np.array_equal(unpack(packed_population, chromosome_size), expected_population)
+    assert np.array_equal(packed_population[:, -1] >> 4, np.zeros(40, dtype=np.uint8))
+
+
+def test_packed_mutation_rate():
+    chromosome_size = 1000
+    packed_population = np.zeros((200, (chromosome_size + 7) // 8), dtype=np.uint8)
+
+    np.random.seed(0)
+    rows, genes = Mutation(0.01, 1.0, packed_size=chromosome_size).execute(packed_population)
+
+    # 200 000 genes, 2000 flips expected (standard deviation about 45)
+    assert abs(rows.shape[0] - 2000) < 200
+    assert np.count_nonzero(unpack(packed_population, chromosome_size)) == rows.shape[0]
+
+
+@pytest.mark.parametrize("crossover_type", ["single_cut", "double_cut"])
+def test_packed_crossover_swaps_whole_bytes(crossover_type):
+    chromosome_size = 100
+    population = np.random.RandomState(0).randint(0, 2, (30, chromosome_size))
+    packed_population = pack(population)
+
+    np.random.seed(2)
+    rows, genes = Crossover(1.0, crossover_type, packed=True).execute(packed_population)
+    children = unpack(packed_population, chromosome_size)
+
+    # Every pair exchanges a byte-aligned segment (the first bytes with the single cut)
+    byte_cuts = range(0, chromosome_size + 8, 8)
+    for first in range(0, 30, 2):
+        second = first + 1
+        segments = [(cut1, cut2) for cut1 in byte_cuts for cut2 in byte_cuts if cut1 < cut2 and
+                    np.array_equal(children[first], np.concatenate((population[first, :cut1],
+                                                                    population[second, cut1:cut2],
+                                                                    population[first, cut2:]))) and
+                    np.array_equal(children[second], np.concatenate((population[second, :cut1],
+                                                                     population[first, cut1:cut2],
+                                                                     population[second, cut2:])))]
+        assert len(segments) > 0
+        if crossover_type == "single_cut":
+            assert (0, segments[0][1]) in segments
+
+    # The changed genes are exactly the genes that differ from the parents
+    changed_rows, changed_genes = np.nonzero(children != population)
+    assert sorted(zip(rows.tolist(), genes.tolist())) == sorted(zip(changed_rows.tolist(), changed_genes.tolist()))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from genetic_algorithm.ga import GeneticAlgorithm
+
+
+@pytest.mark.parametrize("encoding, crossover_type, mutation_type", [
+    ("bits", "single_cut", "bit_flip"),
+    ("packed_bits", "double_cut", "bit_flip"),
+    ("permutation", "order", "swap"),
+])
+@pytest.mark.parametrize("selection_type", ["roulette", "tournament"])
+def test_elites_keep_the_best_eval(instance_file, encoding, crossover_type, mutation_type, selection_type):
+    np.random.seed(0)
+    ga = GeneticAlgorithm(instance_file(), pop_size=20, mutation_rate=0.05, crossover_rate=0.8,
+                          crossover_type=crossover_type, mutation_choosing_prob=1.0, max_iterations=15,
+                          encoding=encoding, mutation_type=mutation_type, selection_type=selection_type,
+                          elite_count=2)
+    ga.execute()
+
+    assert len(ga.best_evals) == 15
+    assert all(current <= previous for previous, current in zip(ga.best_evals, ga.best_evals[1:]))
+    assert min(ga.evals) <= ga.best_evals[-1]
+
+
+@pytest.mark.parametrize("encoding", ["bits", "packed_bits"])
+@pytest.mark.parametrize("crossover_type", ["single_cut", "double_cut"])
+def test_cached_evaluation_matches_the_evaluation(instance_file, encoding, crossover_type):
+    # (with 30 trips, the mutations update the cached sums and most crossovers sum the chromosomes again)
+    file_path = instance_file(2, 30)
+
+    runs = []
+    for cached_evaluation in [True, False]:
+        np.random.seed(0)
+        ga = GeneticAlgorithm(file_path, pop_size=20, mutation_rate=0.01, crossover_rate=0.5,
+                              crossover_type=crossover_type, mutation_choosing_prob=0.5, max_iterations=10,
+                              encoding=encoding, cached_evaluation=cached_evaluation)
+        ga.execute()
+        runs.append(ga)
+
+    cached, uncached = runs
+    assert cached.best_evals == uncached.best_evals
+    assert cached.evals == uncached.evals
+    assert np.array_equal(cached.population, uncached.population)
+    assert cached.evals == cached.evaluation.execute(cached.population)
@@ -0,0 +1,98 @@
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from ant_colony.heuristic_cache import HeuristicCache
+from data_readers.cost_matrix_reader import get_memory_map_path
+from evaluation.eval_helpers import read_cost_matrix
+
+
+def get_cost_matrix():
+    return np.array([[-1, 4, 2, -1],
+                     [1, -1, 0, 8],
+                     [-1, 5, -1, 2],
+                     [10, -1, 1, -1]], dtype=np.int32)
+
+
+def test_matrices_match_the_costs():
+    cost_matrix = get_cost_matrix()
+    heuristic_cache = HeuristicCache(cost_matrix, beta=2.0)
+    feasible = cost_matrix != -1
+
+    expected_eta = 1.0 / (cost_matrix[feasible] + 1e-10)
+    assert np.all(heuristic_cache.get_eta()[~feasible] == 0.0)
+    assert np.all(heuristic_cache.get_eta_beta()[~feasible] == 0.0)
+    assert heuristic_cache.get_eta()[feasible] == pytest.approx(expected_eta)
+    assert heuristic_cache.get_eta_beta()[feasible] == pytest.approx(expected_eta ** 2.0)
+
+    assert heuristic_cache.get_beta() == 2.0
+    assert heuristic_cache.get_nbytes() == 2 * cost_matrix.size * 8
+
+
+def test_matrices_are_read_only():
+    heuristic_cache = HeuristicCache(get_cost_matrix(), beta=2.0)
+
+    with pytest.raises(ValueError):
+        heuristic_cache.get_eta()[0, 1] = 1.0
+    with pytest.raises(ValueError):
+        heuristic_cache.get_eta_beta()[0, 1] = 1.0
+
+
+def test_smaller_dtype_does_not_overflow():
+    # (the zero cost arc gives eta = 1e10, and eta ** beta does not fit in a float32)
+    heuristic_cache = HeuristicCache(get_cost_matrix(), beta=5.0, dtype="float32")
+
+    assert heuristic_cache.get_eta().dtype == np.float32
+    assert heuristic_cache.get_eta_beta().dtype == np.float32
+    assert np.all(np.isfinite(heuristic_cache.get_eta_beta()))
+    assert heuristic_cache.get_eta_beta()[1, 2] == np.finfo(np.float32).max
+    assert heuristic_cache.get_nbytes() == 2 * get_cost_matrix().size * 4
+
+
+def get_matrices_in_worker(heuristic_cache):
+    # (runs in another process: the cache was sent as the paths of its matrices)
+    return get_memory_map_path(heuristic_cache.get_eta()), get_memory_map_path(heuristic_cache.get_eta_beta()), \
+        np.array(heuristic_cache.get_eta()), np.array(heuristic_cache.get_eta_beta())
+
+
+def test_memory_mapped_cache_is_shared_across_processes(instance_file):
+    file_path = instance_file(2, 30)
+    cost_matrix = read_cost_matrix(file_path, memory_map=True)[3]
+    heuristic_cache = HeuristicCache(cost_matrix, beta=2.0)
+
+    # The matrices are memory-mapped from files next to the instance cache
+    eta_path = get_memory_map_path(heuristic_cache.get_eta())
+    eta_beta_path = get_memory_map_path(heuristic_cache.get_eta_beta())
+    assert eta_path == f"{file_path}.npy.float64.eta.npy"
+    assert eta_beta_path == f"{file_path}.npy.float64.eta_beta_2.0.npy"
+
+    expected_cache = HeuristicCache(np.array(cost_matrix), beta=2.0)
+    assert np.array_equal(heuristic_cache.get_eta(), expected_cache.get_eta())
+    assert np.array_equal(heuristic_cache.get_eta_beta(), expected_cache.get_eta_beta())
+
+    # Pickled as the paths, not as the matrices
+    assert len(pickle.dumps(heuristic_cache)) < heuristic_cache.get_eta().nbytes
+
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        worker_eta_path, worker_eta_beta_path, worker_eta, worker_eta_beta = \
+            executor.submit(get_matrices_in_worker, heuristic_cache).result()
+
+    assert (worker_eta_path, worker_eta_beta_path) == (eta_path, eta_beta_path)
+    assert np.array_equal(worker_eta, heuristic_cache.get_eta())
+    assert np.array_equal(worker_eta_beta, heuristic_cache.get_eta_beta())
+
+
+def test_memory_mapped_cache_follows_the_instance(instance_file):
+    file_path = instance_file(2, 10)
+    cost_matrix = read_cost_matrix(file_path, memory_map=True)[3]
+    eta_path = get_memory_map_path(HeuristicCache(cost_matrix, beta=2.0).get_eta())
+
+    # Files older than the cost matrix file are computed again
+    os.utime(eta_path, ns=(0, 0))
+    heuristic_cache = HeuristicCache(cost_matrix, beta=2.0)
+    assert os.path.getmtime(eta_path) >= os.path.getmtime(f"{file_path}.npy")
+    assert np.array_equal(heuristic_cache.get_eta(), HeuristicCache(np.array(cost_matrix), beta=2.0).get_eta())
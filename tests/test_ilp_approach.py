@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from evaluation.eval_helpers import read_cost_matrix, get_unfeasible_paths
+from ilp_approach.integer_linear_programming_approach import build_model, solve_lazy
+from tests.instances import get_brute_force_optimum
+
+
+# (the optima of the seeds 0 and 2 need path cuts, the capacity of the seed 2 changes the optimum)
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (1, 3), (2, 2)])
+def test_solve_lazy_finds_the_optimum(instance_file, backend, seed, depot_capacity):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, seed, depot_capacity))
+
+    mip_backend = solve_lazy(m, n, depots_capacities, cost_matrix, backend=backend)
+    assert mip_backend.has_solution()
+
+    solution_array = mip_backend.get_arc_model().to_solution_array(mip_backend.get_values())
+    solution_matrix = solution_array.reshape(m + n, m + n)
+
+    # A feasible solution: every trip served once, the depots capacities met, every vehicle back to its depot
+    assert np.all(solution_matrix[m:].sum(axis=1) == 1.0)
+    assert np.all(solution_matrix[:, m:].sum(axis=0) == 1.0)
+    assert np.all(solution_matrix[:m].sum(axis=1) <= depots_capacities)
+    assert np.all(solution_matrix[cost_matrix == -1] == 0.0)
+    assert get_unfeasible_paths(m, n, solution_array) == []
+
+    optimum = get_brute_force_optimum(m, n, depots_capacities, cost_matrix)
+    assert mip_backend.get_objective_value() == pytest.approx(optimum)
+    assert solution_array.dot(cost_matrix.reshape(-1)) == pytest.approx(optimum)
+
+    # The backends with callbacks add the cuts as lazy constraints of a single solve,
+    # the cut loop solves the model again after every round of cuts
+    if mip_backend.has_lazy_constraints():
+        assert mip_backend.get_solves_count() == 1
+    else:
+        assert mip_backend.get_solves_count() >= 1 + (mip_backend.get_cuts_count() > 0)
+
+
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (2, 2)])
+def test_solve_lazy_cuts_the_unfeasible_paths(instance_file, backend, seed, depot_capacity):
+    # (without the path constraints, the optimum of these instances has unfeasible paths)
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, seed, depot_capacity))
+
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend=backend)
+    mip_backend.solve(time_limit=60)
+    relaxed_optimum = mip_backend.get_objective_value()
+    solution_array = mip_backend.get_arc_model().to_solution_array(mip_backend.get_values())
+    assert get_unfeasible_paths(m, n, solution_array) != []
+
+    mip_backend = solve_lazy(m, n, depots_capacities, cost_matrix, backend=backend)
+    assert mip_backend.get_cuts_count() > 0
+    assert mip_backend.get_objective_value() > relaxed_optimum
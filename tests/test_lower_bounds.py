@@ -0,0 +1,109 @@
+import json
+import os
+
+import pytest
+
+from evaluation.eval_helpers import read_cost_matrix
+from ilp_approach import lower_bounds
+from ilp_approach.lower_bounds import compute_degree_bound, compute_lp_relaxation_bound, get_gap, get_lower_bound
+from ilp_approach.mip_backends import PulpBackend
+from tests.instances import generate_instance, get_brute_force_optimum, write_instance
+
+
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (1, 3), (2, 2)])
+def test_bounds_are_below_the_optimum(instance_file, backend, seed, depot_capacity):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, seed, depot_capacity))
+    optimum = get_brute_force_optimum(m, n, depots_capacities, cost_matrix)
+
+    lp_bound = compute_lp_relaxation_bound(m, n, depots_capacities, cost_matrix, backend=backend, time_limit=60)
+    degree_bound = compute_degree_bound(m, n, depots_capacities, cost_matrix)
+
+    assert degree_bound <= lp_bound + 1e-6
+    assert lp_bound <= optimum + 1e-6
+
+
+class TimeLimitedBackend(PulpBackend):
+    # An LP stopped at the time limit: a solution, but not the optimum
+    def is_optimal(self):
+        return False
+
+
+def test_lp_bound_needs_the_optimum(instance_file, monkeypatch):
+    pytest.importorskip("pulp")
+    file_path = instance_file(2, 8, 0)
+    monkeypatch.setattr(lower_bounds, "get_backend", lambda name: TimeLimitedBackend())
+
+    with pytest.raises(RuntimeError, match="optimality"):
+        get_lower_bound(file_path, method="lp")
+
+    # (nothing was cached)
+    assert not os.path.exists(f"{file_path}.bounds.json")
+
+
+def count_computations(monkeypatch, method):
+    computations = []
+    bound_method = lower_bounds.BOUND_METHODS[method]
+
+    def compute_bound(*args, **options):
+        computations.append(args)
+        return bound_method(*args, **options)
+
+    monkeypatch.setitem(lower_bounds.BOUND_METHODS, method, compute_bound)
+    return computations
+
+
+def test_cached_bound(instance_file, monkeypatch):
+    file_path = instance_file(2, 8, 0)
+    computations = count_computations(monkeypatch, "degree")
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(file_path)
+    expected_bound = compute_degree_bound(m, n, depots_capacities, cost_matrix)
+
+    assert get_lower_bound(file_path, method="degree") == expected_bound
+    assert get_lower_bound(file_path, method="degree") == expected_bound
+    assert len(computations) == 1
+
+    with open(f"{file_path}.bounds.json") as file:
+        assert json.load(file)["bounds"] == {"degree": expected_bound}
+
+    # (without the cache, it is computed every time)
+    assert get_lower_bound(file_path, method="degree", use_cache=False) == expected_bound
+    assert len(computations) == 2
+
+
+def test_modified_instance_invalidates_the_bounds(instance_file, monkeypatch):
+    file_path = instance_file(2, 8, 0)
+    computations = count_computations(monkeypatch, "degree")
+    first_bound = get_lower_bound(file_path, method="degree")
+
+    # (another instance in the same file, with a later modification time)
+    file_stat = os.stat(file_path)
+    write_instance(file_path, *generate_instance(2, 8, 1))
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(file_path)
+    second_bound = get_lower_bound(file_path, method="degree")
+    assert second_bound == compute_degree_bound(m, n, depots_capacities, cost_matrix)
+    assert second_bound != first_bound
+    assert len(computations) == 2
+
+
+def test_corrupt_bounds_cache_is_computed_again(instance_file, monkeypatch):
+    file_path = instance_file(2, 8, 0)
+    computations = count_computations(monkeypatch, "degree")
+    expected_bound = get_lower_bound(file_path, method="degree")
+
+    with open(f"{file_path}.bounds.json", "w") as file:
+        file.write("{\"mtime_ns\": ")
+
+    assert get_lower_bound(file_path, method="degree") == expected_bound
+    assert len(computations) == 2
+
+
+def test_unknown_bound_method(instance_file):
+    with pytest.raises(ValueError):
+        get_lower_bound(instance_file(2, 8, 0), method="unknown")
+
+
+def test_gap():
+    assert get_gap(110.0, 100.0) == pytest.approx(10.0)
+    assert get_gap(100.0, 100.0) == 0.0
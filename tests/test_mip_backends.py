@@ -0,0 +1,159 @@
+import re
+
+import numpy as np
+import pytest
+
+from evaluation.eval_helpers import read_cost_matrix, get_unfeasible_paths
+from ilp_approach.arc_model import ArcModel
+from ilp_approach.integer_linear_programming_approach import build_model, get_start_values, solve, solve_lazy
+from ilp_approach.mip_backends import BACKENDS, MIPBackend, get_backend
+from tests.instances import get_brute_force_optimum, get_single_trip_vehicles
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_backends_implement_the_interface(name):
+    backend_class, _ = BACKENDS[name]
+    assert backend_class.__abstractmethods__ == frozenset()
+
+
+def test_incomplete_backend_fails_when_created():
+    class IncompleteBackend(MIPBackend):
+
+        def build(self, arc_model, relaxed=False):
+            pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        IncompleteBackend()
+
+
+def get_solution_array(mip_backend):
+    return mip_backend.get_arc_model().to_solution_array(mip_backend.get_values())
+
+
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (2, 2)])
+def test_solve_with_the_cuts_of_the_paths(instance_file, backend, seed, depot_capacity):
+    # The model is solved again with the unfeasible paths of every solution, until the paths are feasible
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, seed, depot_capacity))
+
+    unfeasible_paths = []
+    objective_values = []
+    while True:
+        mip_backend = solve(m, n, depots_capacities, cost_matrix, unfeasible_paths, backend, time_limit=60)
+        assert mip_backend.has_solution()
+        assert mip_backend.get_cuts_count() == len(unfeasible_paths)
+        objective_values.append(mip_backend.get_objective_value())
+
+        paths = get_unfeasible_paths(m, n, get_solution_array(mip_backend))
+        if len(paths) == 0:
+            break
+        unfeasible_paths += paths
+
+    # (the cuts only remove solutions)
+    assert objective_values == sorted(objective_values)
+    assert objective_values[-1] == pytest.approx(get_brute_force_optimum(m, n, depots_capacities, cost_matrix))
+
+
+def test_cut_removes_the_solution(instance_file, backend):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, 1, 3))
+
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend)
+    mip_backend.solve(time_limit=60)
+    first_values = mip_backend.get_values()
+
+    # At most all the arcs of the solution but one
+    arc_ids = np.flatnonzero(np.round(first_values) == 1.0)
+    mip_backend.add_cut(arc_ids)
+    mip_backend.solve(time_limit=60)
+
+    assert mip_backend.get_cuts_count() == 1
+    assert mip_backend.has_solution()
+    assert np.round(mip_backend.get_values())[arc_ids].sum() <= len(arc_ids) - 1
+    assert mip_backend.get_objective_value() >= first_values.dot(mip_backend.get_arc_model().get_costs())
+
+
+def test_relaxation_bounds_the_optimum(instance_file, backend):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, 2, 2))
+
+    mip_backend = get_backend(backend)
+    mip_backend.build(ArcModel(m, n, depots_capacities, cost_matrix), relaxed=True)
+    mip_backend.solve(time_limit=60)
+
+    assert mip_backend.has_solution()
+    assert mip_backend.get_objective_value() <= get_brute_force_optimum(m, n, depots_capacities, cost_matrix)
+
+
+def test_cutoff_prunes_the_solutions(instance_file, backend):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, 1, 3))
+    optimum = get_brute_force_optimum(m, n, depots_capacities, cost_matrix)
+
+    # (the instance of the seed 1 needs no path cut, so the optimum of the model is the optimum)
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend)
+    mip_backend.set_cutoff(optimum - 100.0)
+    mip_backend.solve(time_limit=60)
+    assert not mip_backend.has_solution()
+    assert not mip_backend.is_optimal()
+
+    mip_backend = build_model(m, n, depots_capacities, cost_matrix, backend)
+    mip_backend.set_cutoff(optimum + 0.5)
+    mip_backend.solve(time_limit=60)
+    assert mip_backend.has_solution()
+    assert mip_backend.is_optimal()
+    assert mip_backend.get_objective_value() == pytest.approx(optimum)
+
+
+def test_start_with_the_cuts(instance_file, backend):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, 0, 8))
+    start_solution = get_single_trip_vehicles(m, n)
+    start_cost = start_solution.reshape(-1).dot(cost_matrix.reshape(-1))
+
+    mip_backend = solve_lazy(m, n, depots_capacities, cost_matrix, backend=backend, start_solution=start_solution)
+
+    assert mip_backend.has_solution()
+    assert get_unfeasible_paths(m, n, get_solution_array(mip_backend)) == []
+    assert mip_backend.get_objective_value() == pytest.approx(
+        get_brute_force_optimum(m, n, depots_capacities, cost_matrix))
+    assert mip_backend.get_objective_value() < start_cost
+
+
+def solve_to_the_first_incumbent(mip_backend, backend, log_path):
+    # The value of the first incumbent of a solve
+    # (Gurobi and CPLEX stop at their first incumbent, CBC has no such limit but its log tells its first incumbent)
+    if backend == "gurobi":
+        mip_backend.model.Params.SolutionLimit = 1
+    elif backend == "cplex":
+        mip_backend.model.parameters.mip.limits.solutions.set(1)
+
+    mip_backend.solve(time_limit=60)
+
+    if backend != "pulp":
+        return mip_backend.get_objective_value()
+
+    with open(log_path) as file:
+        first_incumbent = re.search(r"(?:MIPStart provided solution with cost|Integer solution of) (\S+)", file.read())
+    return float(first_incumbent.group(1))
+
+
+@pytest.mark.parametrize("with_start", [True, False])
+def test_start_is_the_first_incumbent(instance_file, tmp_path, backend, with_start):
+    m, n, depots_capacities, cost_matrix = read_cost_matrix(instance_file(2, 8, 0, 8))
+    log_path = str(tmp_path / "solver.log")
+
+    mip_backend = get_backend(backend, **(dict(log_path=log_path) if backend == "pulp" else dict()))
+    mip_backend.build(ArcModel(m, n, depots_capacities, cost_matrix))
+
+    # (a vehicle for every trip: a feasible solution far above the optimum, that no solver finds first by itself)
+    start_values, start_cost = get_start_values(mip_backend.get_arc_model(), cost_matrix,
+                                                get_single_trip_vehicles(m, n))
+    if with_start:
+        mip_backend.set_start(start_values)
+        mip_backend.set_cutoff(start_cost + 0.5)
+
+    first_incumbent = solve_to_the_first_incumbent(mip_backend, backend, log_path)
+    if with_start:
+        assert first_incumbent == start_cost
+    else:
+        assert first_incumbent < start_cost
+
+    if backend == "pulp" and with_start:
+        with open(log_path) as file:
+            assert f"cutoff was changed from 1e+100 to {start_cost + 0.5}" in file.read()
@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+import pytest
+
+from ant_colony.partitioning.partitioner import PARTITION_STRATEGIES, Partitioner
+from ant_colony.problem_graph import ProblemGraph
+from tests.instances import generate_instance
+
+
+def get_partitions(m, n, seed, strategy):
+    m, n, depot_capacities, cost_matrix = generate_instance(m, n, seed)
+    partitioner = Partitioner(ProblemGraph(cost_matrix, m, n, depot_capacities), strategy)
+    partitioner.execute()
+
+    return partitioner
+
+
+@pytest.mark.parametrize("strategy", list(PARTITION_STRATEGIES))
+@pytest.mark.parametrize("m, n, seed", [(2, 8, 0), (3, 40, 1), (4, 103, 2)])
+def test_every_trip_is_in_exactly_one_partition(strategy, m, n, seed):
+    partitioner = get_partitions(m, n, seed, strategy)
+
+    assert [part.get_depot() for part in partitioner.get_partitions()] == list(range(m))
+    trips = [trip for part in partitioner.get_partitions() for trip in part.get_nodes()]
+    assert sorted(trips) == list(range(m, m + n))
+    assert sum(partitioner.get_partition_sizes()) == n
+
+
+def get_closest_depot_by_scan(graph, node):
+    # The previous search (the arcs entering the trip, then the arcs leaving it, the first cheapest one)
+    depot_neighbours = list(filter(lambda t: t[0] < graph.get_m(), graph.get_neighbours_cost(node)))
+    return min(depot_neighbours, key=lambda t: t[1])[0]
+
+
+def test_closest_depot_ties_match_the_scan():
+    # Depots 0 to 2, trips 3 to 6, with ties between the depots and between the orientations
+    cost_matrix = np.full((7, 7), -1)
+    cost_matrix[:3, 3] = [5, 5, 9]
+    cost_matrix[3, :3] = [9, 9, 5]
+    cost_matrix[:3, 4] = [-1, 7, 8]
+    cost_matrix[4, :3] = [2, 9, 2]
+    cost_matrix[:3, 5] = [6, 4, -1]
+    cost_matrix[5, :3] = [4, -1, 6]
+    cost_matrix[:3, 6] = [3, 3, 3]
+    cost_matrix[6, :3] = [3, 3, 3]
+    graph = ProblemGraph(cost_matrix, 3, 4, [4, 4, 4])
+
+    partitioner = Partitioner(graph, "closest_depot")
+    partitioner.execute()
+
+    closest_depots = {trip: part.get_depot() for part in partitioner.get_partitions() for trip in part.get_nodes()}
+    assert closest_depots == {trip: get_closest_depot_by_scan(graph, trip) for trip in range(3, 7)}
+    assert closest_depots == {3: 0, 4: 0, 5: 1, 6: 0}
+
+
+@pytest.mark.parametrize("m, n, seed", [(2, 8, 0), (3, 40, 1), (4, 103, 2)])
+def test_closest_depot_matches_the_scan(m, n, seed):
+    partitioner = get_partitions(m, n, seed, "closest_depot")
+    graph = partitioner.get_graph()
+
+    for part in partitioner.get_partitions():
+        assert all(get_closest_depot_by_scan(graph, trip) == part.get_depot() for trip in part.get_nodes())
+
+
+def test_balanced_degree_matches_the_sort():
+    partitioner = get_partitions(3, 40, 1, "balanced_degree")
+    cost_matrix = partitioner.get_graph().get_cost_matrix()
+
+    # The previous partition: the trips sorted by their (in + out) feasible arcs, then dealt out to the depots
+    weights = {trip: int(np.count_nonzero(cost_matrix[:, trip] != -1) + np.count_nonzero(cost_matrix[trip] != -1))
+               for trip in range(3, 43)}
+    sorted_trips = sorted(range(3, 43), key=lambda trip: weights[trip], reverse=True)
+    assert [part.get_nodes() for part in partitioner.get_partitions()] == [sorted_trips[depot::3] for depot in range(3)]
+
+
+def test_to_json():
+    partitioner = get_partitions(2, 8, 0, "index_blocks")
+
+    assert json.loads(partitioner.toJSON()) == {"strategy": "index_blocks",
+                                                "partitions": [{"depot": 0, "nodes": [2, 3, 4, 5]},
+                                                               {"depot": 1, "nodes": [6, 7, 8, 9]}]}
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        Partitioner(ProblemGraph(np.zeros((3, 3)), 1, 2, [2]), "unknown")
@@ -0,0 +1,128 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from ant_colony.ant_colony_system import Ant, AntColonySystem
+from ant_colony.heuristic_cache import HeuristicCache
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony_2.ant_colony_system2 import Ant2, AntColonySystem2
+from ant_colony_3.ant_colony_system3 import AntColonySystem3
+from tests.instances import generate_instance, get_brute_force_optimum
+
+ALG_PARAMS = (1.0, 1.0, 2.0, 0.1, 0.1, 0.5)
+
+
+def get_single_depot_instance(seed, depot_capacity):
+    # The first depot and all the trips (the instance of a colony of the ant colonies solver)
+    m, n, _, cost_matrix = generate_instance(2, 8, seed)
+    nodes = [0] + list(range(m, m + n))
+    return 1, n, [depot_capacity], cost_matrix[np.ix_(nodes, nodes)]
+
+
+def get_instance(ant_class, seed, depot_capacity):
+    if ant_class is Ant:
+        return get_single_depot_instance(seed, depot_capacity)
+
+    return generate_instance(2, 8, seed, depot_capacity)
+
+
+def make_ant(ant_class, m, n, depot_capacities, cost_matrix):
+    problem_graph = ProblemGraph(cost_matrix, m, n, depot_capacities)
+    pheromone_matrix = np.full(cost_matrix.shape, 1.0)
+    ant_params = (1.0, 1.0, 2.0, 0.1, 0.5) if ant_class is Ant else (1.0, 1.0, 2.0, 0.1, 0.5, 0.5)
+
+    return ant_class(problem_graph, pheromone_matrix, HeuristicCache(cost_matrix, 2.0), ant_params)
+
+
+def record_lower_bounds(ant):
+    # The lower bounds of the last construction (started again with every retry), after every arc
+    state = ant.construction_state
+    lower_bounds = []
+    reset, add_arc = state.reset, state.add_arc
+
+    def record_reset(**options):
+        lower_bounds.clear()
+        reset(**options)
+
+    def record_add_arc(source, destination):
+        add_arc(source, destination)
+        lower_bounds.append(state.get_lower_bound())
+
+    state.reset, state.add_arc = record_reset, record_add_arc
+    return lower_bounds
+
+
+@pytest.mark.parametrize("ant_class", [Ant, Ant2])
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (1, 3), (3, 5)])
+def test_trips_bound_is_below_the_optimum(ant_class, seed, depot_capacity):
+    m, n, depot_capacities, cost_matrix = get_instance(ant_class, seed, depot_capacity)
+
+    problem_graph = ProblemGraph(cost_matrix, m, n, depot_capacities)
+    assert problem_graph.get_trips_bound() <= get_brute_force_optimum(m, n, depot_capacities, cost_matrix)
+
+
+@pytest.mark.parametrize("ant_class", [Ant, Ant2])
+@pytest.mark.parametrize("seed, depot_capacity", [(0, 8), (1, 3), (3, 5)])
+def test_lower_bound_never_exceeds_the_final_cost(ant_class, seed, depot_capacity):
+    # A construction is only pruned when it cannot end below the cost bound,
+    # so the constructions of the optimum (or of any better solution) are never pruned
+    ant = make_ant(ant_class, *get_instance(ant_class, seed, depot_capacity))
+    lower_bounds = record_lower_bounds(ant)
+
+    # (bounded, but never pruned)
+    ant.set_cost_bound(np.inf)
+    np.random.seed(seed)
+    random.seed(seed)
+    for _ in range(20):
+        ant.construct_solution()
+
+        assert not ant.is_pruned()
+        assert len(lower_bounds) > 0
+        assert max(lower_bounds) <= ant.get_solution_cost()
+
+
+def test_unbounded_constructions_do_not_compute_the_bound():
+    ant = make_ant(Ant2, *generate_instance(2, 8, 0))
+    lower_bounds = record_lower_bounds(ant)
+
+    ant.construct_solution()
+
+    # (the matching of the trips is only computed by the first bounded construction)
+    assert set(lower_bounds) == {None}
+    assert ant.construction_state.problem_graph.min_vehicles_count is None
+
+
+def test_pruning_cuts_constructions(tmp_path):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 8, 0, 3)
+
+    np.random.seed(0)
+    random.seed(0)
+    acs = AntColonySystem2(str(tmp_path / "cost.txt"), str(tmp_path / "solution.txt"), m, n, cost_matrix,
+                           depot_capacities, 20, 10, *ALG_PARAMS, 0.5, prune=True)
+    solution, cost = acs.execute()
+
+    assert acs.get_pruned_count() > 0
+    assert acs.get_constructions_count() == 200
+    assert cost == solution.get_cost(cost_matrix) >= get_brute_force_optimum(m, n, depot_capacities, cost_matrix)
+
+
+def test_single_depot_pruning_cuts_constructions():
+    m, n, depot_capacities, cost_matrix = get_single_depot_instance(1, 8)
+
+    np.random.seed(0)
+    acs = AntColonySystem(cost_matrix, depot_capacities[0], (10,) + ALG_PARAMS, prune=True)
+    for _ in range(20):
+        acs.execute_iteration()
+
+    assert acs.get_pruned_count() > 0
+    assert acs.get_best_cost() >= get_brute_force_optimum(m, n, depot_capacities, cost_matrix)
+
+
+def test_acs3_rejects_pruning(tmp_path):
+    m, n, depot_capacities, cost_matrix = generate_instance(2, 8, 0)
+
+    with pytest.raises(ValueError):
+        AntColonySystem3(os.path.join(tmp_path, "cost.txt"), os.path.join(tmp_path, "solution.txt"), m, n,
+                         cost_matrix, depot_capacities, 1, 1, *ALG_PARAMS, 0.5, prune=True)
@@ -0,0 +1,37 @@
+from read_results import get_instance_path, get_table_row, read_runs_bests
+
+
+def write_runs(results_dir, runs_costs):
+    results_dir.mkdir()
+    for run, costs in enumerate(runs_costs):
+        with open(results_dir / f"cost_run_{run}.txt", "w") as file:
+            for iteration, cost in enumerate(costs):
+                file.write(f"{iteration}: {cost}\n")
+
+    return str(results_dir)
+
+
+def test_runs_bests(tmp_path):
+    file_path = write_runs(tmp_path / "m4n500s0.inp_sorted", [[1300.0, 1200.0, 1250.0], [1100.0, 1150.0]])
+
+    assert read_runs_bests(file_path, 2) == [1200, 1100]
+
+
+def test_table_row():
+    comments, row = get_table_row("m4n500s0.inp_sorted", [1200, 1100])
+
+    assert comments == []
+    assert row == "m4n500s0.inp_sorted & 1 100 & 1 200 & 1 150,0 & 1 150,0 & 50,0 \\\\"
+
+
+def test_table_row_with_the_gaps():
+    comments, row = get_table_row("m4n500s0.inp_sorted", [1200, 1100], lower_bound=1000.0)
+
+    assert comments == ["% m4n500s0.inp_sorted run 0: 1200 (gap 20.00%)",
+                        "% m4n500s0.inp_sorted run 1: 1100 (gap 10.00%)"]
+    assert row == "m4n500s0.inp_sorted & 1 100 & 1 200 & 1 150,0 & 1 150,0 & 50,0 & 1 000,0 & 10,0 & 15,0 \\\\"
+
+
+def test_instance_path():
+    assert get_instance_path("./data", "m4n500s0.inp_sorted") == "./data/m4n500/m4n500s0.inp"
+    assert get_instance_path("./data", "m8n1500s3.inp") == "./data/m8n1500/m8n1500s3.inp"
@@ -0,0 +1,75 @@
+import copy
+import random
+
+import pytest
+
+from ant_colony.problem_graph import ProblemGraph
+from ant_colony.route_solution import join_circuits
+from tests.instances import generate_instance
+
+
+def join_circuits_by_scan(depots_circuits, depots_order, cost_matrix):
+    # The previous repair of the third approach (with the used circuits kept per depot):
+    # every position of every circuit of the depots (in depots_order) is tried for every circuit
+    m = len(depots_circuits)
+    depots_circuits = [sorted(circuits, key=lambda t: len(t)) for circuits in depots_circuits]
+    used_circuits = [set() for _ in range(m)]
+
+    joins_counts = [0] * m
+    for depot, circuits in enumerate(depots_circuits):
+        for circuit_index, current in enumerate(circuits):
+            if circuit_index in used_circuits[depot]:
+                continue
+
+            joined = False
+            for other_depot in depots_order:
+                for other_index, other in enumerate(depots_circuits[other_depot]):
+                    if (other_depot, other_index) == (depot, circuit_index) or \
+                            other_index in used_circuits[other_depot]:
+                        continue
+
+                    nodes = [other_depot] + other + [other_depot]
+                    for position in range(len(nodes) - 1):
+                        if cost_matrix[nodes[position], current[0]] != -1 and \
+                                cost_matrix[current[-1], nodes[position + 1]] != -1:
+                            depots_circuits[other_depot][other_index] = other[:position] + current + other[position:]
+                            circuits[circuit_index] = None
+
+                            used_circuits[depot].add(circuit_index)
+                            used_circuits[other_depot].add(other_index)
+                            joins_counts[depot] += 1
+                            joined = True
+                            break
+
+                    if joined:
+                        break
+                if joined:
+                    break
+
+    return [[circuit for circuit in circuits if circuit is not None] for circuits in depots_circuits], joins_counts
+
+
+def get_random_circuits(m, n, circuits_count, rng):
+    # The trips dealt out to random circuits, each assigned to a random depot
+    trips = list(range(m, m + n))
+    rng.shuffle(trips)
+
+    depots_circuits = [[] for _ in range(m)]
+    for circuit_index in range(circuits_count):
+        depots_circuits[rng.randrange(m)].append(sorted(trips[circuit_index::circuits_count]))
+
+    return depots_circuits
+
+
+@pytest.mark.parametrize("case", range(30))
+def test_join_circuits_matches_the_scan(case):
+    rng = random.Random(case)
+    m, n, depot_capacities, cost_matrix = generate_instance(rng.choice([2, 3, 4]), 120, seed=case)
+    feasibility = ProblemGraph(cost_matrix, m, n, depot_capacities).get_feasibility_bitset()
+
+    depots_circuits = get_random_circuits(m, n, rng.choice([10, 30, 60, 120]), rng)
+    depots_order = list(range(m))
+    rng.shuffle(depots_order)
+
+    expected = join_circuits_by_scan(copy.deepcopy(depots_circuits), depots_order, cost_matrix)
+    assert join_circuits(copy.deepcopy(depots_circuits), depots_order, feasibility) == expected
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from evaluation.eval_helpers import get_solution_paths, get_unfeasible_paths
+from evaluation.solution_path import SolutionPath
+
+M, N = 2, 9
+
+
+def get_solution_array(arcs):
+    solution_matrix = np.zeros((M + N, M + N))
+    for source, destination in arcs:
+        solution_matrix[source, destination] = 1.0
+
+    return solution_matrix.reshape(-1)
+
+
+# Depots 0 and 1, trips 2 to 10
+PATHS_ARCS = {
+    SolutionPath.FEASIBLE: [(0, 2), (2, 3), (3, 0)],
+    SolutionPath.DEPOT_MISMATCH: [(0, 4), (4, 1)],
+    SolutionPath.CYCLE: [(1, 5), (5, 6), (6, 5)],
+    SolutionPath.OPEN: [(1, 7)],
+    # (the trip 8 leads into the circuit of the trips 9 and 10, no depot reaches them)
+    SolutionPath.SUBTOUR: [(8, 9), (9, 10), (10, 9)],
+}
+
+PATHS_NODES = {
+    SolutionPath.FEASIBLE: [0, 2, 3, 0],
+    SolutionPath.DEPOT_MISMATCH: [0, 4, 1],
+    SolutionPath.CYCLE: [1, 5, 6, 5],
+    SolutionPath.OPEN: [1, 7],
+    SolutionPath.SUBTOUR: [9, 10, 9],
+}
+
+
+@pytest.mark.parametrize("kind", list(PATHS_ARCS))
+def test_every_path_kind(kind):
+    paths = get_solution_paths(M, N, get_solution_array(PATHS_ARCS[kind]))
+
+    assert [(path.get_kind(), path.get_nodes()) for path in paths] == [(kind, PATHS_NODES[kind])]
+    assert paths[0].is_feasible() == (kind == SolutionPath.FEASIBLE)
+    assert get_unfeasible_paths(M, N, get_solution_array(PATHS_ARCS[kind])) == \
+        ([] if kind == SolutionPath.FEASIBLE else [PATHS_NODES[kind]])
+
+
+def test_all_the_path_kinds_together():
+    arcs = [arc for paths_arcs in PATHS_ARCS.values() for arc in paths_arcs]
+    paths = get_solution_paths(M, N, get_solution_array(arcs))
+
+    # The paths leaving the depots (in the order of their arcs), then the detached circuits
+    assert [(path.get_kind(), path.get_nodes()) for path in paths] == list(PATHS_NODES.items())
+    assert get_unfeasible_paths(M, N, get_solution_array(arcs)) == \
+        [nodes for kind, nodes in PATHS_NODES.items() if kind != SolutionPath.FEASIBLE]
+
+
+def test_path_arcs():
+    path = get_solution_paths(M, N, get_solution_array(PATHS_ARCS[SolutionPath.FEASIBLE]))[0]
+
+    assert path.get_arcs() == PATHS_ARCS[SolutionPath.FEASIBLE]
+    assert len(path) == 4
+
+
+def get_unfeasible_paths_by_scan(m, n, solution_array):
+    # The previous path extraction (it only terminates when every path leaving a depot reaches a depot)
+    solution_matrix = solution_array.reshape(m + n, m + n)
+
+    unfeasible_paths = []
+    for depot in range(m):
+        for start_trip in range(m + n):
+            if solution_matrix[depot, start_trip] == 1.0:
+                current_path = [depot, start_trip]
+                while current_path[-1] != depot:
+                    current_path += [int(np.argmax(solution_matrix[current_path[-1]] == 1.0))]
+                    if current_path[-1] < m:
+                        break
+
+                if current_path[-1] != depot:
+                    unfeasible_paths += [current_path]
+
+    return unfeasible_paths
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_depot_paths_match_the_scan(seed):
+    # Random vehicles: every trip is served once, and every vehicle returns to a random depot
+    rng = np.random.RandomState(seed)
+    trips = rng.permutation(np.arange(M, M + N))
+    cuts = np.sort(rng.choice(np.arange(1, N), rng.randint(0, 4), replace=False))
+
+    arcs = []
+    for route in np.split(trips, cuts):
+        nodes = [rng.randint(M)] + route.tolist() + [rng.randint(M)]
+        arcs += list(zip(nodes[:-1], nodes[1:]))
+
+    solution_array = get_solution_array(arcs)
+    assert get_unfeasible_paths(M, N, solution_array) == get_unfeasible_paths_by_scan(M, N, solution_array)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from ant_colony.transition_rule import choose_next_node
+
+
+def get_matrices():
+    pheromone_matrix = np.array([[1.0, 2.0, 1.0, 4.0, 1.0],
+                                 [1.0, 1.0, 1.0, 1.0, 1.0]])
+    heuristic_matrix = np.array([[0.0, 1.0, 3.0, 0.5, 0.0],
+                                 [0.0, 2.0, 2.0, 1.0, 0.5]])
+    return pheromone_matrix, heuristic_matrix
+
+
+def test_exploit_chooses_the_greatest_product():
+    pheromone_matrix, heuristic_matrix = get_matrices()
+    candidates = np.array([1, 2, 3, 4])
+
+    # (products 2, 3, 2, 0 for the first node, and 2, 2, 1, 0.5 for the second one: the first greatest is chosen)
+    assert choose_next_node(pheromone_matrix, heuristic_matrix, 0, candidates, 1.0, True) == 2
+    assert choose_next_node(pheromone_matrix, heuristic_matrix, 1, candidates, 1.0, True) == 1
+
+    # (with alpha = 2 the products of the first node are 4, 3, 8, 0)
+    assert choose_next_node(pheromone_matrix, heuristic_matrix, 0, candidates, 2.0, True) == 3
+
+
+@pytest.mark.parametrize("alpha", [1.0, 2.0])
+def test_explore_follows_the_products(alpha):
+    pheromone_matrix, heuristic_matrix = get_matrices()
+    candidates = np.array([1, 2, 3, 4])
+
+    products = pheromone_matrix[0, candidates] ** alpha * heuristic_matrix[0, candidates]
+    expected_frequencies = products / products.sum()
+
+    np.random.seed(0)
+    samples_count = 20000
+    chosen = [choose_next_node(pheromone_matrix, heuristic_matrix, 0, candidates, alpha, False)
+              for _ in range(samples_count)]
+    frequencies = np.array([chosen.count(candidate) for candidate in candidates]) / samples_count
+
+    # (a candidate with a zero product is never chosen)
+    assert frequencies[-1] == 0.0
+    assert frequencies == pytest.approx(expected_frequencies, abs=0.015)
+
+
+def test_explore_with_a_single_candidate():
+    pheromone_matrix, heuristic_matrix = get_matrices()
+
+    np.random.seed(0)
+    for _ in range(10):
+        assert choose_next_node(pheromone_matrix, heuristic_matrix, 1, np.array([3]), 1.0, False) == 3